@@ -0,0 +1,72 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gslides import Frame
+
+
+def _make_df(rows, columns):
+    rng = np.random.default_rng(0)
+    data = {}
+    for i in range(columns):
+        kind = i % 5
+        if kind == 0:
+            data[f"int_{i}"] = rng.integers(0, 1000, rows)
+        elif kind == 1:
+            values = rng.normal(size=rows)
+            values[::7] = np.nan
+            data[f"float_{i}"] = values
+        elif kind == 2:
+            data[f"str_{i}"] = [f"label {j % 97}" for j in range(rows)]
+        elif kind == 3:
+            data[f"date_{i}"] = pd.date_range("2021-01-01", periods=rows, freq="h")
+        else:
+            data[f"object_{i}"] = [None if j % 5 else f"note {j}" for j in range(rows)]
+    return pd.DataFrame(data)
+
+
+def _make_frame(df):
+    return Frame(
+        df=df,
+        spreadsheet_id="abc123",
+        sheet_id=1234,
+        sheet_name="first",
+        start_column_index=1,
+        start_row_index=1,
+        end_column_index=df.shape[1],
+        end_row_index=df.shape[0] + 1,
+        initialized=True,
+    )
+
+
+@pytest.fixture
+def make_df():
+    """Builds a dataframe of rows and columns cycling through the dtypes cleaned
+    by the package"""
+    return _make_df
+
+
+@pytest.fixture
+def make_frame():
+    """Builds an initialized frame holding a dataframe without calling the API"""
+    return _make_frame
+
+
+@pytest.fixture
+def measure(benchmark):
+    """Times a function with the benchmark fixture and records the peak memory
+    allocated by a single call in the extra info of the benchmark"""
+
+    def run(func, *args, **kwargs):
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_memory_bytes"] = peak
+        return benchmark(func, *args, **kwargs)
+
+    return run
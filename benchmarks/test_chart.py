@@ -0,0 +1,18 @@
+import pytest
+
+from gslides import Chart, Series
+
+
+@pytest.mark.parametrize("rows", [100, 10000])
+@pytest.mark.parametrize("series", [1, 5, 10])
+def test_render_basic_chart_json(measure, make_df, make_frame, rows, series):
+    df = make_df(rows, 1)
+    for i in range(series):
+        df[f"series_{i}"] = range(rows)
+    chart = Chart(
+        make_frame(df),
+        df.columns[0],
+        [Series.line([f"series_{i}"]) for i in range(series)],
+        title="Benchmark",
+    )
+    measure(chart.render_basic_chart_json, (600, 371))
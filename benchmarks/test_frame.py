@@ -0,0 +1,34 @@
+import pytest
+
+from gslides.frame import CreateFrame
+
+
+@pytest.mark.parametrize("rows", [100, 1000, 10000])
+@pytest.mark.parametrize("columns", [5, 20])
+def test_clean_df(measure, make_df, rows, columns):
+    frame = CreateFrame.__new__(CreateFrame)
+    df = make_df(rows, columns)
+
+    def clean():
+        frame.df = df
+        frame._clean_df()
+
+    measure(clean)
+
+
+@pytest.mark.parametrize("rows", [100, 1000, 10000])
+@pytest.mark.parametrize("columns", [5, 20])
+def test_render_update_json(measure, make_df, rows, columns):
+    frame = CreateFrame(make_df(rows, columns), "abc123", "first")
+    measure(frame.render_update_json)
+
+
+@pytest.mark.parametrize("rows", [100, 10000])
+@pytest.mark.parametrize("columns", [5, 20])
+def test_render_format_frame(measure, make_df, make_frame, rows, columns):
+    df = make_df(rows, columns)
+    frame = make_frame(df)
+    mapping = {
+        column: "0.0%" if i % 3 else "CURRENCY" for i, column in enumerate(df.columns)
+    }
+    measure(frame.render_format_frame, mapping)
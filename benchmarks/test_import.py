@@ -0,0 +1,32 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Importing the package took ~0.4s when it loaded pandas, the google API client
+# and the configuration files up front; it now takes ~10ms
+MAX_IMPORT_SECONDS = 0.1
+
+
+def import_seconds(statement):
+    """Returns the cumulative seconds spent importing the package in a fresh
+    interpreter, as reported by `python -X importtime`"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    match = re.search(r"\|\s*(\d+)\s*\|\s*gslides$", output.stderr, re.MULTILINE)
+    return int(match.group(1)) / 1e6
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["import gslides", "import gslides\ngslides.initialize_credentials(None)"],
+)
+def test_import_time(benchmark, statement):
+    seconds = benchmark.pedantic(import_seconds, args=(statement,), rounds=5)
+    benchmark.extra_info["import_seconds"] = seconds
+    assert min(import_seconds(statement) for _ in range(3)) < MAX_IMPORT_SECONDS
@@ -0,0 +1,17 @@
+import pytest
+
+from gslides import Table
+from gslides.utils import determine_col_proportion
+
+
+@pytest.mark.parametrize("rows", [10, 50, 200])
+@pytest.mark.parametrize("columns", [5, 20])
+def test_render_update_table_json(measure, make_df, rows, columns):
+    table = Table(make_df(rows, columns))
+    measure(table.render_update_table_json, "table_id", (3000000, 3000000), 0, 0)
+
+
+@pytest.mark.parametrize("rows", [100, 10000])
+@pytest.mark.parametrize("columns", [5, 20])
+def test_determine_col_proportion(measure, make_df, rows, columns):
+    measure(determine_col_proportion, make_df(rows, columns))
@@ -0,0 +1,75 @@
+import pytest
+
+from gslides.utils import (
+    json_chunk_extract,
+    json_chunk_key_extract,
+    json_dict_extract,
+    json_val_extract,
+)
+
+
+def presentation(slides, elements):
+    """Builds a response of `presentations().get` with charts and tables"""
+    return {
+        "presentationId": "abc123",
+        "title": "Benchmark",
+        "slides": [
+            {
+                "objectId": f"slide_{i}",
+                "pageElements": [
+                    (
+                        {
+                            "objectId": f"element_{i}_{j}",
+                            "title": f"chart {i} {j}",
+                            "size": {"width": {"magnitude": 3000000, "unit": "EMU"}},
+                            "sheetsChart": {"spreadsheetId": "abc123", "chartId": j},
+                        }
+                        if j % 2
+                        else {
+                            "objectId": f"element_{i}_{j}",
+                            "table": {
+                                "rows": 10,
+                                "tableRows": [
+                                    {"tableCells": [{"text": {"textElements": []}}] * 5}
+                                ]
+                                * 10,
+                            },
+                        }
+                    )
+                    for j in range(elements)
+                ],
+            }
+            for i in range(slides)
+        ],
+    }
+
+
+def spreadsheet(sheets):
+    """Builds a response of `spreadsheets().get`"""
+    return {
+        "spreadsheetId": "abc123",
+        "sheets": [
+            {"properties": {"sheetId": i, "title": f"sheet {i}", "index": i}}
+            for i in range(sheets)
+        ],
+    }
+
+
+@pytest.mark.parametrize("slides", [10, 100])
+def test_json_val_extract(measure, slides):
+    measure(json_val_extract, presentation(slides, 6), "objectId")
+
+
+@pytest.mark.parametrize("slides", [10, 100])
+def test_json_chunk_key_extract(measure, slides):
+    measure(json_chunk_key_extract, presentation(slides, 6), "sheetsChart")
+
+
+@pytest.mark.parametrize("slides", [10, 100])
+def test_json_chunk_extract(measure, slides):
+    measure(json_chunk_extract, presentation(slides, 6), "objectId", "element_5_3")
+
+
+@pytest.mark.parametrize("sheets", [10, 200])
+def test_json_dict_extract(measure, sheets):
+    measure(json_dict_extract, spreadsheet(sheets), ("title", "sheetId"))
@@ -6,18 +6,63 @@ __author__ = """Michael Gracie"""
 __email__ = ""
 __version__ = "0.1.1"
 
-from typing import Optional
-
-from google.oauth2.credentials import Credentials
-
-from .config import CHART_PARAMS, Creds, Font, PackagePalette
+import importlib
+from typing import TYPE_CHECKING, Any, List, Optional
+
+from .config import Creds, Font, PackagePalette
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+    from .chart import Chart, Series  # noqa
+    from .colors import Palette  # noqa
+    from .config import CHART_PARAMS  # noqa
+    from .frame import Frame  # noqa
+    from .presentation import Presentation  # noqa
+    from .scheduler import Scheduler  # noqa
+    from .session import Session  # noqa
+    from .spreadsheet import Spreadsheet  # noqa
+    from .table import Table  # noqa
+
+__all__ = [
+    "CHART_PARAMS",
+    "Chart",
+    "Frame",
+    "Palette",
+    "Presentation",
+    "Scheduler",
+    "Series",
+    "Session",
+    "Spreadsheet",
+    "Table",
+    "creds",
+    "initialize_credentials",
+    "package_font",
+    "package_palette",
+    "set_font",
+    "set_palette",
+    "set_scheduler",
+]
+
+_LAZY_ATTRIBUTES = {
+    "CHART_PARAMS": "config",
+    "Chart": "chart",
+    "Frame": "frame",
+    "Palette": "colors",
+    "Presentation": "presentation",
+    "Scheduler": "scheduler",
+    "Series": "chart",
+    "Session": "session",
+    "Spreadsheet": "spreadsheet",
+    "Table": "table",
+}
 
 creds = Creds()
 package_font = Font()
 package_palette = PackagePalette()
 
 
-def initialize_credentials(credentials: Optional[Credentials]) -> None:
+def initialize_credentials(credentials: Optional["Credentials"]) -> None:
     """Intializes credentials for all classes in the package.
 
     :param credentials: Credentials to build api connection
@@ -44,9 +89,38 @@ def set_palette(palette: str) -> None:
     package_palette.set_palette(palette)
 
 
-from .chart import Chart, Series  # noqa
-from .colors import Palette  # noqa
-from .frame import Frame  # noqa
-from .presentation import Presentation  # noqa
-from .spreadsheet import Spreadsheet  # noqa
-from .table import Table  # noqa
+def set_scheduler(scheduler: Optional["Scheduler"]) -> None:
+    """Sets the scheduler that throttles and retries the API calls of all
+    classes in the package.
+
+    :param scheduler: The scheduler or None to execute calls directly
+    :type scheduler: :class:`gslides.scheduler.Scheduler`, optional
+    """
+    creds.set_scheduler(scheduler)
+
+
+def __getattr__(name: str) -> Any:
+    """Imports the classes of the package on first access so that importing the
+    package does not import pandas, the google API client or their dependencies.
+
+    :param name: Name of the attribute
+    :type name: str
+    :raises AttributeError:
+    :return: The attribute
+    :rtype: Any
+    """
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    """Lists the attributes of the package including the lazily imported ones
+
+    :return: Names of the attributes
+    :rtype: list
+    """
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
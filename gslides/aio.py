@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the API calls of the package from asyncio. Without a transport the blocking
+calls run in an executor. With an asynchronous transport set with
+:func:`set_transport`, the writes of the methods that can be queued in a
+:class:`Session` are sent through the transport on the event loop.
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_executor: Optional[Executor] = None
+
+_transport: Optional["AsyncTransport"] = None
+
+
+def set_executor(executor: Optional[Executor]) -> None:
+    """Sets the executor that runs the API calls of the asynchronous methods. If
+    not set the default executor of the event loop is used.
+
+    :param executor: The executor
+    :type executor: :class:`concurrent.futures.Executor`, optional
+    """
+    global _executor
+    _executor = executor
+
+
+def set_transport(transport: Optional["AsyncTransport"]) -> None:
+    """Sets the asynchronous http transport of the asynchronous methods and of
+    sessions flushed with `async with`. If not set the blocking calls run in the
+    executor.
+
+    :param transport: The transport
+    :type transport: :class:`AsyncTransport`, optional
+
+    :example:
+
+    >>> set_transport(AiohttpTransport())
+    """
+    global _transport
+    _transport = transport
+
+
+def get_transport() -> Optional["AsyncTransport"]:
+    """Returns the asynchronous http transport that is set
+
+    :return: The transport
+    :rtype: :class:`AsyncTransport`, optional
+    """
+    return _transport
+
+
+async def run_async(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Runs a function in the executor without blocking the event loop. The
+    function runs in a copy of the current context, so a :class:`Session`
+    entered in the calling task applies to it. Each thread of the executor uses
+    its own connections to the APIs so calls awaited concurrently are executed
+    in parallel, up to the number of threads of the executor. The http calls
+    themselves are blocking.
+
+    :param func: The function to run
+    :type func: callable
+    :return: The result of the function
+    :rtype: Any
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_executor, call)
+
+
+async def run_queued(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Runs a method of the package whose writes can be queued in a
+    :class:`Session`. With a transport set, the method runs in the executor
+    within a new session, so that it only renders and queues its writes, and the
+    session is then flushed through the transport, the calls being attributed
+    to the method. Reads made by the method
+    still run in the executor. Without a transport, or within a session that is
+    already active, the method runs as with :func:`run_async`.
+
+    :param func: The method to run
+    :type func: callable
+    :return: The result of the method
+    :rtype: Any
+    """
+    from .instrumentation import operation
+    from .session import Session, current_session
+
+    if _transport is None or current_session() is not None:
+        return await run_async(func, *args, **kwargs)
+    session = Session()
+
+    def queue() -> T:
+        with session.queueing():
+            return func(*args, **kwargs)
+
+    output = await run_async(queue)
+    with operation(getattr(func, "__qualname__", "Session.aflush")):
+        await session._aflush()
+    return output
+
+
+async def execute(request: Any) -> Any:
+    """Executes a request built by a connection of the package, e.g.
+    `creds.sheet_service.spreadsheets().batchUpdate(...)`, and returns its
+    decoded response. With a transport set, the call is made through it,
+    throttled and retried by the scheduler that is set and reported to the
+    callbacks of :mod:`gslides.instrumentation`; the middlewares of the
+    connections do not apply. Without a transport the blocking call runs in the
+    executor.
+
+    :param request: The request
+    :type request: :class:`googleapiclient.http.HttpRequest`
+    :raises HttpError: The call failed
+    :return: The decoded response
+    :rtype: Any
+    """
+    transport = _transport
+    if transport is None:
+        return await run_async(request.execute)
+    from googleapiclient.errors import HttpError
+
+    from . import creds
+    from .instrumentation import emit_event
+
+    uri, method, body, headers = _encode(request)
+    attempts = 0
+
+    async def call() -> Tuple[Any, bytes]:
+        nonlocal attempts
+        attempts += 1
+        return await transport.request(uri, method, body, headers)
+
+    start = time.perf_counter()
+    scheduler = creds.scheduler
+    if scheduler is None:
+        resp, content = await call()
+    else:
+        resp, content = await scheduler.aexecute(uri, method, call, body)
+    emit_event(
+        method, uri, body, resp, content, time.perf_counter() - start, attempts - 1
+    )
+    if resp.status >= 300:
+        raise HttpError(resp, content, uri=uri)
+    return request.postproc(resp, content)
+
+
+def _encode(request: Any) -> Tuple[str, str, Any, Dict[str, str]]:
+    """Returns the uri, method, body and headers of a request. A GET request
+    whose uri is too long is sent as a POST with the query as its body, as the
+    client does.
+
+    :param request: The request
+    :type request: :class:`googleapiclient.http.HttpRequest`
+    :return: The uri, method, body and headers
+    :rtype: tuple
+    """
+    from googleapiclient.http import MAX_URI_LENGTH
+
+    uri, method, body = request.uri, request.method, request.body
+    headers = dict(request.headers)
+    if method == "GET" and len(uri) > MAX_URI_LENGTH:
+        uri, body = uri.split("?", 1)
+        method = "POST"
+        headers["x-http-method-override"] = "GET"
+        headers["content-type"] = "application/x-www-form-urlencoded"
+    if body is not None:
+        headers["content-length"] = str(len(body))
+    return uri, method, body, headers
+
+
+class AsyncTransport:
+    """Base class of the asynchronous http transports set with
+    :func:`set_transport`. A transport sends a request and returns the response
+    and its content as the http transports of the client do."""
+
+    async def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Any, bytes]:
+        """Makes an http request
+
+        :param uri: The uri of the request
+        :type uri: str
+        :param method: The http method of the request
+        :type method: str, optional
+        :param body: The body of the request
+        :type body: str, optional
+        :param headers: The headers of the request
+        :type headers: dict, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Closes the transport"""
+
+
+class AiohttpTransport(AsyncTransport):
+    """An asynchronous http transport using `aiohttp`, authorized with the
+    credentials of the package. Requests share a pool of connections, so calls
+    awaited concurrently are made in parallel without a thread each. The
+    session is created on first use and bound to the event loop of that use.
+    Requires the `aio` extra (`pip install gslides[aio]`).
+
+    :param session: The `aiohttp` session to send requests with
+    :type session: :class:`aiohttp.ClientSession`, optional
+    :param limit: The maximum number of connections of the session created if
+        none is passed
+    :type limit: int, optional
+    """
+
+    def __init__(self, session: Any = None, limit: int = 100) -> None:
+        """Constructor method"""
+        import aiohttp  # noqa: F401
+
+        self.session = session
+        self.limit = limit
+
+    async def _authorize(
+        self, method: str, uri: str, headers: Dict[str, str], refresh: bool
+    ) -> None:
+        """Applies the token of the credentials to the headers of a request. The
+        credentials are loaded and the token refreshed in the executor.
+
+        :param method: The http method of the request
+        :type method: str
+        :param uri: The uri of the request
+        :type uri: str
+        :param headers: The headers of the request
+        :type headers: dict
+        :param refresh: Whether to refresh the token even if it is valid
+        :type refresh: bool
+        """
+        from google.auth.transport.requests import Request
+
+        from . import creds
+
+        shared = creds.shared
+        if shared is None:
+            shared = await run_async(lambda: creds.shared_credentials)
+        if refresh:
+            await run_async(shared.refresh, Request())
+        if shared.valid:
+            shared.apply(headers)
+        else:
+            await run_async(shared.before_request, Request(), method, uri, headers)
+
+    async def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Any, bytes]:
+        """Makes an authorized http request. A request rejected with a 401
+        status is retried once with a refreshed token.
+
+        :param uri: The uri of the request
+        :type uri: str
+        :param method: The http method of the request
+        :type method: str, optional
+        :param body: The body of the request
+        :type body: str, optional
+        :param headers: The headers of the request
+        :type headers: dict, optional
+        :raises ConnectionError: The request could not be sent
+        :return: The response and content
+        :rtype: tuple
+        """
+        import aiohttp
+        import httplib2
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit)
+            )
+        for refresh in (False, True):
+            request_headers = dict(headers or {})
+            await self._authorize(method, uri, request_headers, refresh)
+            try:
+                async with self.session.request(
+                    method, uri, data=body, headers=request_headers
+                ) as response:
+                    content = await response.read()
+            except aiohttp.ClientConnectionError as e:
+                raise ConnectionError(str(e)) from e
+            except asyncio.TimeoutError as e:
+                raise TimeoutError(str(e)) from e
+            if response.status != 401:
+                break
+        info = {key.lower(): value for key, value in response.headers.items()}
+        info["status"] = str(response.status)
+        return httplib2.Response(info), content
+
+    async def close(self) -> None:
+        """Closes the session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
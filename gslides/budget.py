@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Counts the API calls made by a block of code and checks them against a budget
+"""
+
+import contextlib
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+from .instrumentation import CallEvent, add_callback, remove_callback
+
+_APIS = {"sheets.googleapis.com": "sheets", "slides.googleapis.com": "slides"}
+
+
+class BudgetExceededError(AssertionError):
+    """Raised when a block of code makes more API calls than its budget"""
+
+
+class CallCounter:
+    """Counts the http calls, requests within the calls and retries per API.
+    Add it with :func:`gslides.instrumentation.add_callback` or use
+    :func:`count_calls`.
+    """
+
+    def __init__(self) -> None:
+        """Constructor method"""
+        self.lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def __call__(self, event: CallEvent) -> None:
+        """Counts an API call
+
+        :param event: The call
+        :type event: :class:`gslides.instrumentation.CallEvent`
+        """
+        api = next((v for k, v in _APIS.items() if k in event.uri), "other")
+        with self.lock:
+            counts = self.counts.setdefault(
+                api, {"calls": 0, "requests": 0, "retries": 0}
+            )
+            counts["calls"] += 1
+            counts["requests"] += event.requests
+            counts["retries"] += event.retries
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Returns the number of calls, requests and retries per API
+
+        :return: Mapping of API to its counts
+        :rtype: dict
+        """
+        with self.lock:
+            return {api: dict(counts) for api, counts in self.counts.items()}
+
+    def total(self, key: str = "calls", api: Optional[str] = None) -> int:
+        """Returns the number of calls, requests or retries
+
+        :param key: The count to return, either `calls`, `requests` or `retries`
+        :type key: str, optional
+        :param api: The API to count, e.g. `slides`, defaults to all APIs
+        :type api: str, optional
+        :return: The count
+        :rtype: int
+        """
+        return sum(
+            counts[key]
+            for name, counts in self.report().items()
+            if api is None or name == api
+        )
+
+
+@contextlib.contextmanager
+def count_calls() -> Iterator[CallCounter]:
+    """Counts the API calls made within the context
+
+    :return: The counter
+    :rtype: :class:`CallCounter`
+
+    :example:
+
+    >>> with count_calls() as counter:
+    ...     prs.add_slide(charts, layout=(2, 2))
+    >>> counter.report()
+    {'sheets': {'calls': 4, 'requests': 4, 'retries': 0}, ...}
+    """
+    counter = CallCounter()
+    add_callback(counter)
+    try:
+        yield counter
+    finally:
+        remove_callback(counter)
+
+
+@contextlib.contextmanager
+def budget(
+    calls: Optional[int] = None,
+    requests: Optional[int] = None,
+    **api_calls: int,
+) -> Iterator[CallCounter]:
+    """Checks that the code within the context makes at most a number of API
+    calls. Retries are not counted.
+
+    :param calls: The maximum number of calls to all APIs
+    :type calls: int, optional
+    :param requests: The maximum number of requests within the calls to all
+        APIs
+    :type requests: int, optional
+    :param api_calls: The maximum number of calls to an API, e.g. `slides=1`
+    :raises BudgetExceededError: More calls were made than the budget
+    :return: The counter
+    :rtype: :class:`CallCounter`
+
+    :example:
+
+    >>> with budget(slides=1, sheets=4):
+    ...     prs.add_slide(charts, layout=(2, 2), single_request=True)
+    """
+    limits: Dict[Tuple[str, Optional[str]], Optional[int]] = {
+        ("calls", None): calls,
+        ("requests", None): requests,
+    }
+    limits.update({("calls", api): limit for api, limit in api_calls.items()})
+    with count_calls() as counter:
+        yield counter
+    exceeded = []
+    for (key, api), limit in limits.items():
+        if limit is not None and counter.total(key, api) > limit:
+            exceeded.append(
+                f"{counter.total(key, api)} {api + ' ' if api else ''}{key} "
+                f"exceeds the budget of {limit}"
+            )
+    if exceeded:
+        raise BudgetExceededError(f"{'; '.join(exceeded)}: {counter.report()}")
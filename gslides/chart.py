@@ -4,13 +4,16 @@ Charts & series class
 """
 
 import logging
-import pprint
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, cast
 
 from . import creds, package_font, package_palette
+from .aio import run_queued
 from .colors import Palette, translate_color
 from .frame import Frame
+from .instrumentation import instrumented, log_request
+from .session import current_session
 from .utils import (
+    generate_chart_id,
     hex_to_rgb,
     json_val_extract,
     validate_params_float,
@@ -589,12 +592,12 @@ class Chart:
         series_mapping = dict()
         for serie in self.series:
             if not serie.params_dict["series_columns"]:
-                for column in self.data.df.columns.to_list():
+                for column in self.data.columns:
                     if column != self.x_axis_column:
                         series_mapping[column] = serie
             else:
                 for column in serie.params_dict["series_columns"]:
-                    if column in self.data.df.columns.to_list():
+                    if column in self.data.columns:
                         series_mapping[column] = serie
             if (
                 "outlier_percentage" in serie.params_dict.keys()
@@ -697,9 +700,8 @@ class Chart:
                 },
             }
         }
-        domain_col_num = (
-            self.data.start_column_index
-            + self.data.df.columns.to_list().index(self.x_axis_column)
+        domain_col_num = self.data.start_column_index + self.data.columns.index(
+            self.x_axis_column
         )
         domain_json = {
             "sheetId": self.data.sheet_id,
@@ -719,9 +721,7 @@ class Chart:
         else:
             p = None
         for key, val in series_mapping.items():
-            serie_col_num = (
-                self.data.start_column_index + self.data.df.columns.to_list().index(key)
-            )
+            serie_col_num = self.data.start_column_index + self.data.columns.index(key)
             if self.type == "COMBO":
                 series_json = val.render_basic_chart_json(
                     p,
@@ -816,9 +816,7 @@ class Chart:
         else:
             p = None
         for key, val in series_mapping.items():
-            serie_col_num = (
-                self.data.start_column_index + self.data.df.columns.to_list().index(key)
-            )
+            serie_col_num = self.data.start_column_index + self.data.columns.index(key)
             series_json = val.render_histogram_chart_json(
                 p,
                 self.data.sheet_id,
@@ -830,8 +828,21 @@ class Chart:
             json["chart"]["spec"]["histogramChart"]["series"].append(series_json)
         return json
 
+    def _resolve_create(self, output: Any) -> None:
+        """Sets the chart id from the json returned by the create call
+
+        :param output: The json returned by the call
+        :type output: dict or list
+        """
+        self.ch_id = json_val_extract(output, "chartId")[0]
+        self.executed = True
+
+    @instrumented
     def create(self, size: Tuple[int, int] = (600, 371)) -> dict:
-        """Creates the chart in Googe sheets
+        """Creates the chart in Googe sheets. Within a :class:`Session` the
+        creation is queued and the returned dictionary is empty until the session
+        is flushed, which sets the chart id and fills it with the id of the
+        spreadsheet and the replies of the call.
 
         :param size: Tuple of width and height in PX
         :type size: tuple
@@ -849,14 +860,28 @@ class Chart:
                 format_columns[key] = self.y_axis_format
         if format_columns:
             self.data.format_frame(format_columns)
-        service: Any = creds.sheet_service
         if self.type == "HISTOGRAM":
             json = self.render_histogram_chart_json(size)
         else:
             json = self.render_basic_chart_json(size)
+        json["chart"]["chartId"] = generate_chart_id()
         body = {"requests": [{"addChart": json}]}
+        session = current_session()
+        if session:
+            queued: dict = {}
+
+            def resolve(replies: List[dict]) -> None:
+                queued.update(spreadsheetId=self.data.spreadsheet_id, replies=replies)
+                self._resolve_create(replies)
+
+            session.queue_sheet_update(
+                self.data.spreadsheet_id, body["requests"], resolve
+            )
+            logger.info("Queued chart creation")
+            return queued
+        service: Any = creds.sheet_service
         logger.info("Executing chart creation")
-        logger.info(f"Request: {pprint.pformat(body)}")
+        log_request(logger, body)
         output: dict = (
             service.spreadsheets()
             .batchUpdate(
@@ -866,10 +891,17 @@ class Chart:
             .execute()
         )
         logger.info("Chart created successfully")
-        self.ch_id = json_val_extract(output, "chartId")[0]
-        self.executed = True
+        self._resolve_create(output)
         return output
 
+    async def acreate(self, *args: Any, **kwargs: Any) -> dict:
+        """Awaitable version of :meth:`create`, accepting the same parameters.
+
+        :return: The json returned by the call
+        :rtype: dict
+        """
+        return await run_queued(self.create, *args, **kwargs)
+
     @property
     def chart_id(self) -> Optional[str]:
         """Returns the chart_id of the created chart.
@@ -3,27 +3,52 @@
 Manages the color configuration
 """
 
+import functools
 import os
-from typing import Dict, List, Optional, Tuple, TypeVar
-
-import yaml
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, cast
 
+from .config import load_config
 from .utils import hex_to_rgb, validate_hex_color_code
 
-CURR_DIR = os.path.dirname(os.path.abspath(__file__))
-
-with open(os.path.join(CURR_DIR, "config/color_mapping.yaml"), "r") as f:
-    color_mapping: Dict[str, str] = yaml.safe_load(f)
-
-with open(os.path.join(CURR_DIR, "config/base_palettes.yaml"), "r") as f:
-    base_palettes: Dict[str, List[str]] = yaml.safe_load(f)
-
 custom_palettes_path = os.path.join(
     os.path.expanduser("~"), ".gslides/custom_palettes.yaml"
 )
-if os.path.isfile(custom_palettes_path):
-    with open(custom_palettes_path, "r") as f:
-        base_palettes.update(yaml.safe_load(f))
+
+
+def load_color_mapping() -> Dict[str, str]:
+    """Returns the mapping of named colors to hex codes
+
+    :return: Mapping of named colors to hex codes
+    :rtype: dict
+    """
+    return cast(Dict[str, str], load_config("color_mapping.yaml"))
+
+
+@functools.lru_cache(maxsize=None)
+def load_palettes() -> Dict[str, List[str]]:
+    """Returns the base palettes updated with the custom palettes in
+    `~/.gslides/custom_palettes.yaml`. Palettes are read once per process on
+    first use.
+
+    :return: Mapping of palette names to lists of colors
+    :rtype: dict
+    """
+    palettes: Dict[str, List[str]] = dict(load_config("base_palettes.yaml"))
+    if os.path.isfile(custom_palettes_path):
+        import yaml
+
+        with open(custom_palettes_path, "r") as f:
+            palettes.update(yaml.safe_load(f))
+    return palettes
+
+
+def __getattr__(name: str) -> Any:
+    """Loads `color_mapping` and `base_palettes` on first access"""
+    if name == "color_mapping":
+        return load_color_mapping()
+    elif name == "base_palettes":
+        return load_palettes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def translate_color(color: str) -> str:
@@ -36,6 +61,7 @@ def translate_color(color: str) -> str:
     :raises ValueError:
 
     """
+    color_mapping = load_color_mapping()
     if color.lower() in color_mapping.keys():
         return color_mapping[color.lower()]
     elif color[0] == "#":
@@ -56,6 +82,7 @@ class Palette:
 
     def __init__(self, palette: Optional[str] = None) -> None:
         """Constructor method"""
+        base_palettes = load_palettes()
         if palette:
             if palette in base_palettes.keys():
                 self.colors = base_palettes[palette]
@@ -75,7 +102,7 @@ class Palette:
         :type palette: str
 
         """
-        self.colors = base_palettes[name]
+        self.colors = load_palettes()[name]
         self._clean_palette()
         self.index = 0
 
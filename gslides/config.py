@@ -1,72 +1,317 @@
 # -*- coding: utf-8 -*-
+import functools
+import json
 import logging
 import os
-from typing import Dict, Optional
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, cast
 
-import yaml
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import Resource, build
+from .scheduler import ScheduledHttp, Scheduler
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import Resource
 
 logger = logging.getLogger(__name__)
 
 CURR_DIR = os.path.dirname(os.path.abspath(__file__))
 
-with open(os.path.join(CURR_DIR, "config/chart_params.yaml"), "r") as f:
-    CHART_PARAMS: Dict[str, Dict] = yaml.safe_load(f)
+SCOPES = [
+    "https://www.googleapis.com/auth/presentations",
+    "https://www.googleapis.com/auth/spreadsheets",
+]
+
+_CONFIG_FILES = {
+    "CHART_PARAMS": "chart_params.yaml",
+    "PRESENTATION_PARAMS": "presentation_params.yaml",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(file_name: str) -> Any:
+    """Loads a configuration file from the config directory. Each file is parsed
+    once per process on first use.
+
+    :param file_name: The name of the yaml file
+    :type file_name: str
+    :return: The parsed configuration
+    :rtype: dict
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(os.path.join(CURR_DIR, "config", file_name), "r") as f:
+        return yaml.load(f, Loader=loader)
+
+
+def __getattr__(name: str) -> Any:
+    """Loads `CHART_PARAMS` and `PRESENTATION_PARAMS` on first access"""
+    if name in _CONFIG_FILES:
+        return load_config(_CONFIG_FILES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def discovery_document(service_name: str, version: str) -> Optional[Dict]:
+    """Loads the discovery document of an API from the static documents shipped
+    with googleapiclient. The document is parsed once per process.
+
+    :param service_name: The name of the API (e.g. `sheets`)
+    :type service_name: str
+    :param version: The version of the API (e.g. `v4`)
+    :type version: str
+    :return: The discovery document or None if no static document is available
+    :rtype: dict
+    """
+    from googleapiclient import discovery_cache
+
+    doc = discovery_cache.get_static_doc(service_name, version)
+    if doc:
+        return cast(Dict, json.loads(doc))
+    else:
+        return None
+
+
+class SharedCredentials:
+    """Wraps credentials shared by the http transports of several threads so
+    that an expired token is refreshed by one thread at a time.
+
+    :param credentials: The credentials to share
+    :type credentials: :class:`google.auth.credentials.Credentials`
+    """
+
+    def __init__(self, credentials: Any) -> None:
+        """Constructor method"""
+        self.credentials = credentials
+        self.lock = threading.Lock()
+
+    def before_request(
+        self, request: Any, method: str, url: str, headers: Dict
+    ) -> None:
+        """Refreshes the token if it is no longer valid and applies it to the
+        headers of a request
+
+        :param request: The object used to make the refresh request
+        :type request: :class:`google.auth.transport.Request`
+        :param method: The method of the request
+        :type method: str
+        :param url: The url of the request
+        :type url: str
+        :param headers: The headers of the request
+        :type headers: dict
+        """
+        with self.lock:
+            if not self.credentials.valid:
+                self.credentials.refresh(request)
+            self.credentials.apply(headers)
 
-with open(os.path.join(CURR_DIR, "config/presentation_params.yaml"), "r") as f:
-    PRESENTATION_PARAMS: Dict[str, Dict] = yaml.safe_load(f)
+    def refresh(self, request: Any) -> None:
+        """Refreshes the token
+
+        :param request: The object used to make the refresh request
+        :type request: :class:`google.auth.transport.Request`
+        """
+        with self.lock:
+            self.credentials.refresh(request)
+
+    def __getattr__(self, name: str) -> Any:
+        """Passes any other attribute through to the credentials"""
+        return getattr(self.credentials, name)
 
 
 class Creds:
-    """The credentials object to build the connections to the APIs"""
+    """The credentials object to build the connections to the APIs. Each thread
+    is given its own connections, built on first access, with its own http
+    transport. The credentials and their token are shared by all threads so
+    connections can be used concurrently from a thread pool."""
 
     def __init__(self) -> None:
         """Constructor method"""
-        self.crdtls: Optional[Credentials] = None
-        self.sht_srvc: Optional[Resource] = None
-        self.sld_srvc: Optional[Resource] = None
+        self.crdtls: Optional["Credentials"] = None
+        self.shared: Optional[SharedCredentials] = None
+        self.initialized = False
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.scheduler: Optional[Scheduler] = None
+        self.http_factory: Optional[Callable[[], Any]] = None
+        self.middlewares: List[Callable[[Any], Any]] = []
 
-    def set_credentials(self, credentials: Optional[Credentials]) -> None:
-        """Sets the credentials
+    def set_credentials(self, credentials: Optional["Credentials"]) -> None:
+        """Sets the credentials. Connections built with previous credentials are
+        discarded in every thread.
 
         :param credentials: :class:`google.oauth2.credentials.Credentials`
         :type credentials: :class:`google.oauth2.credentials.Credentials`
 
         """
-        self.crdtls = credentials
-        logger.info("Building sheets connection")
-        self.sht_srvc = build("sheets", "v4", credentials=credentials)
-        logger.info("Built sheets connection")
-        logger.info("Building slides connection")
-        self.sld_srvc = build("slides", "v1", credentials=credentials)
-        logger.info("Built slides connection")
+        with self.lock:
+            self.crdtls = credentials
+            self.shared = None
+            self.initialized = True
+            self.generation += 1
+
+    def set_scheduler(self, scheduler: Optional[Scheduler]) -> None:
+        """Sets the scheduler that executes the API calls. Connections built
+        with the previous scheduler are discarded in every thread.
+
+        :param scheduler: The scheduler or None to execute calls directly
+        :type scheduler: :class:`gslides.scheduler.Scheduler`, optional
+        """
+        with self.lock:
+            self.scheduler = scheduler
+            self.generation += 1
+
+    def set_http_factory(self, http_factory: Optional[Callable[[], Any]]) -> None:
+        """Sets the function creating the http transport of each connection in
+        place of an authorized transport, for example to replay recorded
+        responses. Credentials are not required while a factory is set.
+
+        :param http_factory: Function returning an http transport or None to use
+            authorized transports
+        :type http_factory: callable, optional
+        """
+        with self.lock:
+            self.http_factory = http_factory
+            self.generation += 1
+
+    def add_middleware(self, middleware: Callable[[Any], Any]) -> None:
+        """Adds a function wrapping the http transport of each connection. The
+        wrapper must provide the `request` method of the transport.
+
+        :param middleware: Function taking an http transport and returning the
+            wrapped transport
+        :type middleware: callable
+        """
+        with self.lock:
+            self.middlewares.append(middleware)
+            self.generation += 1
+
+    def remove_middleware(self, middleware: Callable[[Any], Any]) -> None:
+        """Removes a function wrapping the http transport of each connection
+
+        :param middleware: The function passed to :meth:`add_middleware`
+        :type middleware: callable
+        """
+        with self.lock:
+            self.middlewares.remove(middleware)
+            self.generation += 1
 
     @property
-    def sheet_service(self) -> Resource:
-        """Returns the connects to the sheets API
+    def shared_credentials(self) -> SharedCredentials:
+        """Returns the credentials shared by all threads. Application default
+        credentials are used if None was set.
+
+        :raises RuntimeError: Must run set_credentials before executing method
+        :return: Shared credentials
+        :rtype: :class:`SharedCredentials`
+        """
+        with self.lock:
+            if not self.initialized:
+                raise RuntimeError("Must run set_credentials before executing method")
+            if self.shared is None:
+                import google.auth
+                import google.auth.credentials
+
+                if self.crdtls is None:
+                    credentials, _ = google.auth.default(scopes=SCOPES)
+                else:
+                    credentials = google.auth.credentials.with_scopes_if_required(
+                        self.crdtls, SCOPES
+                    )
+                self.shared = SharedCredentials(credentials)
+            return self.shared
+
+    def authorized_http(self) -> "AuthorizedHttp":
+        """Returns a new authorized http transport using the shared credentials.
 
         :raises RuntimeError: Must run set_credentials before executing method
+        :return: Authorized http transport
+        :rtype: :class:`google_auth_httplib2.AuthorizedHttp`
+        """
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.http import build_http
+
+        return AuthorizedHttp(self.shared_credentials, http=build_http())
+
+    def build_service(self, service_name: str, version: str) -> "Resource":
+        """Builds a connection to an API with a new http transport from the
+        cached discovery document, falling back to fetching the document if it is
+        not available locally. The transport is wrapped by the middlewares in the
+        order they were added and requests are executed through the scheduler if
+        one is set.
+
+        :param service_name: The name of the API (e.g. `sheets`)
+        :type service_name: str
+        :param version: The version of the API (e.g. `v4`)
+        :type version: str
         :return: API connection
         :rtype: :class:`googleapiclient.discovery.Resource`
         """
-        if self.sht_srvc:
-            return self.sht_srvc
+        from googleapiclient.discovery import build, build_from_document
+
+        from .instrumentation import InstrumentedHttp
+
+        logger.info(f"Building {service_name} connection")
+        if self.http_factory is not None:
+            http = self.http_factory()
+        else:
+            http = self.authorized_http()
+        for middleware in self.middlewares:
+            http = middleware(http)
+        if self.scheduler is not None:
+            http = ScheduledHttp(http, self.scheduler)
+        http = InstrumentedHttp(http)
+        doc = discovery_document(service_name, version)
+        if doc:
+            service = build_from_document(doc, http=http)
         else:
+            service = build(service_name, version, http=http)
+        logger.info(f"Built {service_name} connection")
+        return service
+
+    def thread_service(self, service_name: str, version: str) -> "Resource":
+        """Returns the connection to an API for the current thread, building it
+        on first access.
+
+        :param service_name: The name of the API (e.g. `sheets`)
+        :type service_name: str
+        :param version: The version of the API (e.g. `v4`)
+        :type version: str
+        :raises RuntimeError: Must run set_credentials before executing method
+        :return: API connection
+        :rtype: :class:`googleapiclient.discovery.Resource`
+        """
+        if not self.initialized and self.http_factory is None:
             raise RuntimeError("Must run set_credentials before executing method")
+        if getattr(self.local, "generation", None) != self.generation:
+            self.local.generation = self.generation
+            self.local.services = {}
+        services: Dict[str, "Resource"] = self.local.services
+        if service_name not in services:
+            services[service_name] = self.build_service(service_name, version)
+        return services[service_name]
 
     @property
-    def slide_service(self) -> Resource:
-        """Returns the connects to the slides API
+    def sheet_service(self) -> "Resource":
+        """Returns the connection to the sheets API for the current thread
 
         :raises RuntimeError: Must run set_credentials before executing method
         :return: API connection
         :rtype: :class:`googleapiclient.discovery.Resource`
         """
-        if self.sht_srvc:
-            return self.sld_srvc
-        else:
-            raise RuntimeError("Must run set_credentials before executing method")
+        return self.thread_service("sheets", "v4")
+
+    @property
+    def slide_service(self) -> "Resource":
+        """Returns the connection to the slides API for the current thread
+
+        :raises RuntimeError: Must run set_credentials before executing method
+        :return: API connection
+        :rtype: :class:`googleapiclient.discovery.Resource`
+        """
+        return self.thread_service("slides", "v1")
 
 
 class Font:
@@ -0,0 +1,996 @@
+# -*- coding: utf-8 -*-
+"""
+An in-memory emulator of the parts of the sheets v4 and slides v1 APIs used by
+the package
+"""
+
+import asyncio
+import contextlib
+import copy
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union, cast
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from . import aio, creds
+from .aio import AsyncTransport
+from .scheduler import Scheduler, TokenBucket
+from .utils import char_to_num
+
+_ROUTES: List[Tuple[str, str, "re.Pattern[str]"]] = [
+    ("POST", "sheets.spreadsheets.create", re.compile(r"^/v4/spreadsheets$")),
+    ("GET", "sheets.spreadsheets.get", re.compile(r"^/v4/spreadsheets/([^/:]+)$")),
+    (
+        "POST",
+        "sheets.spreadsheets.batchUpdate",
+        re.compile(r"^/v4/spreadsheets/([^/:]+):batchUpdate$"),
+    ),
+    (
+        "POST",
+        "sheets.values.batchUpdate",
+        re.compile(r"^/v4/spreadsheets/([^/:]+)/values:batchUpdate$"),
+    ),
+    (
+        "GET",
+        "sheets.values.batchGet",
+        re.compile(r"^/v4/spreadsheets/([^/:]+)/values:batchGet$"),
+    ),
+    (
+        "GET",
+        "sheets.values.get",
+        re.compile(r"^/v4/spreadsheets/([^/:]+)/values/(.+)$"),
+    ),
+    ("POST", "slides.presentations.create", re.compile(r"^/v1/presentations$")),
+    (
+        "GET",
+        "slides.presentations.get",
+        re.compile(r"^/v1/presentations/([^/:]+)$"),
+    ),
+    (
+        "POST",
+        "slides.presentations.batchUpdate",
+        re.compile(r"^/v1/presentations/([^/:]+):batchUpdate$"),
+    ),
+]
+
+_CELLS_PATTERN = re.compile(
+    r"^(?P<start_col>[A-Z]*)(?P<start_row>\d*)(?::(?P<end_col>[A-Z]*)(?P<end_row>\d*))?$"
+)
+
+_OBJECT_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_][a-zA-Z0-9_\-:]{4,49}$")
+
+_STATUSES = {
+    400: "INVALID_ARGUMENT",
+    404: "NOT_FOUND",
+    429: "RESOURCE_EXHAUSTED",
+    503: "UNAVAILABLE",
+}
+
+
+class ApiError(ValueError):
+    """An error returned by the emulator as an http error response
+
+    :param code: The http status
+    :type code: int
+    :param message: The error message
+    :type message: str
+    """
+
+    def __init__(self, code: int, message: str) -> None:
+        """Constructor method"""
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.retry_after = 1
+
+    def render_json(self) -> dict:
+        """Renders the json of the error response
+
+        :return: The json of the response
+        :rtype: dict
+        """
+        return {
+            "error": {
+                "code": self.code,
+                "message": self.message,
+                "status": _STATUSES.get(self.code, "UNKNOWN"),
+            }
+        }
+
+
+def _formatted(value: Any) -> Any:
+    """Formats a cell value the way the sheets API renders it by default
+
+    :param value: The value of the cell
+    :type value: Any
+    :return: The formatted value
+    :rtype: str
+    """
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _masked(output: Any, paths: List[List[str]]) -> Any:
+    """Keeps the fields of a response selected by a field mask, applying the
+    mask to each item of a list
+
+    :param output: The response or a part of it
+    :type output: Any
+    :param paths: The paths of the selected fields, e.g. `[["valueRanges", "values"]]`
+    :type paths: list
+    :return: The masked response
+    :rtype: Any
+    """
+    if isinstance(output, list):
+        return [_masked(item, paths) for item in output]
+    if not isinstance(output, dict) or any(not path for path in paths):
+        return output
+    masked = {}
+    for key in dict.fromkeys(path[0] for path in paths):
+        if key in output:
+            masked[key] = _masked(
+                output[key], [path[1:] for path in paths if path[0] == key]
+            )
+    return masked
+
+
+def _text(container: dict) -> str:
+    """Returns the text of a shape or table cell
+
+    :param container: The shape or table cell
+    :type container: dict
+    :return: The text
+    :rtype: str
+    """
+    elements = container.get("text", {}).get("textElements", [])
+    return "".join(e.get("textRun", {}).get("content", "") for e in elements)
+
+
+def _set_text(container: dict, text: str) -> None:
+    """Sets the text of a shape or table cell
+
+    :param container: The shape or table cell
+    :type container: dict
+    :param text: The text
+    :type text: str
+    """
+    if text:
+        container["text"] = {"textElements": [{"textRun": {"content": text}}]}
+    else:
+        container.pop("text", None)
+
+
+class EmulatorHttp:
+    """An http transport sending the requests of a connection to an
+    :class:`Emulator`.
+
+    :param emulator: The emulator
+    :type emulator: :class:`Emulator`
+    """
+
+    def __init__(self, emulator: "Emulator") -> None:
+        """Constructor method"""
+        self.emulator = emulator
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> Tuple[Any, bytes]:
+        """Executes a request against the emulator. A GET request whose uri is
+        too long is sent by the client as a POST with the query as its body and
+        is turned back into a GET.
+
+        :param uri: The uri of the request
+        :type uri: str
+        :param method: The http method of the request
+        :type method: str, optional
+        :param body: The body of the request
+        :type body: str, optional
+        :param headers: The headers of the request
+        :type headers: dict, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        override = (headers or {}).get("x-http-method-override")
+        if override is not None:
+            uri, method, body = f"{uri}?{body}", override, None
+        return self.emulator.request(uri, method, body)
+
+    def close(self) -> None:
+        """Closes the transport"""
+
+
+class EmulatorTransport(AsyncTransport):
+    """An asynchronous http transport sending requests to an :class:`Emulator`.
+    The injected latency is awaited, so calls awaited concurrently overlap.
+
+    :param emulator: The emulator
+    :type emulator: :class:`Emulator`
+    """
+
+    def __init__(self, emulator: "Emulator") -> None:
+        """Constructor method"""
+        self.emulator = emulator
+
+    async def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Any, bytes]:
+        """Executes a request against the emulator
+
+        :param uri: The uri of the request
+        :type uri: str
+        :param method: The http method of the request
+        :type method: str, optional
+        :param body: The body of the request
+        :type body: str, optional
+        :param headers: The headers of the request
+        :type headers: dict, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        override = (headers or {}).get("x-http-method-override")
+        if override is not None:
+            uri, method, body = f"{uri}?{body}", override, None
+        latency = self.emulator._latency()
+        if latency:
+            await asyncio.sleep(latency)
+        return self.emulator._respond(uri, method, body)
+
+
+class Emulator:
+    """Emulates the calls the package makes to the sheets and slides APIs in
+    memory, keeping the spreadsheets, values, charts and presentations created so
+    that they can be read back. Latency, quota errors and server errors can be
+    injected to load test concurrent use. Set it with
+    :meth:`Creds.set_http_factory` or use :func:`emulate`.
+
+    :param latency: The seconds each call takes, or a tuple of the minimum and
+        maximum seconds of a uniformly distributed latency
+    :type latency: float or tuple, optional
+    :param quotas: Requests per minute allowed by API and kind before calls fail
+        with a 429 status, e.g. `{"sheets": {"write": 60}}`
+    :type quotas: dict, optional
+    :param error_rate: The probability of a call failing with a 503 status
+    :type error_rate: float, optional
+    :param seed: Seed of the random injected latencies, errors and ids
+    :type seed: int, optional
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        quotas: Optional[Dict[str, Dict[str, float]]] = None,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Constructor method"""
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.buckets = {
+            (api, kind): TokenBucket(rate=per_minute / 60, capacity=per_minute)
+            for api, kinds in (quotas or {}).items()
+            for kind, per_minute in kinds.items()
+        }
+        self.spreadsheets: Dict[str, dict] = {}
+        self.values: Dict[str, Dict[int, Dict[Tuple[int, int], Any]]] = {}
+        self.presentations: Dict[str, dict] = {}
+        self.lock = threading.RLock()
+        self.reset_stats()
+
+    def __call__(self) -> EmulatorHttp:
+        """Creates an http transport
+
+        :return: The transport
+        :rtype: :class:`EmulatorHttp`
+        """
+        return EmulatorHttp(self)
+
+    def transport(self) -> EmulatorTransport:
+        """Creates an asynchronous http transport, to set with
+        :func:`gslides.aio.set_transport`
+
+        :return: The transport
+        :rtype: :class:`EmulatorTransport`
+        """
+        return EmulatorTransport(self)
+
+    def reset_stats(self) -> None:
+        """Resets the counts of calls"""
+        with self.lock:
+            self.requests: Dict[str, int] = {}
+            self.errors: Dict[int, int] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of calls by method and of injected or invalid
+        calls by status
+
+        :return: The counts of calls
+        :rtype: dict
+        """
+        with self.lock:
+            return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+    def _latency(self) -> float:
+        """Returns the injected latency of a call
+
+        :return: The number of seconds the call takes
+        :rtype: float
+        """
+        if isinstance(self.latency, tuple):
+            with self.lock:
+                return self.random.uniform(*self.latency)
+        return self.latency
+
+    def _inject(self, name: str, method: str) -> None:
+        """Raises the injected quota and server errors of a call
+
+        :param name: The name of the API method
+        :type name: str
+        :param method: The http method of the call
+        :type method: str
+        :raises ApiError: The call is over quota or failed
+        """
+        kind = "read" if method == "GET" else "write"
+        bucket = self.buckets.get((name.split(".")[0], kind))
+        wait = bucket.try_acquire() if bucket is not None else 0
+        if wait:
+            error = ApiError(429, f"Quota exceeded for {name.split('.')[0]} {kind}")
+            error.retry_after = math.ceil(wait)
+            raise error
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise ApiError(503, "The service is currently unavailable.")
+
+    def request(self, uri: str, method: str, body: Any) -> Tuple[Any, bytes]:
+        """Executes a call and renders the http response
+
+        :param uri: The uri of the call
+        :type uri: str
+        :param method: The http method of the call
+        :type method: str
+        :param body: The json encoded body of the call
+        :type body: str, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        latency = self._latency()
+        if latency:
+            time.sleep(latency)
+        return self._respond(uri, method, body)
+
+    def _respond(self, uri: str, method: str, body: Any) -> Tuple[Any, bytes]:
+        """Applies a call and renders the http response
+
+        :param uri: The uri of the call
+        :type uri: str
+        :param method: The http method of the call
+        :type method: str
+        :param body: The json encoded body of the call
+        :type body: str, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        import httplib2
+
+        parts = urlsplit(uri)
+        query = parse_qs(parts.query)
+        path = unquote(parts.path)
+        headers = {"content-type": "application/json; charset=UTF-8"}
+        try:
+            name, args = self._route(path, method)
+            with self.lock:
+                self.requests[name] = self.requests.get(name, 0) + 1
+                self._inject(name, method)
+                payload = json.loads(body) if body else {}
+                output = getattr(self, "_" + name.split(".", 1)[1].replace(".", "_"))(
+                    *args, body=payload, query=query
+                )
+            if "fields" in query:
+                paths = [f.strip().split("/") for f in query["fields"][0].split(",")]
+                output = _masked(output, paths)
+            status = 200
+        except ApiError as e:
+            with self.lock:
+                self.errors[e.code] = self.errors.get(e.code, 0) + 1
+            status, output = e.code, e.render_json()
+            if e.code == 429:
+                headers["retry-after"] = str(e.retry_after)
+        headers["status"] = str(status)
+        return httplib2.Response(headers), json.dumps(output).encode("utf-8")
+
+    def _route(self, path: str, method: str) -> Tuple[str, Tuple[str, ...]]:
+        """Determines the API method of a call
+
+        :param path: The path of the call
+        :type path: str
+        :param method: The http method of the call
+        :type method: str
+        :raises ApiError: The method is not emulated
+        :return: The name of the method and the parameters in its path
+        :rtype: tuple
+        """
+        for route_method, name, pattern in _ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                return name, match.groups()
+        raise ApiError(404, f"{method} {path} is not emulated")
+
+    def _new_id(self) -> str:
+        """Returns a new document id
+
+        :return: The id
+        :rtype: str
+        """
+        return uuid.UUID(int=self.random.getrandbits(128)).hex
+
+    def _spreadsheet(self, spreadsheet_id: str) -> dict:
+        """Returns a spreadsheet
+
+        :param spreadsheet_id: The id of the spreadsheet
+        :type spreadsheet_id: str
+        :raises ApiError: The spreadsheet does not exist
+        :return: The spreadsheet
+        :rtype: dict
+        """
+        if spreadsheet_id not in self.spreadsheets:
+            raise ApiError(404, f"Requested entity was not found: {spreadsheet_id}")
+        return self.spreadsheets[spreadsheet_id]
+
+    def _presentation(self, presentation_id: str) -> dict:
+        """Returns a presentation
+
+        :param presentation_id: The id of the presentation
+        :type presentation_id: str
+        :raises ApiError: The presentation does not exist
+        :return: The presentation
+        :rtype: dict
+        """
+        if presentation_id not in self.presentations:
+            raise ApiError(404, f"Requested entity was not found: {presentation_id}")
+        return self.presentations[presentation_id]
+
+    # Sheets
+
+    def _sheet_properties(self, doc: dict, properties: dict) -> dict:
+        """Renders the properties of a new sheet
+
+        :param doc: The spreadsheet
+        :type doc: dict
+        :param properties: The requested properties
+        :type properties: dict
+        :raises ApiError: The title or id of the sheet is already used
+        :return: The properties
+        :rtype: dict
+        """
+        sheets = [sheet["properties"] for sheet in doc["sheets"]]
+        title = properties.get("title", f"Sheet{len(sheets) + 1}")
+        if title in [sheet["title"] for sheet in sheets]:
+            raise ApiError(400, f"A sheet with the name {title} already exists.")
+        if "sheetId" in properties:
+            sheet_id = properties["sheetId"]
+        else:
+            sheet_id = 0 if not sheets else self.random.randint(1, 2 ** 31 - 1)
+        if sheet_id in [sheet["sheetId"] for sheet in sheets]:
+            raise ApiError(400, f"A sheet with the id {sheet_id} already exists.")
+        return {
+            "sheetType": "GRID",
+            "index": len(sheets),
+            **properties,
+            "sheetId": sheet_id,
+            "title": title,
+            "gridProperties": {
+                "rowCount": 1000,
+                "columnCount": 26,
+                **properties.get("gridProperties", {}),
+            },
+        }
+
+    def _sheet(self, doc: dict, title: Optional[str]) -> dict:
+        """Returns the properties of a sheet by title, or of the first sheet
+
+        :param doc: The spreadsheet
+        :type doc: dict
+        :param title: The title of the sheet
+        :type title: str, optional
+        :raises ApiError: The sheet does not exist
+        :return: The properties of the sheet
+        :rtype: dict
+        """
+        for sheet in doc["sheets"]:
+            if title is None or sheet["properties"]["title"] == title:
+                return cast(dict, sheet["properties"])
+        raise ApiError(400, f"Unable to parse range: {title}")
+
+    def _spreadsheets_create(self, body: dict, query: dict) -> dict:
+        """Emulates `spreadsheets().create`"""
+        spreadsheet_id = self._new_id()
+        doc: Dict[str, Any] = {
+            "spreadsheetId": spreadsheet_id,
+            "properties": {"title": "Untitled spreadsheet"},
+            "sheets": [],
+        }
+        doc["properties"].update(body.get("properties", {}))
+        for sheet in body.get("sheets") or [{"properties": {}}]:
+            properties = self._sheet_properties(doc, sheet.get("properties", {}))
+            doc["sheets"].append({"properties": properties})
+        doc[
+            "spreadsheetUrl"
+        ] = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
+        self.spreadsheets[spreadsheet_id] = doc
+        self.values[spreadsheet_id] = {
+            sheet["properties"]["sheetId"]: {} for sheet in doc["sheets"]
+        }
+        return copy.deepcopy(doc)
+
+    def _spreadsheets_get(self, spreadsheet_id: str, body: dict, query: dict) -> dict:
+        """Emulates `spreadsheets().get`"""
+        return copy.deepcopy(self._spreadsheet(spreadsheet_id))
+
+    def _spreadsheets_batchUpdate(
+        self, spreadsheet_id: str, body: dict, query: dict
+    ) -> dict:
+        """Emulates `spreadsheets().batchUpdate`. The requests are applied to a
+        copy of the spreadsheet which replaces it once all requests succeed."""
+        doc = copy.deepcopy(self._spreadsheet(spreadsheet_id))
+        values = dict(self.values[spreadsheet_id])
+        replies = []
+        for request in body.get("requests", []):
+            (kind, params), *_ = request.items()
+            if kind == "addSheet":
+                properties = self._sheet_properties(doc, params.get("properties", {}))
+                doc["sheets"].append({"properties": properties})
+                values[properties["sheetId"]] = {}
+                replies.append({"addSheet": {"properties": properties}})
+            elif kind == "deleteSheet":
+                sheets = [
+                    s
+                    for s in doc["sheets"]
+                    if s["properties"]["sheetId"] != params["sheetId"]
+                ]
+                if len(sheets) == len(doc["sheets"]):
+                    raise ApiError(400, f"No sheet with id: {params['sheetId']}")
+                doc["sheets"] = sheets
+                values.pop(params["sheetId"], None)
+                replies.append({})
+            elif kind == "addChart":
+                chart = copy.deepcopy(params["chart"])
+                chart.setdefault("chartId", self.random.randint(1, 2 ** 31 - 1))
+                if any(
+                    existing["chartId"] == chart["chartId"]
+                    for sheet in doc["sheets"]
+                    for existing in sheet.get("charts", [])
+                ):
+                    raise ApiError(400, f"Duplicate chart id: {chart['chartId']}")
+                sheet_id = chart["position"].get("overlayPosition", {})
+                sheet_id = sheet_id.get("anchorCell", {}).get("sheetId")
+                for sheet in doc["sheets"]:
+                    if sheet["properties"]["sheetId"] == sheet_id:
+                        sheet.setdefault("charts", []).append(chart)
+                        break
+                else:
+                    raise ApiError(400, f"No sheet with id: {sheet_id}")
+                replies.append({"addChart": {"chart": chart}})
+            else:
+                replies.append({})
+        self.spreadsheets[spreadsheet_id] = doc
+        self.values[spreadsheet_id] = values
+        return {"spreadsheetId": spreadsheet_id, "replies": replies}
+
+    def _parse_range(
+        self, doc: dict, rng: str
+    ) -> Tuple[dict, int, int, Optional[int], Optional[int]]:
+        """Parses a range in A1 notation
+
+        :param doc: The spreadsheet
+        :type doc: dict
+        :param rng: The range, e.g. `Sheet1!A1:B2`
+        :type rng: str
+        :raises ApiError: The range is invalid
+        :return: The properties of the sheet and the zero based first row, first
+            column, last row and last column of the range, where a missing last row
+            or column is open ended
+        :rtype: tuple
+        """
+        sheet_name, separator, cells = rng.rpartition("!")
+        match = _CELLS_PATTERN.match(cells)
+        if not separator and (match is None or not cells):
+            return self._sheet(doc, rng.strip("'")), 0, 0, None, None
+        if match is None or not cells:
+            raise ApiError(400, f"Unable to parse range: {rng}")
+        sheet = self._sheet(doc, sheet_name.strip("'") if separator else None)
+        start_row = int(match["start_row"] or 1) - 1
+        start_col = char_to_num(match["start_col"] or "A") - 1
+        if match["end_col"] is None and match["end_row"] is None:
+            end_row: Optional[int] = start_row if match["start_row"] else None
+            end_col: Optional[int] = start_col if match["start_col"] else None
+        else:
+            end_row = int(match["end_row"]) - 1 if match["end_row"] else None
+            end_col = char_to_num(match["end_col"]) - 1 if match["end_col"] else None
+        return sheet, start_row, start_col, end_row, end_col
+
+    def _values_get(
+        self, spreadsheet_id: str, rng: str, body: dict, query: dict
+    ) -> dict:
+        """Emulates `spreadsheets().values().get`"""
+        doc = self._spreadsheet(spreadsheet_id)
+        sheet, start_row, start_col, end_row, end_col = self._parse_range(doc, rng)
+        cells = self.values[spreadsheet_id][sheet["sheetId"]]
+        if end_row is None:
+            end_row = max([row for row, _ in cells], default=-1)
+        if end_col is None:
+            end_col = max([col for _, col in cells], default=-1)
+        unformatted = query.get("valueRenderOption") == ["UNFORMATTED_VALUE"]
+        rows = []
+        for row in range(start_row, end_row + 1):
+            values = [
+                cells.get((row, col), "") for col in range(start_col, end_col + 1)
+            ]
+            while values and values[-1] == "":
+                values.pop()
+            rows.append(values if unformatted else [_formatted(v) for v in values])
+        while rows and not rows[-1]:
+            rows.pop()
+        output: Dict[str, Any] = {"range": rng, "majorDimension": "ROWS"}
+        if rows:
+            output["values"] = rows
+        return output
+
+    def _values_batchGet(self, spreadsheet_id: str, body: dict, query: dict) -> dict:
+        """Emulates `spreadsheets().values().batchGet`"""
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "valueRanges": [
+                self._values_get(spreadsheet_id, rng, body=body, query=query)
+                for rng in query.get("ranges", [])
+            ],
+        }
+
+    def _values_batchUpdate(self, spreadsheet_id: str, body: dict, query: dict) -> dict:
+        """Emulates `spreadsheets().values().batchUpdate`. Null values leave the
+        cell unchanged and the grid of a sheet grows to fit the values."""
+        doc = self._spreadsheet(spreadsheet_id)
+        parsed = [
+            (self._parse_range(doc, value_range["range"]), value_range)
+            for value_range in body.get("data", [])
+        ]
+        responses = []
+        for (sheet, start_row, start_col, _, _), value_range in parsed:
+            cells = self.values[spreadsheet_id][sheet["sheetId"]]
+            rows = value_range.get("values", [])
+            columns = max([len(row) for row in rows], default=0)
+            for i, row in enumerate(rows):
+                for j, value in enumerate(row):
+                    if value is not None:
+                        cells[(start_row + i, start_col + j)] = value
+            grid = sheet["gridProperties"]
+            grid["rowCount"] = max(grid["rowCount"], start_row + len(rows))
+            grid["columnCount"] = max(grid["columnCount"], start_col + columns)
+            responses.append(
+                {
+                    "spreadsheetId": spreadsheet_id,
+                    "updatedRange": value_range["range"],
+                    "updatedRows": len(rows),
+                    "updatedColumns": columns,
+                    "updatedCells": sum(len(row) for row in rows),
+                }
+            )
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "totalUpdatedRows": sum(r["updatedRows"] for r in responses),
+            "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+            "responses": responses,
+        }
+
+    # Slides
+
+    def _presentations_create(self, body: dict, query: dict) -> dict:
+        """Emulates `presentations().create`. The presentation starts with one
+        slide with the id `p`, as in Google slides."""
+        presentation_id = self._new_id()
+        doc = {
+            "presentationId": presentation_id,
+            "title": body.get("title", "Untitled presentation"),
+            "pageSize": {
+                "width": {"magnitude": 9144000, "unit": "EMU"},
+                "height": {"magnitude": 5143500, "unit": "EMU"},
+            },
+            "slides": [{"objectId": "p", "pageType": "SLIDE", "pageElements": []}],
+        }
+        self.presentations[presentation_id] = doc
+        return copy.deepcopy(doc)
+
+    def _presentations_get(self, presentation_id: str, body: dict, query: dict) -> dict:
+        """Emulates `presentations().get`"""
+        return copy.deepcopy(self._presentation(presentation_id))
+
+    def _presentations_batchUpdate(
+        self, presentation_id: str, body: dict, query: dict
+    ) -> dict:
+        """Emulates `presentations().batchUpdate`. The requests are applied to a
+        copy of the presentation which replaces it once all requests succeed."""
+        doc = copy.deepcopy(self._presentation(presentation_id))
+        replies = []
+        for request in body.get("requests", []):
+            (kind, params), *_ = request.items()
+            handler = getattr(self, f"_slides_{kind}", self._slides_update)
+            replies.append(handler(doc, params))
+        self.presentations[presentation_id] = doc
+        return {"presentationId": presentation_id, "replies": replies}
+
+    def _objects(self, doc: dict) -> Dict[str, Tuple[Optional[dict], dict]]:
+        """Returns the slides and page elements of a presentation by id
+
+        :param doc: The presentation
+        :type doc: dict
+        :return: Mapping of object ids to the slide of each element, or None for
+            slides, and the object
+        :rtype: dict
+        """
+        objects: Dict[str, Tuple[Optional[dict], dict]] = {}
+        for slide in doc["slides"]:
+            objects[slide["objectId"]] = (None, slide)
+            for element in slide.get("pageElements", []):
+                objects[element["objectId"]] = (slide, element)
+        return objects
+
+    def _object(self, doc: dict, object_id: str) -> dict:
+        """Returns a slide or page element
+
+        :param doc: The presentation
+        :type doc: dict
+        :param object_id: The id of the object
+        :type object_id: str
+        :raises ApiError: The object does not exist
+        :return: The object
+        :rtype: dict
+        """
+        objects = self._objects(doc)
+        if object_id not in objects:
+            raise ApiError(400, f"The object ({object_id}) could not be found.")
+        return objects[object_id][1]
+
+    def _object_id(self, doc: dict, params: dict) -> str:
+        """Returns the id requested for a new object or generates one
+
+        :param doc: The presentation
+        :type doc: dict
+        :param params: The parameters of the request
+        :type params: dict
+        :raises ApiError: The id is invalid or already used
+        :return: The id
+        :rtype: str
+        """
+        object_id = params.get("objectId")
+        if object_id is None:
+            return f"g{self._new_id()[:12]}_0"
+        if not _OBJECT_ID_PATTERN.match(object_id):
+            raise ApiError(400, f"Invalid object ID: {object_id}")
+        if object_id in self._objects(doc):
+            raise ApiError(400, f"The object ID ({object_id}) should be unique.")
+        return cast(str, object_id)
+
+    def _add_element(self, doc: dict, params: dict, element: dict) -> dict:
+        """Adds a page element to the slide of its element properties
+
+        :param doc: The presentation
+        :type doc: dict
+        :param params: The parameters of the request
+        :type params: dict
+        :param element: The content of the element
+        :type element: dict
+        :raises ApiError: The slide does not exist
+        :return: The id of the element
+        :rtype: dict
+        """
+        object_id = self._object_id(doc, params)
+        properties = params.get("elementProperties", {})
+        slide = self._object(doc, properties.get("pageObjectId", ""))
+        if "pageElements" not in slide:
+            raise ApiError(400, f"The page ({slide['objectId']}) is not a slide.")
+        slide["pageElements"].append(
+            {
+                "objectId": object_id,
+                "size": properties.get("size", {}),
+                "transform": properties.get("transform", {}),
+                **element,
+            }
+        )
+        return {"objectId": object_id}
+
+    def _slides_createSlide(self, doc: dict, params: dict) -> dict:
+        """Emulates the `createSlide` request"""
+        object_id = self._object_id(doc, params)
+        index = params.get("insertionIndex", len(doc["slides"]))
+        doc["slides"].insert(
+            index, {"objectId": object_id, "pageType": "SLIDE", "pageElements": []}
+        )
+        return {"createSlide": {"objectId": object_id}}
+
+    def _slides_createShape(self, doc: dict, params: dict) -> dict:
+        """Emulates the `createShape` request"""
+        shape = {"shape": {"shapeType": params.get("shapeType", "TEXT_BOX")}}
+        return {"createShape": self._add_element(doc, params, shape)}
+
+    def _slides_createSheetsChart(self, doc: dict, params: dict) -> dict:
+        """Emulates the `createSheetsChart` request. The chart must exist in an
+        emulated spreadsheet."""
+        spreadsheet = self._spreadsheet(params["spreadsheetId"])
+        charts = {
+            chart["chartId"]: chart
+            for sheet in spreadsheet["sheets"]
+            for chart in sheet.get("charts", [])
+        }
+        if params.get("chartId") not in charts:
+            raise ApiError(400, f"Invalid chart ID: {params.get('chartId')}")
+        element = {
+            "title": charts[params["chartId"]]["spec"].get("title", ""),
+            "sheetsChart": {
+                "spreadsheetId": params["spreadsheetId"],
+                "chartId": params["chartId"],
+            },
+        }
+        return {"createSheetsChart": self._add_element(doc, params, element)}
+
+    def _slides_createTable(self, doc: dict, params: dict) -> dict:
+        """Emulates the `createTable` request"""
+        rows, columns = params["rows"], params["columns"]
+        table = {
+            "rows": rows,
+            "columns": columns,
+            "tableRows": [
+                {
+                    "tableCells": [
+                        {"location": {"rowIndex": i, "columnIndex": j}}
+                        for j in range(columns)
+                    ]
+                }
+                for i in range(rows)
+            ],
+        }
+        return {"createTable": self._add_element(doc, params, {"table": table})}
+
+    def _text_container(self, doc: dict, params: dict) -> dict:
+        """Returns the shape or table cell of a text request
+
+        :param doc: The presentation
+        :type doc: dict
+        :param params: The parameters of the request
+        :type params: dict
+        :raises ApiError: The object does not hold text
+        :return: The shape or table cell
+        :rtype: dict
+        """
+        element = self._object(doc, params["objectId"])
+        if "cellLocation" in params and "table" in element:
+            location = params["cellLocation"]
+            rows = element["table"]["tableRows"]
+            try:
+                row = rows[location.get("rowIndex", 0)]
+                return cast(dict, row["tableCells"][location.get("columnIndex", 0)])
+            except IndexError:
+                raise ApiError(400, f"Invalid cell location: {location}")
+        if "shape" in element:
+            return cast(dict, element["shape"])
+        raise ApiError(400, f"The object ({params['objectId']}) has no text.")
+
+    def _slides_insertText(self, doc: dict, params: dict) -> dict:
+        """Emulates the `insertText` request"""
+        container = self._text_container(doc, params)
+        text = _text(container)
+        index = params.get("insertionIndex", 0)
+        _set_text(container, text[:index] + params.get("text", "") + text[index:])
+        return {}
+
+    def _slides_replaceAllText(self, doc: dict, params: dict) -> dict:
+        """Emulates the `replaceAllText` request"""
+        contains = params["containsText"]
+        flags = 0 if contains.get("matchCase") else re.IGNORECASE
+        pattern = re.compile(re.escape(contains["text"]), flags)
+        page_ids = params.get("pageObjectIds") or []
+        occurrences = 0
+        for slide in doc["slides"]:
+            if page_ids and slide["objectId"] not in page_ids:
+                continue
+            containers = []
+            for element in slide["pageElements"]:
+                if "shape" in element:
+                    containers.append(element["shape"])
+                for row in element.get("table", {}).get("tableRows", []):
+                    containers.extend(row["tableCells"])
+            for container in containers:
+                text, count = pattern.subn(
+                    lambda _: params.get("replaceText", ""), _text(container)
+                )
+                if count:
+                    _set_text(container, text)
+                    occurrences += count
+        return {"replaceAllText": {"occurrencesChanged": occurrences}}
+
+    def _slides_deleteObject(self, doc: dict, params: dict) -> dict:
+        """Emulates the `deleteObject` request"""
+        objects = self._objects(doc)
+        if params["objectId"] not in objects:
+            raise ApiError(
+                400, f"The object ({params['objectId']}) could not be found."
+            )
+        slide, obj = objects[params["objectId"]]
+        if slide is None:
+            doc["slides"].remove(obj)
+        else:
+            slide["pageElements"].remove(obj)
+        return {}
+
+    def _slides_refreshSheetsChart(self, doc: dict, params: dict) -> dict:
+        """Emulates the `refreshSheetsChart` request"""
+        if "sheetsChart" not in self._object(doc, params["objectId"]):
+            raise ApiError(400, f"The object ({params['objectId']}) is not a chart.")
+        return {}
+
+    def _slides_update(self, doc: dict, params: dict) -> dict:
+        """Emulates the requests updating the properties of an object, which are
+        only checked to refer to an existing object"""
+        if "objectId" in params:
+            self._object(doc, params["objectId"])
+        return {}
+
+
+@contextlib.contextmanager
+def emulate(
+    throttle: bool = True, transport: Optional[bool] = None, **kwargs: Any
+) -> Iterator[Emulator]:
+    """Sends the API calls made within the context to an in-memory
+    :class:`Emulator` instead of Google, without credentials or a network.
+
+    :param throttle: Whether calls are throttled and retried by the scheduler
+        that is set, or by a :class:`gslides.Scheduler` with the default quotas
+        if none is set
+    :type throttle: bool, optional
+    :param transport: Whether the asynchronous methods send their calls through
+        an :class:`EmulatorTransport`. By default one replaces the asynchronous
+        transport that is set, if any
+    :type transport: bool, optional
+    :param kwargs: The parameters of the :class:`Emulator`
+    :return: The emulator
+    :rtype: :class:`Emulator`
+
+    :example:
+
+    >>> with emulate(latency=(0.05, 0.2)) as emulator:
+    ...     prs = Presentation.create("Load test")
+    ...     prs.add_slide([chart], layout=(1, 1))
+    >>> emulator.stats()
+    """
+    emulator = Emulator(**kwargs)
+    http_factory: Optional[Callable[[], Any]] = creds.http_factory
+    scheduler = creds.scheduler
+    async_transport = aio.get_transport()
+    creds.set_http_factory(emulator)
+    if transport is None:
+        transport = async_transport is not None
+    aio.set_transport(emulator.transport() if transport else None)
+    if not throttle:
+        creds.set_scheduler(None)
+    elif scheduler is None:
+        creds.set_scheduler(Scheduler())
+    try:
+        yield emulator
+    finally:
+        creds.set_http_factory(http_factory)
+        creds.set_scheduler(scheduler)
+        aio.set_transport(async_transport)
@@ -3,18 +3,37 @@
 Frame class
 """
 
+import itertools
 import logging
-import pprint
-from typing import Any, Dict, List, Tuple, Type, TypeVar, cast
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import pandas as pd
 
 from . import creds
+from .aio import run_async, run_queued
+from .instrumentation import instrumented, log_request
+from .session import Session, current_session
+from .splitter import split_values
 from .utils import (
     cell_to_num,
-    clean_dtypes,
+    clean_df,
     clean_list_of_list,
-    clean_nan,
     num_to_char,
     validate_cell_name,
 )
@@ -23,6 +42,10 @@ logger = logging.getLogger(__name__)
 
 TFrame = TypeVar("TFrame", bound="Frame")
 
+PROBE_ROWS = 100
+
+MAX_PROBE_ROWS = 10000
+
 
 def format_type(number_type: str) -> Dict[str, Any]:
     """Takes a specified number type and outputs the necessary json, controlling
@@ -54,6 +77,36 @@ def format_type(number_type: str) -> Dict[str, Any]:
         return {"type": "NUMBER", "pattern": number_type}
 
 
+def render_range(
+    sheet_name: str,
+    start_column_index: int,
+    start_row_index: int,
+    end_column_index: int,
+    end_row_index: int,
+) -> str:
+    """Renders the A1 notation of a group of cells in a sheet
+
+    :param sheet_name: The name of the sheet
+    :type sheet_name: str
+    :param start_column_index: The index of the starting column of the cells
+    :type start_column_index: int
+    :param start_row_index: The index of the starting row of the cells
+    :type start_row_index: int
+    :param end_column_index: The index of the ending column of the cells
+    :type end_column_index: int
+    :param end_row_index: The index of the ending row of the cells
+    :type end_row_index: int
+    :return: The range, e.g. `Sheet1!A1:C10`
+    :rtype: str
+    """
+    return (
+        f"{sheet_name}!{num_to_char(start_column_index)}"
+        f"{start_row_index}:"
+        f"{num_to_char(end_column_index)}{end_row_index}"
+    )
+
+
+@instrumented
 def get_sheet_data(
     spreadsheet_id,
     sheet_name: str,
@@ -61,6 +114,7 @@ def get_sheet_data(
     start_row_index: int,
     end_column_index: int,
     end_row_index: int,
+    value_render_option: str = "FORMATTED_VALUE",
 ) -> List[List]:
 
     """Gets the data from a given groups of cells in a sheet
@@ -77,21 +131,28 @@ def get_sheet_data(
     :type end_column_index: int
     :param end_row_index: The index of the ending row of the data
     :type end_row_index: int
+    :param value_render_option: How values are rendered, e.g. `UNFORMATTED_VALUE`
+        to get numbers without their number format. Dates are rendered as
+        formatted strings
+    :type value_render_option: str, optional
     :return: A list of lists capturing the data
     :rtype: list
     """
     service: Any = creds.sheet_service
-    rng = (
-        f"{sheet_name}!{num_to_char(start_column_index)}"
-        f"{start_row_index}:"
-        f"{num_to_char(end_column_index)}{end_row_index}"
+    rng = render_range(
+        sheet_name, start_column_index, start_row_index, end_column_index, end_row_index
     )
 
     logger.info("Getting data from google sheets")
     output = (
         service.spreadsheets()
         .values()
-        .get(spreadsheetId=spreadsheet_id, range=rng)
+        .get(
+            spreadsheetId=spreadsheet_id,
+            range=rng,
+            valueRenderOption=value_render_option,
+            dateTimeRenderOption="FORMATTED_STRING",
+        )
         .execute()
     )
     logger.info("Successfully retreived data")
@@ -101,11 +162,188 @@ def get_sheet_data(
         return [[]]
 
 
+@instrumented
+def batch_get_sheet_data(spreadsheet_id: str, ranges: List[str]) -> List[List[List]]:
+    """Gets the data from several groups of cells of a spreadsheet in a single
+    call
+
+    :param spreadsheet_id: The id of the spreadsheet
+    :type spreadsheet_id: str
+    :param ranges: The ranges of the groups of cells, e.g. `Sheet1!A1:C10`
+    :type ranges: list
+    :raises RuntimeError: The response does not hold a value range per range
+    :return: A list of lists capturing the data of each range
+    :rtype: list
+    """
+    service: Any = creds.sheet_service
+    logger.info(f"Getting data of {len(ranges)} ranges from google sheets")
+    output = (
+        service.spreadsheets()
+        .values()
+        .batchGet(spreadsheetId=spreadsheet_id, ranges=ranges)
+        .execute()
+    )
+    logger.info("Successfully retreived data")
+    value_ranges = output.get("valueRanges", [])
+    if len(value_ranges) != len(ranges):
+        raise RuntimeError(
+            f"Expected {len(ranges)} value ranges, received {len(value_ranges)}"
+        )
+    return [
+        cast(List[List], value_range.get("values", [[]]))
+        for value_range in value_ranges
+    ]
+
+
+def write_sheet_data(
+    spreadsheet_id: str,
+    data: List[Dict[str, Any]],
+    value_input_option: str = "USER_ENTERED",
+    callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+) -> None:
+    """Writes value ranges to a spreadsheet, queueing them in the active
+    :class:`Session` if there is one. Data exceeding the size limits of a call is
+    split into several calls of consecutive rows.
+
+    :param spreadsheet_id: The id of the spreadsheet
+    :type spreadsheet_id: str
+    :param data: The value ranges
+    :type data: list
+    :param value_input_option: How the input data is interpreted
+    :type value_input_option: str, optional
+    :param callback: Function that receives the responses for the value ranges
+        once they are written
+    :type callback: callable, optional
+    """
+    session = current_session()
+    if session:
+        session.queue_values_update(
+            spreadsheet_id, data, callback, value_input_option=value_input_option
+        )
+        logger.info("Queued data update")
+        return
+    service: Any = creds.sheet_service
+    batches, _ = split_values(data)
+    responses: List[Dict[str, Any]] = []
+    for batch in batches:
+        body = {"valueInputOption": value_input_option, "data": batch}
+        logger.info("Writing data to google sheets")
+        log_request(logger, body)
+        output = (
+            service.spreadsheets()
+            .values()
+            .batchUpdate(spreadsheetId=spreadsheet_id, body=body)
+            .execute()
+        )
+        if callback is not None:
+            responses.extend(output.get("responses", []))
+        logger.info("Successfully wrote data")
+    if callback is not None:
+        callback(responses)
+
+
+def _probe_ranges(rng: str) -> Iterator[str]:
+    """Splits a group of cells into blocks of rows to probe for existing data in
+    order. The first block has `PROBE_ROWS` rows and each following block twice
+    the rows of the previous one, up to `MAX_PROBE_ROWS` rows.
+
+    :param rng: The range of the cells, e.g. `Sheet1!A1:C10`
+    :type rng: str
+    :return: Iterator of the ranges of the blocks
+    :rtype: iterator
+    """
+    sheet_name, _, cells = rng.rpartition("!")
+    start_cell, _, end_cell = cells.partition(":")
+    start_row_index, start_column_index = cell_to_num(start_cell)
+    end_row_index, end_column_index = cell_to_num(end_cell or start_cell)
+    rows = PROBE_ROWS
+    while start_row_index <= end_row_index:
+        block_end_row_index = min(start_row_index + rows - 1, end_row_index)
+        yield render_range(
+            sheet_name,
+            start_column_index,
+            start_row_index,
+            end_column_index,
+            block_end_row_index,
+        )
+        start_row_index = block_end_row_index + 1
+        rows = min(rows * 2, MAX_PROBE_ROWS)
+
+
+def _has_values(spreadsheet_id: str, ranges: List[str]) -> List[bool]:
+    """Checks whether any value exists in several groups of cells with a single
+    call requesting only their unformatted values
+
+    :param spreadsheet_id: The id of the spreadsheet
+    :type spreadsheet_id: str
+    :param ranges: The ranges of the groups of cells
+    :type ranges: list
+    :return: Whether each range holds any value
+    :rtype: list
+    """
+    service: Any = creds.sheet_service
+    output = (
+        service.spreadsheets()
+        .values()
+        .batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=ranges,
+            valueRenderOption="UNFORMATTED_VALUE",
+            fields="valueRanges/values",
+        )
+        .execute()
+    )
+    value_ranges = output.get("valueRanges", [])
+    return [
+        i < len(value_ranges) and bool(value_ranges[i].get("values"))
+        for i in range(len(ranges))
+    ]
+
+
+@instrumented
+def has_sheet_data(spreadsheet_id: str, ranges: List[str]) -> List[bool]:
+    """Checks whether any value exists in several groups of cells of a
+    spreadsheet. The groups are probed together in blocks of rows of growing
+    size, one block of each group per call, and a group is no longer probed once
+    a block holding a value is found. At most the values of one block of
+    `MAX_PROBE_ROWS` rows are transferred per group, while an empty group takes
+    a call per block.
+
+    :param spreadsheet_id: The id of the spreadsheet
+    :type spreadsheet_id: str
+    :param ranges: The ranges of the groups of cells, e.g. `Sheet1!A1:C10`
+    :type ranges: list
+    :return: Whether each range holds any value
+    :rtype: list
+    """
+    logger.info(f"Checking {len(ranges)} ranges for existing data")
+    probes = [_probe_ranges(rng) for rng in ranges]
+    existing = [False] * len(ranges)
+    pending = list(range(len(ranges)))
+    while pending:
+        blocks: Dict[int, str] = {}
+        for i in pending:
+            block = next(probes[i], None)
+            if block is not None:
+                blocks[i] = block
+        if not blocks:
+            break
+        found = _has_values(spreadsheet_id, list(blocks.values()))
+        pending = []
+        for i, has_values in zip(blocks, found):
+            existing[i] = has_values
+            if not has_values:
+                pending.append(i)
+    return existing
+
+
 class CreateFrame:
     """Class to create data in Google sheets.
 
-    :param df: Data to be created in Google sheets
-    :type df: :class:`pandas.DataFrame`
+    :param df: Data to be created in Google sheets. Either a dataframe or an
+        iterable of dataframes sharing the same columns, which are streamed to
+        Google sheets in order
+    :type df: :class:`pandas.DataFrame` or iterable
     :param spreadsheet_id: The id associated with the spreadsheet
     :type spreadsheet_id: str
     :param sheet_name: The name associated with the sheet
@@ -116,25 +354,65 @@ class CreateFrame:
     :param anchor_cell: The cell name (e.g. `A5`) that will correspond to the
         top left observation in the dataframe
     :type anchor_cell: str, optional
+    :param chunk_rows: The number of rows to upload per API call. If not passed
+        a dataframe is uploaded in a single call and each dataframe of an iterable
+        is uploaded in its own call
+    :type chunk_rows: int, optional
+    :param workers: The number of blocks of rows to upload in parallel
+    :type workers: int, optional
     """
 
     def __init__(
         self,
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
         spreadsheet_id: str,
         sheet_name: str,
         overwrite_data: bool = False,
         anchor_cell: str = "A1",
+        chunk_rows: Optional[int] = None,
+        workers: int = 1,
     ) -> None:
         """Constructor method"""
-        self.df = df
+        if isinstance(df, pd.DataFrame):
+            self.df = df
+            self.chunks: Optional[Iterator[pd.DataFrame]] = None
+        else:
+            chunks = iter(df)
+            first = next(chunks, pd.DataFrame())
+            self.df = first.iloc[:0]
+            self.chunks = itertools.chain([first], chunks)
         self.spreadsheet_id = spreadsheet_id
         self.sheet_name = sheet_name
         self.overwrite_data = overwrite_data
         self.anchor_cell = validate_cell_name(anchor_cell.upper())
+        self.chunk_rows = self._validate_chunk_rows(chunk_rows)
+        self.workers = workers
         self.start_row_index, self.start_column_index = cell_to_num(self.anchor_cell)
         self.end_row_index, self.end_column_index = self._calc_end_index()
-        self._clean_df()
+        if not self.streaming:
+            self._clean_df()
+
+    @property
+    def streaming(self) -> bool:
+        """Whether the data is uploaded in blocks of rows
+
+        :return: Whether the data is uploaded in blocks of rows
+        :rtype: bool
+        """
+        return self.chunks is not None or self.chunk_rows is not None
+
+    def _validate_chunk_rows(self, chunk_rows: Optional[int]) -> Optional[int]:
+        """Validates that the number of rows per chunk is a positive integer
+
+        :param chunk_rows: The number of rows to upload per API call
+        :type chunk_rows: int, optional
+        :raises ValueError: chunk_rows must be an integer greater than 0
+        :return: The number of rows to upload per API call
+        :rtype: int, optional
+        """
+        if chunk_rows is not None and (type(chunk_rows) != int or chunk_rows < 1):
+            raise ValueError("chunk_rows must be an integer greater than 0")
+        return chunk_rows
 
     def _calc_end_index(self) -> Tuple[int, int]:
         """Calculates the ending row and column index based on the anchor cell
@@ -154,8 +432,7 @@ class CreateFrame:
         :return: Cleaned :class:`pandas.DataFrame`
         :type df: :class:`pandas.DataFrame`
         """
-        self.df = self.df.applymap(clean_dtypes)
-        self.df = clean_nan(self.df)
+        self.df = clean_df(self.df)
 
     def render_update_json(self) -> dict:
         """Renders the json to update the data in Google sheets
@@ -182,35 +459,173 @@ class CreateFrame:
         }
         return json
 
-    def execute(self) -> bool:
-        """Executes the API call
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Iterates over the blocks of rows to upload
 
-        :return: Whether the function executed
-        :rtype: bool
+        :return: Iterator of dataframes
+        :rtype: iterator
         """
+        chunks = self.chunks if self.chunks is not None else iter([self.df])
+        for chunk in chunks:
+            if self.chunk_rows is None:
+                yield chunk
+            else:
+                for i in range(0, chunk.shape[0], self.chunk_rows):
+                    yield chunk.iloc[i : i + self.chunk_rows]  # noqa
 
-        service: Any = creds.sheet_service
-        json = self.render_update_json()
-        if self.overwrite_data is False:
-            existing_data = get_sheet_data(
-                self.spreadsheet_id,
-                self.sheet_name,
-                self.start_column_index,
+    def render_update_chunks(self) -> Iterator[Tuple[int, int, dict]]:
+        """Renders the json to update the data in Google sheets one block of rows
+        at a time. Each block is cleaned as it is rendered so only a single block
+        is held in memory. The header is included with the first block and the
+        ending row index is updated as blocks are rendered.
+
+        :return: Iterator of the first row, last row and json of each block
+        :rtype: iterator
+        """
+        first_column = num_to_char(self.start_column_index)
+        last_column = num_to_char(self.end_column_index)
+        row_index = self.start_row_index + 1
+        data: List[Dict[str, Any]] = [
+            {
+                "range": (
+                    f"{self.sheet_name}!{first_column}{self.start_row_index}:"
+                    f"{last_column}{self.start_row_index}"
+                ),
+                "values": [self.df.columns.tolist()],
+            }
+        ]
+        for chunk in self._iter_chunks():
+            if chunk.shape[0] == 0:
+                continue
+            end_row_index = row_index + chunk.shape[0] - 1
+            data.append(
+                {
+                    "range": (
+                        f"{self.sheet_name}!{first_column}{row_index}:"
+                        f"{last_column}{end_row_index}"
+                    ),
+                    "values": clean_df(chunk).values.tolist(),
+                }
+            )
+            first_row_index = self.start_row_index if len(data) == 2 else row_index
+            yield (
+                first_row_index,
+                end_row_index,
+                {"valueInputOption": "USER_ENTERED", "data": data},
+            )
+            row_index = end_row_index + 1
+            self.end_row_index = row_index
+            data = []
+        if data:
+            yield (
                 self.start_row_index,
-                self.end_column_index,
-                self.end_row_index,
+                self.start_row_index,
+                {"valueInputOption": "USER_ENTERED", "data": data},
             )
-            if existing_data:
-                raise RuntimeError("Create table will overwrite existing data")
-        logger.info("Creating data in google sheets")
-        logger.info(f"Request: {pprint.pformat(json)}")
+
+    def _check_overwrite(self, start_row_index: int, end_row_index: int) -> None:
+        """Checks that there is no existing data in the given rows
+
+        :param start_row_index: The index of the starting row
+        :type start_row_index: int
+        :param end_row_index: The index of the ending row
+        :type end_row_index: int
+        :raises RuntimeError: Create table will overwrite existing data
+        """
+        rng = render_range(
+            self.sheet_name,
+            self.start_column_index,
+            start_row_index,
+            self.end_column_index,
+            end_row_index,
+        )
+        if any(has_sheet_data(self.spreadsheet_id, [rng])):
+            raise RuntimeError("Create table will overwrite existing data")
+
+    def _render_checked_chunks(self) -> Iterator[dict]:
+        """Renders the json of each block of rows, checking that the rows of a
+        streamed block hold no existing data before it is rendered for upload
+
+        :return: Iterator of the json of each block
+        :rtype: iterator
+        """
+        check = self.overwrite_data is False and self.chunks is not None
+        for start_row_index, end_row_index, body in self.render_update_chunks():
+            if check:
+                self._check_overwrite(start_row_index, end_row_index)
+            yield body
+
+    @instrumented
+    def _execute_chunk(self, body: dict) -> None:
+        """Executes the API call for a single block of rows
+
+        :param body: The json to do the update
+        :type body: dict
+        """
+        service: Any = creds.sheet_service
+        logger.info("Creating data chunk in google sheets")
+        log_request(logger, body)
         (
             service.spreadsheets()
             .values()
-            .batchUpdate(spreadsheetId=self.spreadsheet_id, body=json)
+            .batchUpdate(spreadsheetId=self.spreadsheet_id, body=body)
             .execute()
         )
-        logger.info("Successfully created data")
+        logger.info("Successfully created data chunk")
+
+    def _execute_chunks(self) -> bool:
+        """Executes the API calls block by block. With more than one worker blocks
+        are uploaded in parallel, each thread using its own connection, while at
+        most `workers` blocks are held in memory. Existing data is checked for
+        once before a dataframe is uploaded. As the number of rows streamed from
+        an iterable is unknown, the rows of each streamed block are checked
+        before it is uploaded, so the blocks before one overwriting data are
+        written.
+
+        :return: Whether the function executed
+        :rtype: bool
+        """
+        session = current_session()
+        if self.overwrite_data is False and self.chunks is None:
+            self.end_row_index = self.start_row_index + self.df.shape[0] + 1
+            self._check_overwrite(self.start_row_index, self.end_row_index)
+        if session or self.workers <= 1:
+            for body in self._render_checked_chunks():
+                if session:
+                    session.queue_values_update(
+                        self.spreadsheet_id,
+                        body["data"],
+                        value_input_option=body["valueInputOption"],
+                    )
+                else:
+                    self._execute_chunk(body)
+            return True
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures: Set[Future] = set()
+            for body in self._render_checked_chunks():
+                if len(futures) >= self.workers:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                futures.add(executor.submit(self._execute_chunk, body))
+            for future in futures:
+                future.result()
+        return True
+
+    @instrumented
+    def execute(self) -> bool:
+        """Executes the API call. Data exceeding the size limits of a call is
+        split into several calls of consecutive rows.
+
+        :return: Whether the function executed
+        :rtype: bool
+        """
+        if self.streaming:
+            return self._execute_chunks()
+        json = self.render_update_json()
+        if self.overwrite_data is False:
+            self._check_overwrite(self.start_row_index, self.end_row_index)
+        write_sheet_data(self.spreadsheet_id, json["data"], json["valueInputOption"])
         return True
 
 
@@ -247,12 +662,35 @@ class GetFrame:
         self.end_row_index, self.end_column_index = cell_to_num(self.bottom_right_cell)
         self.df: pd.DataFrame = pd.DataFrame()
 
-    def execute(self) -> bool:
+    def execute(self, lazy: bool = False) -> bool:
         """Executes the API call
 
+        :param lazy: Whether only the header row is downloaded, leaving an empty
+            dataframe with the columns of the data
+        :type lazy: bool, optional
         :return: Whether the function executed
         :rtype: bool
         """
+        if lazy:
+            output = get_sheet_data(
+                self.spreadsheet_id,
+                self.sheet_name,
+                self.start_column_index,
+                self.start_row_index,
+                self.end_column_index,
+                self.start_row_index,
+            )
+            self.df = pd.DataFrame(columns=output[0])
+        else:
+            self.df = self.load()
+        return True
+
+    def load(self) -> pd.DataFrame:
+        """Downloads the data
+
+        :return: The dataframe
+        :rtype: :class:`pandas.DataFrame`
+        """
         output = get_sheet_data(
             self.spreadsheet_id,
             self.sheet_name,
@@ -261,10 +699,72 @@ class GetFrame:
             self.end_column_index,
             self.end_row_index,
         )
+        return self.to_df(output)
+
+    @property
+    def range(self) -> str:
+        """Returns the A1 notation of the cells of the data
+
+        :return: The range, e.g. `Sheet1!A1:C10`
+        :rtype: str
+        """
+        return render_range(
+            self.sheet_name,
+            self.start_column_index,
+            self.start_row_index,
+            self.end_column_index,
+            self.end_row_index,
+        )
+
+    @staticmethod
+    def to_df(output: List[List]) -> pd.DataFrame:
+        """Converts the downloaded cells, with the header in the first row, to a
+        dataframe
+
+        :param output: A list of lists capturing the data
+        :type output: list
+        :return: The dataframe
+        :rtype: :class:`pandas.DataFrame`
+        """
         output = clean_list_of_list(output)
-        self.df = pd.DataFrame(data=output[1:], columns=output[0])
-        self.df = self.df.replace("", None)
-        return True
+        df = pd.DataFrame(data=output[1:], columns=output[0])
+        return df.replace("", None)
+
+
+def _hash_text(value: Any) -> str:
+    """Renders a value as the text hashed for a row, with floats without a
+    fractional part rendered as integers and missing values as empty text
+
+    :param value: The value
+    :type value: Any
+    :return: The text
+    :rtype: str
+    """
+    if value is None or value != value:
+        return ""
+    if isinstance(value, float) and value.is_integer() and abs(value) < 2 ** 53:
+        return str(int(value))
+    return str(value)
+
+
+def _hash_rows(df: pd.DataFrame) -> pd.Series:
+    """Hashes the content of each row of a cleaned dataframe or of the
+    unformatted values downloaded from Google sheets. Values are hashed as text,
+    with floats without a fractional part hashed as integers as Google sheets
+    returns `1.0` as `1`.
+
+    :param df: The cleaned dataframe or downloaded values
+    :type df: :class:`pandas.DataFrame`
+    :return: The hash of each row
+    :rtype: :class:`pandas.Series`
+    """
+    columns = {
+        cnt: df.iloc[:, cnt].astype(object).map(_hash_text)
+        for cnt in range(df.shape[1])
+    }
+    return pd.util.hash_pandas_object(
+        pd.DataFrame(columns, index=df.index), index=False
+    )
 
 
 class Frame:
@@ -309,6 +809,10 @@ class Frame:
         initialized: bool = False,
     ) -> None:
         """Constructor method"""
+        self._lock = threading.Lock()
+        self._load: Optional[Callable[[], pd.DataFrame]] = None
+        self._hashes: Optional[pd.Series] = None
+        self._pending: Optional[Tuple[Session, pd.DataFrame, pd.Series]] = None
         self.df = df
         self.spreadsheet_id = spreadsheet_id
         self.sheet_id = sheet_id
@@ -319,6 +823,41 @@ class Frame:
         self.end_row_index = end_row_index
         self.initialized = initialized
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """Returns the dataframe. The data of a frame got with `lazy=True` is
+        downloaded on first access.
+
+        :return: The dataframe
+        :rtype: :class:`pandas.DataFrame`
+        """
+        with self._lock:
+            if self._load is not None:
+                self._df = self._load()
+                self._load = None
+        return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        """Sets the dataframe
+
+        :param df: The dataframe
+        :type df: :class:`pandas.DataFrame`
+        """
+        self._df = df
+        self._load = None
+        self._hashes = None
+
+    @property
+    def columns(self) -> List:
+        """Returns the columns of the data without downloading the data of a frame
+        got with `lazy=True`
+
+        :return: The column names
+        :rtype: list
+        """
+        return cast(List, self._df.columns.to_list())
+
     def __repr__(self) -> str:
         """Prints class information.
 
@@ -339,17 +878,26 @@ class Frame:
     @classmethod
     def create(
         cls: Type[TFrame],
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
         spreadsheet_id: str,
         sheet_id: int,
         sheet_name: str,
         overwrite_data: bool = False,
         anchor_cell: str = "A1",
+        chunk_rows: Optional[int] = None,
+        workers: int = 1,
     ) -> TFrame:
-        """Creates the table of data in Google sheets
+        """Creates the table of data in Google sheets. Large dataframes can be
+        uploaded in blocks of rows with `chunk_rows`, optionally in parallel with
+        `workers`. An iterable of dataframes (e.g. the chunks of a SQL query) is
+        streamed to Google sheets without being held in memory, in which case the
+        dataframe of the returned :class:`Frame` only contains the columns. Unless
+        `overwrite_data` is set, the rows of each streamed block are checked for
+        existing data before the block is uploaded.
 
-        :param df: The dataframe
-        :type df: :class:`pd.DataFrame`
+        :param df: The dataframe or an iterable of dataframes sharing the same
+            columns
+        :type df: :class:`pd.DataFrame` or iterable
         :param spreadsheet_id: The id of the spreadsheet
         :type spreadsheet_id: str
         :param sheet_id: The id associated with the sheet
@@ -361,6 +909,10 @@ class Frame:
         :param anchor_cell: The cell name (e.g. `A5`) that will correspond to the
             top left observation in the dataframe
         :type anchor_cell: str
+        :param chunk_rows: The number of rows to upload per API call
+        :type chunk_rows: int, optional
+        :param workers: The number of blocks of rows to upload in parallel
+        :type workers: int, optional
         :return: :class:`gslides.Frame` object
         :rtype: :class:`gslides.Frame`
 
@@ -371,10 +923,12 @@ class Frame:
             sheet_name,
             overwrite_data=overwrite_data,
             anchor_cell=anchor_cell,
+            chunk_rows=chunk_rows,
+            workers=workers,
         )
         initialized = frame.execute()
-        return cls(
-            df,
+        output = cls(
+            df if isinstance(df, pd.DataFrame) else frame.df,
             spreadsheet_id,
             sheet_id,
             sheet_name,
@@ -384,6 +938,19 @@ class Frame:
             frame.end_row_index,
             initialized,
         )
+        if not frame.streaming:
+            output._hashes = _hash_rows(frame.df)
+        return output
+
+    @classmethod
+    async def acreate(cls: Type[TFrame], *args: Any, **kwargs: Any) -> TFrame:
+        """Awaitable version of :meth:`create`, accepting the same parameters.
+
+        :return: :class:`gslides.Frame` object
+        :rtype: :class:`gslides.Frame`
+
+        """
+        return await run_queued(cls.create, *args, **kwargs)
 
     @classmethod
     def get(
@@ -393,8 +960,11 @@ class Frame:
         sheet_name: str,
         anchor_cell: str,
         bottom_right_cell: str,
+        lazy: bool = False,
     ) -> TFrame:
-        """Gets the table of data in Google sheets
+        """Gets the table of data in Google sheets. With `lazy` only the header
+        row is downloaded, which is all a :class:`Chart` needs, and the data is
+        downloaded when :attr:`df` is first accessed.
 
         :param spreadsheet_id: The id of the spreadsheet
         :type spreadsheet_id: str
@@ -408,6 +978,9 @@ class Frame:
         :param bottom_right_cell: The cell name (e.g. `B7`) that will correspond
             to the bottom right observation in the dataframe
         :type bottom_right_cell: str
+        :param lazy: Whether the data is downloaded on first access to the
+            dataframe
+        :type lazy: bool, optional
         :return: :class:`gslides.Frame` object
         :rtype: :class:`gslides.Frame`
 
@@ -419,8 +992,8 @@ class Frame:
             anchor_cell,
             bottom_right_cell,
         )
-        initialized = frame.execute()
-        return cls(
+        initialized = frame.execute(lazy=lazy)
+        output = cls(
             frame.df,
             spreadsheet_id,
             sheet_id,
@@ -431,12 +1004,196 @@ class Frame:
             frame.end_row_index,
             initialized,
         )
+        if lazy:
+            output._load = frame.load
+        return output
+
+    @classmethod
+    async def aget(cls: Type[TFrame], *args: Any, **kwargs: Any) -> TFrame:
+        """Awaitable version of :meth:`get`, accepting the same parameters.
+
+        :return: :class:`gslides.Frame` object
+        :rtype: :class:`gslides.Frame`
+
+        """
+        return await run_async(cls.get, *args, **kwargs)
+
+    def _load_unformatted(self) -> pd.DataFrame:
+        """Downloads the unformatted values of the data, so that numbers are
+        compared without their number format
+
+        :return: The dataframe
+        :rtype: :class:`pandas.DataFrame`
+        """
+        output = get_sheet_data(
+            self.spreadsheet_id,
+            self.sheet_name,
+            self.start_column_index,
+            self.start_row_index,
+            self.start_column_index + len(self.columns) - 1,
+            self.end_row_index,
+            value_render_option="UNFORMATTED_VALUE",
+        )
+        return GetFrame.to_df(output)
+
+    def _update_base(self, session: Optional[Session]) -> Tuple[List, pd.Series]:
+        """Returns the columns and row hashes an update is compared to. Within a
+        session these are those of the last update queued in the session, so that
+        several updates of a frame build on each other.
+
+        :param session: The active session
+        :type session: :class:`Session`, optional
+        :return: The column names and the row hashes
+        :rtype: tuple
+        """
+        if self._pending is not None and self._pending[0] is session:
+            _, df, hashes = self._pending
+            return df.columns.tolist(), hashes
+        if self._hashes is None:
+            self._hashes = _hash_rows(self._load_unformatted())
+        return self.columns, self._hashes
+
+    def _render_update_diff(
+        self, df: pd.DataFrame, session: Optional[Session] = None
+    ) -> Tuple[List[Dict[str, Any]], pd.Series]:
+        """Renders the value ranges to update the table of data in Google sheets
+        to a new dataframe. Rows are compared to the last known data by a hash of
+        their content and each run of consecutive changed rows is rendered as one
+        range. Empty cells, rows and columns beyond the new dataframe are cleared
+        and a change of columns rewrites the table.
+
+        :param df: The new dataframe
+        :type df: :class:`pandas.DataFrame`
+        :param session: The active session
+        :type session: :class:`Session`, optional
+        :return: The value ranges of the changed rows and the row hashes of the
+            new dataframe
+        :rtype: tuple
+        """
+        new_df = clean_df(df)
+        new_hashes = _hash_rows(new_df)
+        columns, hashes = self._update_base(session)
+        old_hashes = hashes.to_numpy()
+        columns_changed = new_df.columns.tolist() != columns
+        width = max(new_df.shape[1], len(columns))
+        first_column = num_to_char(self.start_column_index)
+        last_column = num_to_char(self.start_column_index + width - 1)
+        data: List[Dict[str, Any]] = []
+        if columns_changed:
+            header = new_df.columns.tolist()
+            data.append(
+                {
+                    "range": (
+                        f"{self.sheet_name}!{first_column}{self.start_row_index}:"
+                        f"{last_column}{self.start_row_index}"
+                    ),
+                    "values": [header + [""] * (width - len(header))],
+                }
+            )
+        rows = new_df.values.tolist()
+        changed = [
+            columns_changed or i >= len(old_hashes) or h != old_hashes[i]
+            for i, h in enumerate(new_hashes.to_numpy())
+        ]
+        rows += [[] for _ in range(len(old_hashes) - len(rows))]
+        changed += [True] * (len(rows) - len(changed))
+        index = 0
+        for is_changed, group in itertools.groupby(changed):
+            count = len(list(group))
+            if is_changed:
+                first_row = self.start_row_index + 1 + index
+                data.append(
+                    {
+                        "range": (
+                            f"{self.sheet_name}!{first_column}{first_row}:"
+                            f"{last_column}{first_row + count - 1}"
+                        ),
+                        "values": [
+                            ["" if v is None else v for v in row]
+                            + [""] * (width - len(row))
+                            for row in rows[index : index + count]  # noqa
+                        ],
+                    }
+                )
+            index += count
+        return data, new_hashes
+
+    @instrumented
+    def update(self, df: pd.DataFrame) -> List[str]:
+        """Updates the table of data in Google sheets to a new dataframe with the
+        same anchor cell, writing only the rows that changed since the data was
+        last created or updated. For a frame got from Google sheets the
+        unformatted values are downloaded once to compare against, so getting it
+        with `lazy=True` avoids downloading the data twice. Within a
+        :class:`Session` the frame takes the new dataframe once the session is
+        flushed, and later updates in the session are compared to the updates
+        already queued.
+
+        :param df: The new dataframe
+        :type df: :class:`pandas.DataFrame`
+        :return: The ranges written
+        :rtype: list
+        """
+        session = current_session()
+        data, hashes = self._render_update_diff(df, session)
+        pending = self._pending is not None and self._pending[0] is session
+        if session is not None and (data or pending):
+            self._pending = (session, df, hashes)
+            if data:
+                write_sheet_data(
+                    self.spreadsheet_id,
+                    data,
+                    callback=lambda responses: self._commit_pending(session),
+                )
+        else:
+            if data:
+                write_sheet_data(self.spreadsheet_id, data)
+            self._commit_update(df, hashes)
+        return [value_range["range"] for value_range in data]
+
+    def _commit_update(self, df: pd.DataFrame, hashes: pd.Series) -> None:
+        """Sets the dataframe and row hashes of the frame once an update is
+        written
+
+        :param df: The new dataframe
+        :type df: :class:`pandas.DataFrame`
+        :param hashes: The row hashes of the new dataframe
+        :type hashes: :class:`pandas.Series`
+        """
+        self.df = df
+        self._hashes = hashes
+        self.end_row_index = self.start_row_index + df.shape[0] + 1
+        self.end_column_index = self.start_column_index + df.shape[1]
+
+    def _commit_pending(self, session: Session) -> None:
+        """Commits the last update queued in a session once the session is
+        flushed. All the queued updates of a frame are written before their
+        callbacks run, so the first callback commits the last update.
+
+        :param session: The flushed session
+        :type session: :class:`Session`
+        """
+        if self._pending is not None and self._pending[0] is session:
+            _, df, hashes = self._pending
+            self._pending = None
+            self._commit_update(df, hashes)
+
+    async def aupdate(self, *args: Any, **kwargs: Any) -> List[str]:
+        """Awaitable version of :meth:`update`, accepting the same parameters.
+
+        :return: The ranges written
+        :rtype: list
+
+        """
+        return await run_queued(self.update, *args, **kwargs)
 
     def render_format_frame(
         self,
         column_mapping: Dict[str, str],
     ):
-        """Renders the json to format a column in Google slides
+        """Renders the json to format a column in Google slides. Adjacent columns
+        with the same number type are formatted by a single range level request
+        whose size does not depend on the number of rows.
 
         :param column_mapping: A mapping of column name to number type
         :type column_mapping: dict
@@ -446,34 +1203,36 @@ class Frame:
         """
         index_mapping: Dict[int, str] = {}
         for key, val in column_mapping.items():
-            if key in list(self.df.columns):
-                col = list(self.df.columns).index(key)
+            if key in self.columns:
+                col = self.columns.index(key)
                 index_mapping[col] = val
 
-        requests = []
+        ranges: List[List[Any]] = []
+        for k in sorted(index_mapping.keys()):
+            if ranges and ranges[-1][1] == k and ranges[-1][2] == index_mapping[k]:
+                ranges[-1][1] = k + 1
+            else:
+                ranges.append([k, k + 1, index_mapping[k]])
 
-        for k, v in index_mapping.items():
+        requests = []
+        for start, end, v in ranges:
             json: Dict[str, Any] = {
-                "updateCells": {
-                    "rows": [],
+                "repeatCell": {
                     "range": {
                         "sheetId": self.sheet_id,
                         "startRowIndex": self.start_row_index - 1,
-                        "startColumnIndex": self.start_column_index + k - 1,
+                        "startColumnIndex": self.start_column_index + start - 1,
                         "endRowIndex": self.end_row_index,
-                        "endColumnIndex": self.start_column_index + k,
+                        "endColumnIndex": self.start_column_index + end - 1,
                     },
+                    "cell": {"userEnteredFormat": {"numberFormat": format_type(v)}},
                     "fields": "userEnteredFormat",
                 }
             }
-            row_json: Dict[str, Any] = {
-                "values": [{"userEnteredFormat": {"numberFormat": format_type(v)}}]
-            }
-            for i in range(self.df.shape[0] + 1):
-                json["updateCells"]["rows"].append(row_json)
             requests.append(json)
         return {"requests": requests}
 
+    @instrumented
     def format_frame(self, column_mapping):
         """Formats a column in Google sheets. See
         https://developers.google.com/sheets/api/reference/rest/v4/spreadsheets/cells#NumberFormat
@@ -487,10 +1246,15 @@ class Frame:
         >>> frame = Frame.get(...)
         >>> frame.format_frame({'column1': '0.0%'})
         """
-        service: Any = creds.sheet_service
         body = self.render_format_frame(column_mapping)
+        session = current_session()
+        if session:
+            session.queue_sheet_update(self.spreadsheet_id, body["requests"])
+            logger.info("Queued frame formatting")
+            return
+        service: Any = creds.sheet_service
         logger.info("Formatting frame in google sheets")
-        logger.info(f"Request: {pprint.pformat(body)}")
+        log_request(logger, body)
         (
             service.spreadsheets()
             .batchUpdate(
@@ -501,6 +1265,10 @@ class Frame:
         )
         logger.info("Successfully formatted frame")
 
+    async def aformat_frame(self, *args: Any, **kwargs: Any) -> None:
+        """Awaitable version of :meth:`format_frame`, accepting the same parameters."""
+        return await run_queued(self.format_frame, *args, **kwargs)
+
     @property
     def get_method(self) -> str:
         """Returns the corresponding get initialization method.
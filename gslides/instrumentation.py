@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Emits an event with the timing and size of each API call to registered callbacks
+"""
+
+import contextlib
+import contextvars
+import functools
+import logging
+import pprint
+import re
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .scheduler import ScheduledHttp
+from .transport import document_id
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_operation: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "gslides_operation", default=None
+)
+
+_TOKENS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},]')
+
+_EMPTY_LIST = re.compile(r"\s*\]")
+
+_LIST_KEYS = ('"requests"', '"data"')
+
+_callbacks: List[Callable[["CallEvent"], None]] = []
+
+
+class CallEvent(NamedTuple):
+    """An API call
+
+    :param operation: The method of the package that made the call, e.g.
+        `Chart.create`
+    :type operation: str, optional
+    :param method: The http method of the call
+    :type method: str
+    :param uri: The uri of the call
+    :type uri: str
+    :param document_id: The id of the spreadsheet or presentation
+    :type document_id: str, optional
+    :param status: The http status of the response
+    :type status: int
+    :param latency: The seconds taken by the call, including retries
+    :type latency: float
+    :param request_bytes: The size of the encoded body of the call
+    :type request_bytes: int
+    :param response_bytes: The size of the encoded response
+    :type response_bytes: int
+    :param requests: The number of requests or value ranges in the body,
+        otherwise 1 for a call with a body
+    :type requests: int
+    :param retries: The number of times the call was retried
+    :type retries: int
+    """
+
+    operation: Optional[str]
+    method: str
+    uri: str
+    document_id: Optional[str]
+    status: int
+    latency: float
+    request_bytes: int
+    response_bytes: int
+    requests: int
+    retries: int
+
+
+def add_callback(callback: Callable[[CallEvent], None]) -> None:
+    """Adds a function called with a :class:`CallEvent` after each API call.
+    Callbacks are called from the thread making the call.
+
+    :param callback: The function
+    :type callback: callable
+
+    :example:
+
+    >>> events = []
+    >>> add_callback(events.append)
+    """
+    _callbacks.append(callback)
+
+
+def remove_callback(callback: Callable[[CallEvent], None]) -> None:
+    """Removes a function passed to :func:`add_callback`
+
+    :param callback: The function
+    :type callback: callable
+    """
+    _callbacks.remove(callback)
+
+
+def current_operation() -> Optional[str]:
+    """Returns the method of the package currently making API calls
+
+    :return: The name of the method
+    :rtype: str, optional
+    """
+    return _operation.get()
+
+
+@contextlib.contextmanager
+def operation(name: str) -> Iterator[None]:
+    """Attributes the API calls made within the context to an operation
+
+    :param name: The name of the operation
+    :type name: str
+    """
+    token = _operation.set(name)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def instrumented(func: F) -> F:
+    """Decorates a method of the package so that the API calls it makes are
+    attributed to it. Calls made by nested instrumented methods are attributed
+    to the innermost method.
+
+    :param func: The method
+    :type func: callable
+    :return: The decorated method
+    :rtype: callable
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with operation(func.__qualname__):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore
+
+
+def log_request(logger: logging.Logger, body: Any) -> None:
+    """Logs the body of an API call at debug level. The body is only formatted
+    when debug logging is enabled.
+
+    :param logger: The logger of the module making the call
+    :type logger: :class:`logging.Logger`
+    :param body: The body of the call
+    :type body: dict
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Request: {pprint.pformat(body)}")
+
+
+def _list_start(body: str) -> Optional[int]:
+    """Returns the position following the opening bracket of the top-level
+    `requests` or `data` list of an encoded body
+
+    :param body: The encoded body
+    :type body: str
+    :return: The position or None if the body has no such list
+    :rtype: int, optional
+    """
+    depth = 0
+    key = None
+    for match in _TOKENS.finditer(body):
+        token = match.group()
+        if depth == 1 and token[0] == '"':
+            key = token
+        elif depth == 1 and token == "[" and key in _LIST_KEYS:
+            return match.end()
+        elif token in "[{":
+            depth += 1
+        elif token in "]}":
+            depth -= 1
+    return None
+
+
+def _count_requests(body: Any) -> int:
+    """Returns the number of requests or value ranges in the encoded body of a
+    call. Only the tokens of the body are scanned, counting the elements of its
+    top-level `requests` or `data` list, so the body is not decoded.
+
+    :param body: The encoded body
+    :type body: str
+    :return: The number of requests, 0 without a body and 1 for any other body
+    :rtype: int
+    """
+    if not body:
+        return 0
+    start = _list_start(body) if isinstance(body, str) else None
+    if start is None:
+        return 1
+    if _EMPTY_LIST.match(body, start):
+        return 0
+    depth = 0
+    count = 1
+    for match in _TOKENS.finditer(body, start):
+        token = match.group()
+        if token in "[{":
+            depth += 1
+        elif token in "]}":
+            if depth == 0:
+                break
+            depth -= 1
+        elif token == "," and depth == 0:
+            count += 1
+    return count
+
+
+def emit_event(
+    method: str,
+    uri: str,
+    body: Any,
+    resp: Any,
+    content: Any,
+    latency: float,
+    retries: int,
+) -> None:
+    """Emits the :class:`CallEvent` of an API call to the registered callbacks
+
+    :param method: The http method of the call
+    :type method: str
+    :param uri: The uri of the call
+    :type uri: str
+    :param body: The encoded body of the call
+    :type body: str, optional
+    :param resp: The response of the call
+    :type resp: :class:`httplib2.Response`
+    :param content: The content of the response
+    :type content: bytes
+    :param latency: The seconds taken by the call, including retries
+    :type latency: float
+    :param retries: The number of times the call was retried
+    :type retries: int
+    """
+    if not _callbacks:
+        return
+    if isinstance(body, str):
+        request_bytes = len(body.encode("utf-8"))
+    else:
+        request_bytes = len(body or b"")
+    event = CallEvent(
+        operation=current_operation(),
+        method=method,
+        uri=uri,
+        document_id=document_id(uri),
+        status=resp.status,
+        latency=latency,
+        request_bytes=request_bytes,
+        response_bytes=len(content or b""),
+        requests=_count_requests(body),
+        retries=retries,
+    )
+    for callback in list(_callbacks):
+        callback(event)
+
+
+class InstrumentedHttp:
+    """Wraps an http transport so that each request emits a :class:`CallEvent`
+    to the registered callbacks. Events are only built when callbacks are
+    registered.
+
+    :param http: The http transport to wrap
+    :type http: :class:`google_auth_httplib2.AuthorizedHttp`
+    """
+
+    def __init__(self, http: Any) -> None:
+        """Constructor method"""
+        self.http = http
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> Tuple[Any, bytes]:
+        """Makes an http request and emits its event
+
+        :param uri: The uri of the request
+        :type uri: str
+        :param method: The http method of the request
+        :type method: str, optional
+        :param body: The body of the request
+        :type body: str, optional
+        :param headers: The headers of the request
+        :type headers: dict, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        start = time.perf_counter()
+        resp, content = self.http.request(
+            uri, method=method, body=body, headers=headers, **kwargs
+        )
+        if _callbacks:
+            emit_event(
+                method,
+                uri,
+                body,
+                resp,
+                content,
+                time.perf_counter() - start,
+                self.http.retries if isinstance(self.http, ScheduledHttp) else 0,
+            )
+        return resp, content
+
+    def __getattr__(self, name: str) -> Any:
+        """Passes any other attribute through to the wrapped transport"""
+        return getattr(self.http, name)
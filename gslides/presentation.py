@@ -3,17 +3,25 @@
 Creates the slides and charts in Google slides
 """
 import logging
-import pprint
-from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
 
-import requests
-from IPython.display import Image
-
-from . import creds, package_font
+from . import config, creds, package_font
+from .aio import run_async, run_queued
 from .chart import Chart
-from .config import PRESENTATION_PARAMS
+from .instrumentation import instrumented, log_request
+from .session import Session, current_session
+from .splitter import split_requests
 from .table import Table
-from .utils import json_chunk_key_extract, optimize_size, validate_params_float
+from .utils import (
+    generate_object_id,
+    json_chunk_key_extract,
+    optimize_size,
+    validate_params_float,
+)
+
+if TYPE_CHECKING:
+    from IPython.display import Image
 
 TLayout = TypeVar("TLayout", bound="Layout")
 TPresentation = TypeVar("TPresentation", bound="Presentation")
@@ -148,6 +156,9 @@ class AddSlide:
     :type title: str, optional
     :param notes: The text for the notes textbox
     :type notes: str, optional
+    :param single_request: Whether to assign object ids on the client and build
+        the slide, textboxes, charts and tables in a single API call
+    :type single_request: bool, optional
     """
 
     def __init__(
@@ -163,6 +174,7 @@ class AddSlide:
         page_size: Tuple[int, int] = (9144000, 5143500),
         title: str = "Title placeholder",
         notes: str = "Notes placeholder",
+        single_request: bool = False,
     ) -> None:
         """Constructor method"""
         self.presentation_id = presentation_id
@@ -170,6 +182,9 @@ class AddSlide:
         self.layout = self._validate_layout(layout)
         self.insertion_index = insertion_index
         self.sl_id: str = ""
+        self.title_bx_id: str = ""
+        self.notes_bx_id: str = ""
+        self.obj_ids: List[str] = []
         self.ch_ids: dict = {}
         self.sheet_executed = False
         self.slide_executed = False
@@ -185,6 +200,7 @@ class AddSlide:
         )
         self.title = title
         self.notes = notes
+        self.single_request = single_request
 
     def _validate_layout(self, layout: Tuple[int, int]) -> Tuple[int, int]:
         """Validates that the layout of charts is a valide layout.
@@ -229,9 +245,12 @@ class AddSlide:
         else:
             return objects
 
-    def render_json_create_slide(self) -> dict:
+    def render_json_create_slide(self, slide_id: Optional[str] = None) -> dict:
         """Renders the json to create the slide in Google slides.
 
+        :param slide_id: Client assigned slide id. If not passed the id is
+            assigned by the API
+        :type slide_id: str, optional
         :return: The json to do the update
         :rtype: dict
         """
@@ -242,19 +261,32 @@ class AddSlide:
         }
         if self.insertion_index:
             json["requests"][0]["createSlide"]["insertionIndex"] = self.insertion_index
+        if slide_id:
+            json["requests"][0]["createSlide"]["objectId"] = slide_id
         return json
 
-    def render_json_create_textboxes(self, slide_id: str) -> dict:
+    def render_json_create_textboxes(
+        self,
+        slide_id: str,
+        title_box_id: Optional[str] = None,
+        notes_box_id: Optional[str] = None,
+    ) -> dict:
         """Renders the json to create the textboxes in Google slides.
 
         :param slide_id: The slide_id of the slide to create textbox in
         :type slide_id: str
+        :param title_box_id: Client assigned id of the title box. If not passed
+            the id is assigned by the API
+        :type title_box_id: str, optional
+        :param notes_box_id: Client assigned id of the notes box. If not passed
+            the id is assigned by the API
+        :type notes_box_id: str, optional
         :return: The json to do the update
         :rtype: dict
         """
         start_textbox_x = self.page_size[0] * 0.05
         scale_textbox_x = self.page_size[0] * 0.9 / 3000000
-        json = {
+        json: Dict[str, Any] = {
             "requests": [
                 {
                     "createShape": {
@@ -296,17 +328,21 @@ class AddSlide:
                 },
             ]
         }
+        if title_box_id:
+            json["requests"][0]["createShape"]["objectId"] = title_box_id
+        if notes_box_id:
+            json["requests"][1]["createShape"]["objectId"] = notes_box_id
         return json
 
     def render_json_format_textboxes(
-        self, title_box_id: int, notes_box_id: int
+        self, title_box_id: str, notes_box_id: str
     ) -> dict:
         """Renders the json to format the textboxes in Google slides.
 
         :param title_box_id: The id of the title box
-        :type title_box_id: int
+        :type title_box_id: str
         :param notes_box_id: The id of the notes box
-        :type notes_box_id: int
+        :type notes_box_id: str
         :return: The json to do the update
         :rtype: dict
         """
@@ -367,6 +403,7 @@ class AddSlide:
         size: Tuple[float, float],
         translate_x: float,
         translate_y: float,
+        object_id: Optional[str] = None,
     ) -> dict:
         """Renders the json to copy the charts in Google slides.
 
@@ -378,10 +415,13 @@ class AddSlide:
         :type translate_x: float
         :param translate_y: The number of EMU to translate the object by
         :type translate_y: float
+        :param object_id: Client assigned id of the chart in Google slides. If not
+            passed the id is assigned by the API
+        :type object_id: str, optional
         :return: The json to do the update
         :rtype: dict
         """
-        json = {
+        json: Dict[str, Any] = {
             "createSheetsChart": {
                 "spreadsheetId": chart.data.spreadsheet_id,
                 "chartId": chart.chart_id,
@@ -402,8 +442,77 @@ class AddSlide:
                 },
             }
         }
+        if object_id:
+            json["createSheetsChart"]["objectId"] = object_id
         return json
 
+    def render_json_populate_objects(self) -> Tuple[dict, Dict[int, Chart]]:
+        """Renders the json to populate the charts and tables on the slide.
+        Tables are assigned their object id on the client so that they can be
+        created and styled within the same API call.
+
+        :return: The json to do the update and a mapping of the index of each
+            chart request to the corresponding chart
+        :rtype: tuple
+        """
+        json: Dict[str, Any] = {"requests": []}
+        charts: Dict[int, Chart] = {}
+        self.layout_obj.index = 0
+        for cnt, obj in enumerate(self.objects):
+            obj_id = self.obj_ids[cnt] if self.obj_ids else None
+            translate_x, translate_y = next(self.layout_obj)
+            if isinstance(obj, Chart):
+                charts[len(json["requests"])] = obj
+                json["requests"].append(
+                    self.render_json_copy_chart(
+                        obj,
+                        self.layout_obj.object_size,
+                        translate_x,
+                        translate_y,
+                        object_id=obj_id,
+                    )
+                )
+            elif isinstance(obj, Table):
+                tbl_id = obj_id or generate_object_id("table")
+                json["requests"].extend(
+                    obj.render_create_table_json(self.sl_id, tbl_id)["requests"]
+                )
+                json["requests"].extend(
+                    obj.render_update_table_json(
+                        tbl_id,
+                        self.layout_obj.object_size,
+                        self.left_margin + translate_x,
+                        self.top_margin + translate_y,
+                    )["requests"]
+                )
+        return json, charts
+
+    def render_json_single_request(self) -> Tuple[dict, Dict[int, Chart]]:
+        """Renders the json to create the slide, the textboxes, their formatting
+        and all charts and tables on the slide in one API call. The slide and
+        object ids must be assigned before rendering.
+
+        :return: The json to do the update and a mapping of the index of each
+            chart request to the corresponding chart
+        :rtype: tuple
+        """
+        json = self.render_json_create_slide(self.sl_id)
+        json["requests"].extend(
+            self.render_json_create_textboxes(
+                self.sl_id, self.title_bx_id, self.notes_bx_id
+            )["requests"]
+        )
+        json["requests"].extend(
+            self.render_json_format_textboxes(self.title_bx_id, self.notes_bx_id)[
+                "requests"
+            ]
+        )
+        offset = len(json["requests"])
+        populate_json, charts = self.render_json_populate_objects()
+        json["requests"].extend(populate_json["requests"])
+        return json, {offset + k: v for k, v in charts.items()}
+
+    @instrumented
     def _execute_create_slide(self) -> None:
         """Executes the create slides API call."""
         service: Any = creds.slide_service
@@ -412,24 +521,27 @@ class AddSlide:
             service.presentations()
             .batchUpdate(
                 presentationId=self.presentation_id,
-                body=self.render_json_create_slide(),
+                body=self.render_json_create_slide(self.sl_id),
             )
             .execute()
         )
         logger.info("Slide created successfully")
         self.sl_id = output["replies"][0]["createSlide"]["objectId"]
 
+    @instrumented
     def _execute_create_format_textboxes(self) -> None:
         """Executes the create & format textboxes slides API call."""
         service: Any = creds.slide_service
-        body = self.render_json_create_textboxes(self.sl_id)
+        body = self.render_json_create_textboxes(
+            self.sl_id, self.title_bx_id, self.notes_bx_id
+        )
         logger.info("Executing textbox creation")
-        logger.info(f"Request: {pprint.pformat(body)}")
+        log_request(logger, body)
         output = (
             service.presentations()
             .batchUpdate(
                 presentationId=self.presentation_id,
-                body=self.render_json_create_textboxes(self.sl_id),
+                body=body,
             )
             .execute()
         )
@@ -438,7 +550,7 @@ class AddSlide:
         self.notes_bx_id = output["replies"][1]["createShape"]["objectId"]
         body = self.render_json_format_textboxes(self.title_bx_id, self.notes_bx_id)
         logger.info("Executing textbox creation")
-        logger.info(f"Request: {pprint.pformat(body)}")
+        log_request(logger, body)
         output = (
             service.presentations()
             .batchUpdate(
@@ -449,37 +561,84 @@ class AddSlide:
         )
         logger.info("Textboxes formatted successfully")
 
+    def _execute_batches(self, body: dict) -> List[Dict[str, Any]]:
+        """Executes the requests of a body in order, in as many API calls as
+        needed to stay within the size and count limits of a call
+
+        :param body: The json of the requests
+        :type body: dict
+        :return: The replies of all calls, so that the index of a reply is the
+            index of its request in the body
+        :rtype: list
+        """
+        service: Any = creds.slide_service
+        replies: List[Dict[str, Any]] = []
+        for batch in split_requests(body["requests"]):
+            log_request(logger, {"requests": batch})
+            output = (
+                service.presentations()
+                .batchUpdate(
+                    presentationId=self.presentation_id, body={"requests": batch}
+                )
+                .execute()
+            )
+            replies.extend(output["replies"])
+        return replies
+
+    @instrumented
     def _execute_populate_objects(self) -> None:
-        """Executes the population of objects on the slide"""
-        json: Dict[str, Any] = {"requests": []}
-        service = creds.slide_service
-        for obj in self.objects:
-            translate_x, translate_y = next(self.layout_obj)
+        """Executes the population of charts and tables on the slide in a single
+        API call, split only when it exceeds the size limits of a call"""
+        body, charts = self.render_json_populate_objects()
+        if not body["requests"]:
+            return
+        logger.info("Populating objects in google slides")
+        replies = self._execute_batches(body)
+        for index, chart in charts.items():
+            self.ch_ids[replies[index]["createSheetsChart"]["objectId"]] = chart.title
+        logger.info("Objects successfully populated")
+
+    def _assign_object_ids(self) -> None:
+        """Assigns the ids of the slide, the textboxes and the objects on the
+        client."""
+        self.sl_id = generate_object_id("slide")
+        self.title_bx_id = generate_object_id("title")
+        self.notes_bx_id = generate_object_id("notes")
+        self.obj_ids = [
+            generate_object_id("chart" if isinstance(obj, Chart) else "table")
+            for obj in self.objects
+        ]
+
+    def _queue_single_request(self, session: Session) -> None:
+        """Queues the creation of the slide and all of its objects in a
+        :class:`Session`. The requests are rendered when the session is flushed
+        so that the charts have been created in Google sheets.
+
+        :param session: The active session
+        :type session: :class:`Session`
+        """
+        self._assign_object_ids()
+        for obj_id, obj in zip(self.obj_ids, self.objects):
             if isinstance(obj, Chart):
-                json["requests"].append(
-                    self.render_json_copy_chart(
-                        obj, self.layout_obj.object_size, translate_x, translate_y
-                    )
-                )
-                logger.info("Populating charts in google slides")
-                logger.info(f"Request: {pprint.pformat(json)}")
-                output = (
-                    service.presentations()
-                    .batchUpdate(presentationId=self.presentation_id, body=json)
-                    .execute()
-                )
-                self.ch_ids[
-                    output["replies"][0]["createSheetsChart"]["objectId"]
-                ] = obj.title
-                logger.info("Charts successfully populated")
-            elif isinstance(obj, Table):
-                obj.create(
-                    self.presentation_id,
-                    self.sl_id,
-                    self.layout_obj.object_size,
-                    self.left_margin + translate_x,
-                    self.top_margin + translate_y,
-                )
+                self.ch_ids[obj_id] = obj.title
+        session.queue_slide_update(
+            self.presentation_id,
+            lambda: self.render_json_single_request()[0]["requests"],
+        )
+        logger.info("Queued slide creation")
+
+    @instrumented
+    def _execute_single_request(self) -> None:
+        """Executes the creation of the slide and all of its objects in a single
+        API call using client assigned object ids, split only when it exceeds the
+        size limits of a call."""
+        self._assign_object_ids()
+        body, charts = self.render_json_single_request()
+        logger.info("Creating slide and populating objects")
+        replies = self._execute_batches(body)
+        for index, chart in charts.items():
+            self.ch_ids[replies[index]["createSheetsChart"]["objectId"]] = chart.title
+        logger.info("Slide created and objects populated successfully")
 
     def execute_slide(self) -> None:
         """Executes the slides API call."""
@@ -487,9 +646,16 @@ class AddSlide:
             raise RuntimeError(
                 "Must run the execute sheet method before running the execute slide method"
             )
-        self._execute_create_slide()
-        self._execute_create_format_textboxes()
-        self._execute_populate_objects()
+        session = current_session()
+        if session:
+            self._queue_single_request(session)
+        elif self.single_request:
+            self._execute_single_request()
+        else:
+            self._assign_object_ids()
+            self._execute_create_slide()
+            self._execute_create_format_textboxes()
+            self._execute_populate_objects()
         self.slide_executed = True
 
     def execute_sheet(self) -> None:
@@ -558,6 +724,7 @@ class Presentation:
         return output
 
     @classmethod
+    @instrumented
     def create(
         cls: Type[TPresentation],
         name: str = "Untitled",
@@ -583,6 +750,19 @@ class Presentation:
         return cls(name, pr_id, [], {}, (9144000, 5143500), True)
 
     @classmethod
+    async def acreate(
+        cls: Type[TPresentation], *args: Any, **kwargs: Any
+    ) -> TPresentation:
+        """Awaitable version of :meth:`create`, accepting the same parameters.
+
+        :return: A Presentation object
+        :rtype: :class:`gslides.Presentation`
+
+        """
+        return await run_async(cls.create, *args, **kwargs)
+
+    @classmethod
+    @instrumented
     def get(cls: Type[TPresentation], presentation_id: str) -> TPresentation:
         """Class method that gets a presentation.
 
@@ -611,6 +791,18 @@ class Presentation:
             chart_ids[chart["objectId"]] = chart["title"]
         return cls(name, presentation_id, sl_ids, chart_ids, page_size, True)
 
+    @classmethod
+    async def aget(
+        cls: Type[TPresentation], *args: Any, **kwargs: Any
+    ) -> TPresentation:
+        """Awaitable version of :meth:`get`, accepting the same parameters.
+
+        :return: A Presentation object
+        :rtype: :class:`gslides.Presentation`
+
+        """
+        return await run_async(cls.get, *args, **kwargs)
+
     def add_slide(
         self,
         objects: List[Union[Chart, Table]],
@@ -622,6 +814,7 @@ class Presentation:
         right_margin: int = 0,
         title: str = "Title placeholder",
         notes: str = "Notes placeholder",
+        single_request: bool = False,
     ) -> None:
         """Add a slide to the presentation.
 
@@ -644,6 +837,9 @@ class Presentation:
         :type title: str, optional
         :param notes: The text for the notes textbox
         :type notes: str, optional
+        :param single_request: Whether to build the slide and all of its objects
+            in a single API call
+        :type single_request: bool, optional
         """
         sl = AddSlide(
             self.presentation_id,
@@ -657,14 +853,86 @@ class Presentation:
             self.page_size,
             title,
             notes,
+            single_request,
         )
         new_sl_id, new_ch_ids = sl.execute()
+        self._add_slide_ids(insertion_index, new_sl_id, new_ch_ids)
+
+    def add_slides(self, slides: List[Dict[str, Any]], workers: int = 1) -> None:
+        """Adds several slides to the presentation. The charts of upcoming slides
+        are created in Google sheets by a pool of `workers` threads while the
+        slides are built in Google slides one at a time, in the order given.
+
+        :param slides: List of dictionaries of the parameters of
+            :meth:`add_slide` for each slide
+        :type slides: list
+        :param workers: The number of threads creating charts in Google sheets
+        :type workers: int, optional
+
+        :example:
+
+        >>> prs.add_slides(
+        ...     [
+        ...         {"objects": [chart1], "layout": (1, 1), "title": "Revenue"},
+        ...         {"objects": [chart2, table], "layout": (1, 2)},
+        ...     ],
+        ...     workers=4,
+        ... )
+        """
+        if type(workers) != int or workers < 1:
+            raise ValueError("workers must be an integer greater than 0")
+        sls = [
+            AddSlide(
+                self.presentation_id,
+                page_size=self.page_size,
+                **slide,
+            )
+            for slide in slides
+        ]
+        if current_session() or workers == 1:
+            for sl in sls:
+                new_sl_id, new_ch_ids = sl.execute()
+                self._add_slide_ids(sl.insertion_index, new_sl_id, new_ch_ids)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(sl.execute_sheet) for sl in sls]
+            try:
+                for sl, future in zip(sls, futures):
+                    future.result()
+                    sl.execute_slide()
+                    self._add_slide_ids(sl.insertion_index, sl.sl_id, sl.ch_ids)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    async def aadd_slides(self, *args: Any, **kwargs: Any) -> None:
+        """Awaitable version of :meth:`add_slides`, accepting the same parameters."""
+        return await run_queued(self.add_slides, *args, **kwargs)
+
+    def _add_slide_ids(
+        self, insertion_index: Optional[int], sl_id: str, ch_ids: Dict[Any, Any]
+    ) -> None:
+        """Records the ids of a slide added to the presentation and its charts
+
+        :param insertion_index: The slide index the slide was inserted to
+        :type insertion_index: int, optional
+        :param sl_id: The id of the slide
+        :type sl_id: str
+        :param ch_ids: The ids of the charts on the slide and their titles
+        :type ch_ids: dict
+        """
         if insertion_index is None:
-            self.sl_ids.append(new_sl_id)
+            self.sl_ids.append(sl_id)
         else:
-            self.sl_ids.insert(insertion_index, new_sl_id)
-        self.ch_ids = {**self.ch_ids, **new_ch_ids}
+            self.sl_ids.insert(insertion_index, sl_id)
+        self.ch_ids = {**self.ch_ids, **ch_ids}
+
+    async def aadd_slide(self, *args: Any, **kwargs: Any) -> None:
+        """Awaitable version of :meth:`add_slide`, accepting the same parameters."""
+        return await run_queued(self.add_slide, *args, **kwargs)
 
+    @instrumented
     def rm_slide(self, slide_id: str) -> None:
         """Removes a slide based on a slide id.
 
@@ -680,6 +948,11 @@ class Presentation:
         logger.info("Slide successfully deleted")
         self.sl_ids.remove(slide_id)
 
+    async def arm_slide(self, *args: Any, **kwargs: Any) -> None:
+        """Awaitable version of :meth:`rm_slide`, accepting the same parameters."""
+        return await run_async(self.rm_slide, *args, **kwargs)
+
+    @instrumented
     def template(self, mapping: dict, slide_ids: list = []) -> None:
         """Replaces all text encaspulated with `{{ <TEXT> }}` with input.
 
@@ -700,6 +973,11 @@ class Presentation:
                 }
             }
             requests.append(json)
+        session = current_session()
+        if session:
+            session.queue_slide_update(self.presentation_id, requests)
+            logger.info("Queued templating")
+            return
         service: Any = creds.slide_service
         logger.info("Templating data")
         service.presentations().batchUpdate(
@@ -708,6 +986,11 @@ class Presentation:
         ).execute()
         logger.info("Data successfully templated")
 
+    async def atemplate(self, *args: Any, **kwargs: Any) -> None:
+        """Awaitable version of :meth:`template`, accepting the same parameters."""
+        return await run_queued(self.template, *args, **kwargs)
+
+    @instrumented
     def update_charts(self) -> None:
         """Updates all the charts in the slides deck with refreshed underlying
         data.
@@ -720,6 +1003,11 @@ class Presentation:
                 }
             }
             requests.append(json)
+        session = current_session()
+        if session:
+            session.queue_slide_update(self.presentation_id, requests)
+            logger.info("Queued chart updates")
+            return
         service: Any = creds.slide_service
         logger.info("Update charts")
         service.presentations().batchUpdate(
@@ -728,6 +1016,10 @@ class Presentation:
         ).execute()
         logger.info("Charts successfully updated")
 
+    async def aupdate_charts(self, *args: Any, **kwargs: Any) -> None:
+        """Awaitable version of :meth:`update_charts`, accepting the same parameters."""
+        return await run_queued(self.update_charts, *args, **kwargs)
+
     def _validate_image_size(self, image_size):
         """Validate that the image size configuration is valid
 
@@ -735,15 +1027,17 @@ class Presentation:
         :type image_size: str
         :raises ValueError:
         """
-        if image_size not in PRESENTATION_PARAMS["data_label_placement"]["params"]:
+        params = config.PRESENTATION_PARAMS["data_label_placement"]
+        if image_size not in params["params"]:
             raise ValueError(
                 f"{image_size} is not a valid parameter for image_size. "
                 f"Accepted parameters include"
-                f"{', '.join(PRESENTATION_PARAMS['data_label_placement']['params'])}. See"
-                f"{PRESENTATION_PARAMS['data_label_placement']['url']} for further documentation."
+                f"{', '.join(params['params'])}. See"
+                f"{params['url']} for further documentation."
             )
 
-    def show_slide(self, slide_id: str, image_size: str = "LARGE") -> Image:
+    @instrumented
+    def show_slide(self, slide_id: str, image_size: str = "LARGE") -> "Image":
         """Displays a given slide in a Jupyter notebook.
 
         :param slide_id: The id of the slide to show
@@ -754,6 +1048,8 @@ class Presentation:
         :rtype: Image
 
         """
+        import requests
+
         self._validate_image_size(image_size)
         service: Any = creds.slide_service
         img_info = (
@@ -766,8 +1062,11 @@ class Presentation:
             )
             .execute()
         )
+        from IPython.display import Image
+
         return Image(requests.get(img_info["contentUrl"]).content)
 
+    @instrumented
     def download_slide(
         self, slide_id: str, path: str, image_size: str = "LARGE"
     ) -> None:
@@ -780,6 +1079,8 @@ class Presentation:
         :param image_size: String to configure the image size
         :type image_size: str
         """
+        import requests
+
         self._validate_image_size(image_size)
         service: Any = creds.slide_service
         img_info = (
@@ -0,0 +1,648 @@
+# -*- coding: utf-8 -*-
+"""
+Schedules the API calls within the quotas of the APIs
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, cast
+
+logger = logging.getLogger(__name__)
+
+#: Requests per minute allowed per user and per project for each API and kind of
+#: request. See https://developers.google.com/sheets/api/limits and
+#: https://developers.google.com/slides/api/limits
+DEFAULT_QUOTAS: Dict[str, Dict[str, Dict[str, int]]] = {
+    "sheets": {
+        "read": {"user": 60, "project": 300},
+        "write": {"user": 60, "project": 300},
+    },
+    "slides": {
+        "read": {"user": 600, "project": 3000},
+        "write": {"user": 60, "project": 600},
+    },
+}
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Calls that are not idempotent are only retried when rejected by the quota, as a
+# server error may follow a call that was applied
+IDEMPOTENT_METHODS = ("GET",)
+
+# Writes that set the same values or properties again when replayed
+IDEMPOTENT_CALLS = (":batchUpdate", ":batchClear")
+
+# The field holding the client assigned id of each request adding an object
+ID_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "addChart": ("chart", "chartId"),
+    "addSheet": ("properties", "sheetId"),
+}
+
+
+def _request_kind(kind: str, params: Any) -> str:
+    """Classifies a request of a `batchUpdate` call by the effect of replaying it
+
+    :param kind: The name of the request, e.g. `createSlide`
+    :type kind: str
+    :param params: The parameters of the request
+    :type params: Any
+    :return: `guard` if a replay fails, such as creating an object with a client
+        assigned id or deleting an object, `unsafe` if a replay repeats its
+        effect, such as creating an object without an id or inserting text, and
+        `idempotent` otherwise
+    :rtype: str
+    """
+    if kind.startswith(("create", "add")):
+        value = params
+        for field in ID_FIELDS.get(kind, ("objectId",)):
+            value = value.get(field) if isinstance(value, dict) else None
+        return "guard" if value is not None else "unsafe"
+    if kind.startswith("delete"):
+        return "guard"
+    if kind.startswith(("insert", "append", "duplicate")):
+        return "unsafe"
+    return "idempotent"
+
+
+def replay_safe(uri: str, method: str, body: Any = None) -> bool:
+    """The default retry policy of a :class:`Scheduler`, deciding whether a call
+    that failed with a server error or connection error, and so may have been
+    applied, can be retried. GET calls and `values().batchUpdate` calls, which
+    write the same values again, are retried. A `batchUpdate` call is applied
+    atomically, so it is retried when replaying it cannot change the document
+    twice: either all its requests are idempotent, or one of them fails when
+    replayed, such as creating an object with a client assigned id, so that the
+    replay of an applied call fails with a 400 status instead of, for example,
+    adding a duplicate chart.
+
+    :param uri: The uri of the call
+    :type uri: str
+    :param method: The http method of the call
+    :type method: str
+    :param body: The encoded body of the call
+    :type body: str, optional
+    :return: Whether the call can be retried
+    :rtype: bool
+    """
+    if method in IDEMPOTENT_METHODS:
+        return True
+    path = uri.split("?", 1)[0]
+    if "/values" in path and path.endswith(IDEMPOTENT_CALLS):
+        return True
+    if not path.endswith(":batchUpdate") or not body:
+        return False
+    try:
+        requests = json.loads(body).get("requests", [])
+        kinds = {_request_kind(*next(iter(request.items()))) for request in requests}
+    except (AttributeError, StopIteration, TypeError, ValueError):
+        return False
+    return "unsafe" not in kinds or "guard" in kinds
+
+
+class TokenBucket:
+    """A thread safe token bucket that refills at a constant rate.
+
+    :param rate: The number of tokens added per second
+    :type rate: float
+    :param capacity: The maximum number of tokens held by the bucket
+    :type capacity: float
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Constructor method"""
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be greater than 0 and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Adds the tokens accumulated since the last update
+
+        :param now: The current time
+        :type now: float
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Takes tokens from the bucket if available
+
+        :param tokens: The number of tokens to take
+        :type tokens: float, optional
+        :return: 0 if the tokens were taken, otherwise the number of seconds until
+            they are available
+        :rtype: float
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Takes tokens from the bucket, waiting until they are available
+
+        :param tokens: The number of tokens to take
+        :type tokens: float, optional
+        :return: The number of seconds waited
+        :rtype: float
+        """
+        waited = 0.0
+        wait = self.try_acquire(tokens)
+        while wait > 0:
+            time.sleep(wait)
+            waited += wait
+            wait = self.try_acquire(tokens)
+        return waited
+
+
+BucketFactory = Callable[[str, float, float], Any]
+
+RetryPolicy = Callable[[str, str, Any], bool]
+
+
+def token_bucket(name: str, rate: float, capacity: float) -> TokenBucket:
+    """Creates a :class:`TokenBucket` local to the process
+
+    :param name: The name of the bucket
+    :type name: str
+    :param rate: The number of tokens added per second
+    :type rate: float
+    :param capacity: The maximum number of tokens held by the bucket
+    :type capacity: float
+    :return: The bucket
+    :rtype: :class:`TokenBucket`
+    """
+    return TokenBucket(rate, capacity)
+
+
+class SQLiteTokenBucket:
+    """A token bucket whose state is kept in a SQLite database, so that it is
+    shared by every process on a host using the same database file. Tokens are
+    taken one request at a time and waits are jittered so that processes
+    blocked at the same time do not retry in lockstep, letting each process
+    take its share of the budget.
+
+    :param path: The path of the database file
+    :type path: str
+    :param name: The name of the bucket
+    :type name: str
+    :param rate: The number of tokens added per second
+    :type rate: float
+    :param capacity: The maximum number of tokens held by the bucket
+    :type capacity: float
+    :param timeout: The number of seconds to wait for the database lock
+    :type timeout: float, optional
+    """
+
+    def __init__(
+        self, path: str, name: str, rate: float, capacity: float, timeout: float = 30
+    ) -> None:
+        """Constructor method"""
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be greater than 0 and capacity at least 1")
+        self.path = path
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        with self.lock:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(name TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+            self.connection.execute(
+                "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+                (name, capacity, time.time()),
+            )
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Takes tokens from the bucket if available
+
+        :param tokens: The number of tokens to take
+        :type tokens: float, optional
+        :return: 0 if the tokens were taken, otherwise the number of seconds until
+            they are available
+        :rtype: float
+        """
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                available, updated = self.connection.execute(
+                    "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                now = time.time()
+                available = min(
+                    self.capacity, available + max(now - updated, 0) * self.rate
+                )
+                if available >= tokens:
+                    available -= tokens
+                    wait = 0.0
+                else:
+                    wait = (tokens - available) / self.rate
+                self.connection.execute(
+                    "UPDATE buckets SET tokens = ?, updated = ? WHERE name = ?",
+                    (available, now, self.name),
+                )
+                self.connection.execute("COMMIT")
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+        return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Takes tokens from the bucket, waiting until they are available
+
+        :param tokens: The number of tokens to take
+        :type tokens: float, optional
+        :return: The number of seconds waited
+        :rtype: float
+        """
+        waited = 0.0
+        wait = self.try_acquire(tokens)
+        while wait > 0:
+            wait *= random.uniform(1, 1.25)
+            time.sleep(wait)
+            waited += wait
+            wait = self.try_acquire(tokens)
+        return waited
+
+
+class SQLiteBucketFactory:
+    """Creates :class:`SQLiteTokenBucket` buckets in a database file shared by
+    the processes of a host. Pass it as the `bucket_factory` of a
+    :class:`Scheduler` to limit the combined request rate of all processes.
+
+    :param path: The path of the database file
+    :type path: str
+
+    :example:
+
+    >>> set_scheduler(Scheduler(bucket_factory=SQLiteBucketFactory("/tmp/gslides.db")))
+    """
+
+    def __init__(self, path: str) -> None:
+        """Constructor method"""
+        self.path = path
+
+    def __call__(self, name: str, rate: float, capacity: float) -> SQLiteTokenBucket:
+        """Creates a bucket
+
+        :param name: The name of the bucket
+        :type name: str
+        :param rate: The number of tokens added per second
+        :type rate: float
+        :param capacity: The maximum number of tokens held by the bucket
+        :type capacity: float
+        :return: The bucket
+        :rtype: :class:`SQLiteTokenBucket`
+        """
+        return SQLiteTokenBucket(self.path, name, rate, capacity)
+
+
+class Scheduler:
+    """Schedules the API calls made through the connections of the package. Calls
+    wait for tokens in a bucket for the user and a bucket for the project of the
+    API and kind (read or write) of the call, so that they are throttled before
+    the quotas are exceeded. Calls rejected with a 429 status are retried with
+    exponential backoff and full jitter. Calls that fail with a server error or
+    connection error may have been applied, so they are only retried if the
+    retry policy deems them safe to replay, see :func:`replay_safe`.
+
+    :param quotas: Requests per minute per user and per project for each API
+        and kind of request, see :data:`DEFAULT_QUOTAS`
+    :type quotas: dict, optional
+    :param max_retries: The number of times a call is retried
+    :type max_retries: int, optional
+    :param backoff: The base number of seconds to back off by
+    :type backoff: float, optional
+    :param max_backoff: The maximum number of seconds to back off by
+    :type max_backoff: float, optional
+    :param bucket_factory: Function creating a bucket from its name, rate and
+        capacity. Defaults to :func:`token_bucket`
+    :type bucket_factory: callable, optional
+    :param retry_policy: Function taking the uri, http method and encoded body
+        of a call that failed with a server error or connection error and
+        returning whether to retry it. Defaults to :func:`replay_safe`
+    :type retry_policy: callable, optional
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, Dict[str, Dict[str, int]]]] = None,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 64.0,
+        bucket_factory: Optional[BucketFactory] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        """Constructor method"""
+        self.retry_policy = retry_policy or replay_safe
+        self.quotas = quotas if quotas is not None else DEFAULT_QUOTAS
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        factory = bucket_factory or token_bucket
+        self.buckets: Dict[Tuple[str, str], List[Any]] = {}
+        for api, kinds in self.quotas.items():
+            for kind, limits in kinds.items():
+                self.buckets[(api, kind)] = [
+                    factory(f"{api}.{kind}.{scope}", limit / 60, limit)
+                    for scope, limit in limits.items()
+                ]
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Resets the statistics"""
+        with self.lock:
+            self.started = time.monotonic()
+            self.requests: Dict[Tuple[str, str], int] = {}
+            self.retries = 0
+            self.throttled = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the statistics since the scheduler was created or reset
+
+        :return: The number of requests per API and kind, the number of retries,
+            the seconds spent throttled and the throughput in requests per second
+        :rtype: dict
+        """
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            total = sum(self.requests.values())
+            return {
+                "requests": {
+                    f"{api}.{kind}": count
+                    for (api, kind), count in self.requests.items()
+                },
+                "total_requests": total,
+                "retries": self.retries,
+                "throttled_seconds": self.throttled,
+                "elapsed_seconds": elapsed,
+                "throughput": total / elapsed if elapsed > 0 else 0.0,
+            }
+
+    def classify(self, uri: str, method: str) -> Tuple[str, str]:
+        """Determines the API and kind of a call
+
+        :param uri: The uri of the call
+        :type uri: str
+        :param method: The http method of the call
+        :type method: str
+        :return: The API and kind (read or write) of the call
+        :rtype: tuple
+        """
+        api = "slides" if "slides.googleapis.com" in uri else "sheets"
+        kind = "read" if method.upper() == "GET" else "write"
+        return api, kind
+
+    def throttle(self, api: str, kind: str) -> None:
+        """Waits until the quotas allow a call
+
+        :param api: The API of the call
+        :type api: str
+        :param kind: The kind (read or write) of the call
+        :type kind: str
+        """
+        waited = 0.0
+        for bucket in self.buckets.get((api, kind), []):
+            waited += bucket.acquire()
+        self._record(api, kind, waited)
+
+    async def athrottle(self, api: str, kind: str) -> None:
+        """Waits until the quotas allow a call without blocking the event loop
+
+        :param api: The API of the call
+        :type api: str
+        :param kind: The kind (read or write) of the call
+        :type kind: str
+        """
+        waited = 0.0
+        for bucket in self.buckets.get((api, kind), []):
+            wait = bucket.try_acquire()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+                wait = bucket.try_acquire()
+        self._record(api, kind, waited)
+
+    def _record(self, api: str, kind: str, waited: float) -> None:
+        """Records a call in the statistics
+
+        :param api: The API of the call
+        :type api: str
+        :param kind: The kind (read or write) of the call
+        :type kind: str
+        :param waited: The seconds the call was throttled
+        :type waited: float
+        """
+        with self.lock:
+            self.requests[(api, kind)] = self.requests.get((api, kind), 0) + 1
+            self.throttled += waited
+        if waited:
+            logger.debug(f"Throttled {api} {kind} request for {waited:.2f}s")
+
+    def backoff_time(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Returns the number of seconds to wait before retrying a call
+
+        :param attempt: The number of the retry, starting at 0
+        :type attempt: int
+        :param retry_after: The value of the Retry-After header of the response
+        :type retry_after: str, optional
+        :return: The number of seconds to wait
+        :rtype: float
+        """
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def execute(
+        self,
+        uri: str,
+        method: str,
+        call: Callable[[], Tuple[Any, bytes]],
+        body: Any = None,
+    ) -> Tuple[Any, bytes]:
+        """Executes an http call within the quotas, retrying it if it is
+        rejected by the quota or, if the retry policy allows it, fails with a
+        server error or connection error.
+
+        :param uri: The uri of the call
+        :type uri: str
+        :param method: The http method of the call
+        :type method: str
+        :param call: Function making the call and returning the response and
+            content
+        :type call: callable
+        :param body: The encoded body of the call, passed to the retry policy
+        :type body: str, optional
+        :return: The response and content of the call
+        :rtype: tuple
+        """
+        api, kind = self.classify(uri, method)
+        attempt = 0
+        while True:
+            self.throttle(api, kind)
+            try:
+                resp, content = call()
+            except (ConnectionError, TimeoutError):
+                wait = self._retry_wait(uri, method, body, attempt)
+                if wait is None:
+                    raise
+            else:
+                wait = self._retry_wait(uri, method, body, attempt, resp)
+                if wait is None:
+                    return resp, content
+            time.sleep(wait)
+            attempt += 1
+
+    async def aexecute(
+        self,
+        uri: str,
+        method: str,
+        call: Callable[[], Awaitable[Tuple[Any, bytes]]],
+        body: Any = None,
+    ) -> Tuple[Any, bytes]:
+        """Executes an asynchronous http call within the quotas, retrying it as
+        :meth:`execute` does without blocking the event loop.
+
+        :param uri: The uri of the call
+        :type uri: str
+        :param method: The http method of the call
+        :type method: str
+        :param call: Coroutine function making the call and returning the
+            response and content
+        :type call: callable
+        :param body: The encoded body of the call, passed to the retry policy
+        :type body: str, optional
+        :return: The response and content of the call
+        :rtype: tuple
+        """
+        api, kind = self.classify(uri, method)
+        attempt = 0
+        while True:
+            await self.athrottle(api, kind)
+            try:
+                resp, content = await call()
+            except (ConnectionError, TimeoutError):
+                wait = self._retry_wait(uri, method, body, attempt)
+                if wait is None:
+                    raise
+            else:
+                wait = self._retry_wait(uri, method, body, attempt, resp)
+                if wait is None:
+                    return resp, content
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    def _retry_wait(
+        self, uri: str, method: str, body: Any, attempt: int, resp: Any = None
+    ) -> Optional[float]:
+        """Returns the number of seconds to wait before retrying a call that
+        failed, or None if it is not retried
+
+        :param uri: The uri of the call
+        :type uri: str
+        :param method: The http method of the call
+        :type method: str
+        :param body: The encoded body of the call
+        :type body: str, optional
+        :param attempt: The number of the retry, starting at 0
+        :type attempt: int
+        :param resp: The response of the call or None after a connection error
+        :type resp: :class:`httplib2.Response`, optional
+        :return: The number of seconds to wait or None
+        :rtype: float, optional
+        """
+        if attempt >= self.max_retries:
+            return None
+        if resp is None:
+            retryable = self.retry_policy(uri, method, body)
+            retry_after = None
+        else:
+            retryable = resp.status == 429 or (
+                resp.status in RETRYABLE_STATUSES
+                and self.retry_policy(uri, method, body)
+            )
+            retry_after = resp.get("retry-after")
+        if not retryable:
+            return None
+        api, kind = self.classify(uri, method)
+        wait = self.backoff_time(attempt, retry_after)
+        logger.info(f"Retrying {api} {kind} request in {wait:.2f}s")
+        with self.lock:
+            self.retries += 1
+        return wait
+
+
+class ScheduledHttp:
+    """Wraps an http transport so that each request is executed by a
+    :class:`Scheduler`. The number of retries of the last request is kept in
+    `retries`.
+
+    :param http: The http transport to wrap
+    :type http: :class:`google_auth_httplib2.AuthorizedHttp`
+    :param scheduler: The scheduler
+    :type scheduler: :class:`Scheduler`
+    """
+
+    def __init__(self, http: Any, scheduler: Scheduler) -> None:
+        """Constructor method"""
+        self.http = http
+        self.scheduler = scheduler
+        self.retries = 0
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> Tuple[Any, bytes]:
+        """Makes an http request through the scheduler
+
+        :param uri: The uri of the request
+        :type uri: str
+        :param method: The http method of the request
+        :type method: str, optional
+        :param body: The body of the request
+        :type body: str, optional
+        :param headers: The headers of the request
+        :type headers: dict, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        attempts = 0
+
+        def call() -> Tuple[Any, bytes]:
+            nonlocal attempts
+            attempts += 1
+            return cast(
+                Tuple[Any, bytes],
+                self.http.request(
+                    uri, method=method, body=body, headers=headers, **kwargs
+                ),
+            )
+
+        try:
+            return self.scheduler.execute(uri, method, call, body)
+        finally:
+            self.retries = max(attempts - 1, 0)
+
+    def __getattr__(self, name: str) -> Any:
+        """Passes any other attribute through to the wrapped transport"""
+        return getattr(self.http, name)
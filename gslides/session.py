@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+Session class that defers and coalesces API calls
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import logging
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from . import creds
+from .aio import execute, get_transport, run_async
+from .instrumentation import instrumented, log_request, operation
+from .splitter import split_requests, split_values
+
+logger = logging.getLogger(__name__)
+
+Requests = Union[List[Dict[str, Any]], Callable[[], List[Dict[str, Any]]]]
+Callback = Optional[Callable[[List[Dict[str, Any]]], None]]
+
+
+class Batches(NamedTuple):
+    """The calls flushing the queued requests of a document
+
+    :param name: The name of the API for logging
+    :type name: str
+    :param key: The key of the replies in the response of a call
+    :type key: str
+    :param bodies: The body of each call
+    :type bodies: list
+    :param call: Function returning the call of a body
+    :type call: callable
+    :param resolve: Function passing the replies of all calls to the callbacks
+    :type resolve: callable
+    """
+
+    name: str
+    key: str
+    bodies: List[Dict[str, Any]]
+    call: Callable[[Dict[str, Any]], Any]
+    resolve: Callable[[List[Dict[str, Any]]], None]
+
+
+_active_sessions: contextvars.ContextVar[
+    Tuple["Session", ...]
+] = contextvars.ContextVar("active_sessions", default=())
+
+
+def current_session() -> Optional["Session"]:
+    """Returns the innermost session active in the current thread or task.
+
+    :return: The active :class:`Session` or None if no session is active
+    :rtype: :class:`Session`, optional
+
+    """
+    sessions = _active_sessions.get()
+    if sessions:
+        return sessions[-1]
+    else:
+        return None
+
+
+class Session:
+    """A context manager that defers the write requests of :class:`Frame`,
+    :class:`Chart`, :class:`Table` and :class:`Presentation` objects and flushes
+    them on exit. Requests are grouped per document so that the minimum number of
+    `spreadsheets().values().batchUpdate`, `spreadsheets().batchUpdate` and
+    `presentations().batchUpdate` calls are made. The replies of each call are
+    resolved back onto the objects that queued the requests.
+
+    Requests are flushed in three stages, values first, then sheets and then
+    slides, so that charts exist in Google sheets before they are copied into
+    Google slides. A session only applies to the thread or task it was entered
+    in. Calls that are not queued, such as :meth:`Spreadsheet.create`
+    or :meth:`Frame.get`, are executed immediately.
+
+    :example:
+
+    >>> with Session():
+    ...     frame = Frame.create(df, spreadsheet_id, sheet_id, sheet_name)
+    ...     chart = Chart(frame, "date", [Series.line()])
+    ...     prs.add_slide([chart], layout=(1, 1))
+    """
+
+    def __init__(self) -> None:
+        """Constructor method"""
+        self.values_queue: Dict[Tuple[str, str], List[Tuple[Requests, Callback]]] = {}
+        self.sheet_queue: Dict[str, List[Tuple[Requests, Callback]]] = {}
+        self.slide_queue: Dict[str, List[Tuple[Requests, Callback]]] = {}
+
+    def __enter__(self) -> "Session":
+        """Activates the session
+
+        :return: The :class:`Session`
+        :rtype: :class:`Session`
+        """
+        _active_sessions.set(_active_sessions.get() + (self,))
+        return self
+
+    def _deactivate(self) -> None:
+        """Removes the session from the active sessions"""
+        sessions = _active_sessions.get()
+        _active_sessions.set(
+            tuple(session for session in sessions if session is not self)
+        )
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Deactivates the session and flushes the queued requests unless an
+        exception was raised within the session."""
+        self._deactivate()
+        if exc_type is None:
+            self.flush()
+        else:
+            logger.info("Discarding queued requests due to exception")
+            self.clear()
+
+    async def __aenter__(self) -> "Session":
+        """Activates the session within an asyncio task
+
+        :return: The :class:`Session`
+        :rtype: :class:`Session`
+        """
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Deactivates the session and flushes the queued requests without
+        blocking the event loop, see :meth:`aflush`."""
+        self._deactivate()
+        if exc_type is None:
+            await self.aflush()
+        else:
+            logger.info("Discarding queued requests due to exception")
+            self.clear()
+
+    @contextlib.contextmanager
+    def queueing(self) -> Iterator["Session"]:
+        """Activates the session without flushing it on exit. The queued requests
+        are discarded if an exception is raised.
+
+        :return: The :class:`Session`
+        :rtype: :class:`Session`
+        """
+        self.__enter__()
+        try:
+            yield self
+        except BaseException:
+            self.clear()
+            raise
+        finally:
+            self._deactivate()
+
+    def queue_values_update(
+        self,
+        spreadsheet_id: str,
+        data: Requests,
+        callback: Callback = None,
+        value_input_option: str = "USER_ENTERED",
+    ) -> None:
+        """Queues value ranges for a `spreadsheets().values().batchUpdate` call
+
+        :param spreadsheet_id: The id of the spreadsheet
+        :type spreadsheet_id: str
+        :param data: List of value ranges or a function that renders them
+        :type data: list or callable
+        :param callback: Function that receives the responses for the value
+            ranges, with a response per range for value ranges split due to their
+            size
+        :type callback: callable, optional
+        :param value_input_option: How the input data is interpreted
+        :type value_input_option: str, optional
+        """
+        key = (spreadsheet_id, value_input_option)
+        self.values_queue.setdefault(key, []).append((data, callback))
+
+    def queue_sheet_update(
+        self, spreadsheet_id: str, requests: Requests, callback: Callback = None
+    ) -> None:
+        """Queues requests for a `spreadsheets().batchUpdate` call
+
+        :param spreadsheet_id: The id of the spreadsheet
+        :type spreadsheet_id: str
+        :param requests: List of requests or a function that renders them
+        :type requests: list or callable
+        :param callback: Function that receives the replies for the requests
+        :type callback: callable, optional
+        """
+        self.sheet_queue.setdefault(spreadsheet_id, []).append((requests, callback))
+
+    def queue_slide_update(
+        self, presentation_id: str, requests: Requests, callback: Callback = None
+    ) -> None:
+        """Queues requests for a `presentations().batchUpdate` call. Requests
+        passed as a function are rendered after the sheets requests have been
+        executed.
+
+        :param presentation_id: The id of the presentation
+        :type presentation_id: str
+        :param requests: List of requests or a function that renders them
+        :type requests: list or callable
+        :param callback: Function that receives the replies for the requests
+        :type callback: callable, optional
+        """
+        self.slide_queue.setdefault(presentation_id, []).append((requests, callback))
+
+    def _render(
+        self, entries: List[Tuple[Requests, Callback]]
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int, Callback]]]:
+        """Renders the queued entries into a single list of requests
+
+        :param entries: Queued requests and callbacks
+        :type entries: list
+        :return: The requests and the span of each entry within the requests
+        :rtype: tuple
+        """
+        requests: List[Dict[str, Any]] = []
+        spans: List[Tuple[int, int, Callback]] = []
+        for entry, callback in entries:
+            rendered = entry() if callable(entry) else entry
+            spans.append((len(requests), len(rendered), callback))
+            requests.extend(rendered)
+        return requests, spans
+
+    def _resolve(
+        self, spans: List[Tuple[int, int, Callback]], replies: List[Dict[str, Any]]
+    ) -> None:
+        """Passes the replies of a call back to the callback of each entry
+
+        :param spans: The span of each entry within the requests
+        :type spans: list
+        :param replies: The replies returned by the call
+        :type replies: list
+        """
+        for start, length, callback in spans:
+            if callback:
+                callback(replies[start : start + length])  # noqa
+
+    def _stages(self) -> Iterator[List[Batches]]:
+        """Takes the queued requests and yields the calls of each of the data,
+        sheet and slide stages. The requests of a stage are rendered once the
+        previous stage has been executed.
+
+        :return: The calls of each document in each stage
+        :rtype: iterator
+        """
+        values_queue, self.values_queue = self.values_queue, {}
+        sheet_queue, self.sheet_queue = self.sheet_queue, {}
+        slide_queue, self.slide_queue = self.slide_queue, {}
+        if values_queue or sheet_queue:
+            sheet_service: Any = creds.sheet_service
+        if slide_queue:
+            slide_service: Any = creds.slide_service
+
+        def sheet_update(spreadsheet_id: str, body: Dict[str, Any]) -> Any:
+            return sheet_service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id, body=body
+            )
+
+        def slide_update(presentation_id: str, body: Dict[str, Any]) -> Any:
+            return slide_service.presentations().batchUpdate(
+                presentationId=presentation_id, body=body
+            )
+
+        yield [
+            self._values_batches(sheet_service, spreadsheet_id, option, entries)
+            for (spreadsheet_id, option), entries in values_queue.items()
+        ]
+        yield [
+            self._request_batches(
+                "sheet", entries, functools.partial(sheet_update, spreadsheet_id)
+            )
+            for spreadsheet_id, entries in sheet_queue.items()
+        ]
+        yield [
+            self._request_batches(
+                "slide", entries, functools.partial(slide_update, presentation_id)
+            )
+            for presentation_id, entries in slide_queue.items()
+        ]
+
+    def _values_batches(
+        self,
+        service: Any,
+        spreadsheet_id: str,
+        value_input_option: str,
+        entries: List[Tuple[Requests, Callback]],
+    ) -> Batches:
+        """Renders the queued value ranges of a spreadsheet into calls
+
+        :param service: The connection to the sheets API
+        :type service: :class:`googleapiclient.discovery.Resource`
+        :param spreadsheet_id: The id of the spreadsheet
+        :type spreadsheet_id: str
+        :param value_input_option: How the input data is interpreted
+        :type value_input_option: str
+        :param entries: Queued value ranges and callbacks
+        :type entries: list
+        :return: The calls
+        :rtype: :class:`Batches`
+        """
+        data, spans = self._render(entries)
+        batches, counts = split_values(data) if data else ([], [])
+        spans = self._split_spans(spans, counts) if data else []
+        return Batches(
+            "data",
+            "responses",
+            [{"valueInputOption": value_input_option, "data": b} for b in batches],
+            lambda body: service.spreadsheets()
+            .values()
+            .batchUpdate(spreadsheetId=spreadsheet_id, body=body),
+            functools.partial(self._resolve, spans),
+        )
+
+    def _request_batches(
+        self,
+        name: str,
+        entries: List[Tuple[Requests, Callback]],
+        batch_update: Callable[[Dict[str, Any]], Any],
+    ) -> Batches:
+        """Renders the queued requests of a document into calls
+
+        :param name: The name of the API for logging
+        :type name: str
+        :param entries: Queued requests and callbacks
+        :type entries: list
+        :param batch_update: Function returning the `batchUpdate` call of a body
+        :type batch_update: callable
+        :return: The calls
+        :rtype: :class:`Batches`
+        """
+        requests, spans = self._render(entries)
+        return Batches(
+            name,
+            "replies",
+            [{"requests": batch} for batch in split_requests(requests)]
+            if requests
+            else [],
+            batch_update,
+            functools.partial(self._resolve, spans),
+        )
+
+    def _execute(self, batches: Batches) -> None:
+        """Executes the calls of a document in order and passes their replies
+        back to the callbacks
+
+        :param batches: The calls
+        :type batches: :class:`Batches`
+        """
+        if not batches.bodies:
+            return
+        replies: List[Dict[str, Any]] = []
+        for body in batches.bodies:
+            logger.info(f"Executing queued {batches.name} updates")
+            log_request(logger, body)
+            output = batches.call(body).execute()
+            logger.info(f"Queued {batches.name} updates executed successfully")
+            replies.extend(output.get(batches.key, []))
+        batches.resolve(replies)
+
+    async def _aexecute(self, batches: Batches) -> None:
+        """Executes the calls of a document in order through the asynchronous
+        transport and passes their replies back to the callbacks
+
+        :param batches: The calls
+        :type batches: :class:`Batches`
+        """
+        if not batches.bodies:
+            return
+        replies: List[Dict[str, Any]] = []
+        for body in batches.bodies:
+            logger.info(f"Executing queued {batches.name} updates")
+            log_request(logger, body)
+            output = await execute(batches.call(body))
+            logger.info(f"Queued {batches.name} updates executed successfully")
+            replies.extend(output.get(batches.key, []))
+        batches.resolve(replies)
+
+    @instrumented
+    def flush(self) -> None:
+        """Executes all queued requests. Requests exceeding the size limits of a
+        call are split into several calls executed in order."""
+        for stage in self._stages():
+            for batches in stage:
+                self._execute(batches)
+
+    async def aflush(self) -> None:
+        """Executes all queued requests through the asynchronous transport set
+        with :func:`gslides.aio.set_transport`, or in the executor if none is set.
+        The calls of the documents of a stage are made concurrently, while the
+        calls of a document are made in order."""
+        if get_transport() is None:
+            await run_async(self.flush)
+            return
+        with operation("Session.aflush"):
+            await self._aflush()
+
+    async def _aflush(self) -> None:
+        """Executes all queued requests through the asynchronous transport"""
+        for stage in self._stages():
+            await asyncio.gather(*[self._aexecute(batches) for batches in stage])
+
+    def _split_spans(
+        self, spans: List[Tuple[int, int, Callback]], counts: List[int]
+    ) -> List[Tuple[int, int, Callback]]:
+        """Maps the span of each entry within the value ranges to its span within
+        the responses, given the number of ranges each value range was split into
+
+        :param spans: The span of each entry within the value ranges
+        :type spans: list
+        :param counts: The number of ranges each value range was split into
+        :type counts: list
+        :return: The span of each entry within the responses
+        :rtype: list
+        """
+        offsets = [0]
+        for count in counts:
+            offsets.append(offsets[-1] + count)
+        return [
+            (offsets[start], offsets[start + length] - offsets[start], callback)
+            for start, length, callback in spans
+        ]
+
+    def clear(self) -> None:
+        """Discards all queued requests."""
+        self.values_queue = {}
+        self.sheet_queue = {}
+        self.slide_queue = {}
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Splits payloads that exceed the size limits of the APIs into several calls
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+#: The maximum encoded size of the body of a call. Google recommends payloads of
+#: at most 2MB, see https://developers.google.com/sheets/api/limits
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+#: The maximum number of requests or value ranges in the body of a call
+MAX_REQUESTS = 500
+
+_ENVELOPE_BYTES = 256
+
+_RANGE_PATTERN = re.compile(
+    r"^(?P<sheet>.+)!(?P<start_col>[A-Z]+)(?P<start_row>\d+):"
+    r"(?P<end_col>[A-Z]+)(?P<end_row>\d+)$"
+)
+
+
+def encoded_size(obj: Any) -> int:
+    """Returns the size of an object encoded as json
+
+    :param obj: The object
+    :type obj: Any
+    :return: The number of bytes
+    :rtype: int
+    """
+    return len(json.dumps(obj).encode("utf-8"))
+
+
+def _pack(
+    items: List[Any], sizes: List[int], max_bytes: int, max_items: int
+) -> List[List[Any]]:
+    """Packs items in order into batches within a size and count limit. An item
+    larger than the size limit is put in a batch of its own.
+
+    :param items: The items
+    :type items: list
+    :param sizes: The encoded size of each item
+    :type sizes: list
+    :param max_bytes: The maximum size of a batch
+    :type max_bytes: int
+    :param max_items: The maximum number of items in a batch
+    :type max_items: int
+    :return: The batches
+    :rtype: list
+    """
+    batches: List[List[Any]] = []
+    batch: List[Any] = []
+    batch_bytes = _ENVELOPE_BYTES
+    for item, size in zip(items, sizes):
+        if batch and (batch_bytes + size > max_bytes or len(batch) >= max_items):
+            batches.append(batch)
+            batch = []
+            batch_bytes = _ENVELOPE_BYTES
+        batch.append(item)
+        batch_bytes += size + 2
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def split_requests(
+    requests: List[Dict[str, Any]],
+    max_bytes: Optional[int] = None,
+    max_requests: Optional[int] = None,
+) -> List[List[Dict[str, Any]]]:
+    """Splits the requests of a `batchUpdate` call into ordered batches that are
+    each within the size and count limits. Executing the batches in order keeps
+    every request after the requests it depends on, such as the creation of an
+    object before its styling.
+
+    :param requests: The requests
+    :type requests: list
+    :param max_bytes: The maximum encoded size of a batch, defaults to
+        :data:`MAX_BODY_BYTES`
+    :type max_bytes: int, optional
+    :param max_requests: The maximum number of requests in a batch, defaults to
+        :data:`MAX_REQUESTS`
+    :type max_requests: int, optional
+    :return: The batches of requests
+    :rtype: list
+    """
+    max_bytes = max_bytes or MAX_BODY_BYTES
+    max_requests = max_requests or MAX_REQUESTS
+    if len(requests) <= max_requests and encoded_size(requests) <= max_bytes:
+        return [requests]
+    sizes = [encoded_size(request) for request in requests]
+    return _pack(requests, sizes, max_bytes, max_requests)
+
+
+def _split_value_range(value_range: Dict[str, Any], max_bytes: int) -> List[Tuple]:
+    """Splits a value range into ranges of consecutive rows that are each
+    within the size limit
+
+    :param value_range: The value range with a range of the form `Sheet!A1:B2`
+    :type value_range: dict
+    :param max_bytes: The maximum encoded size of a range
+    :type max_bytes: int
+    :return: Tuples of each range and its encoded size
+    :rtype: list
+    """
+    size = encoded_size(value_range)
+    match = _RANGE_PATTERN.match(value_range["range"])
+    values = value_range.get("values", [])
+    if size <= max_bytes or match is None or len(values) <= 1:
+        return [(value_range, size)]
+    row_sizes = [encoded_size(row) + 2 for row in values]
+    row_index = int(match["start_row"])
+    ranges = []
+    for rows in _pack(list(range(len(values))), row_sizes, max_bytes, len(values)):
+        piece = {
+            **value_range,
+            "range": (
+                f"{match['sheet']}!{match['start_col']}{row_index}:"
+                f"{match['end_col']}{row_index + len(rows) - 1}"
+            ),
+            "values": values[rows[0] : rows[-1] + 1],  # noqa
+        }
+        ranges.append((piece, _ENVELOPE_BYTES + sum(row_sizes[i] for i in rows)))
+        row_index += len(rows)
+    return ranges
+
+
+def split_values(
+    data: List[Dict[str, Any]],
+    max_bytes: Optional[int] = None,
+    max_ranges: Optional[int] = None,
+) -> Tuple[List[List[Dict[str, Any]]], List[int]]:
+    """Splits the value ranges of a `values().batchUpdate` call into ordered
+    batches that are each within the size and count limits. Value ranges larger
+    than the size limit are split into ranges of consecutive rows.
+
+    :param data: The value ranges
+    :type data: list
+    :param max_bytes: The maximum encoded size of a batch, defaults to
+        :data:`MAX_BODY_BYTES`
+    :type max_bytes: int, optional
+    :param max_ranges: The maximum number of value ranges in a batch, defaults
+        to :data:`MAX_REQUESTS`
+    :type max_ranges: int, optional
+    :return: The batches of value ranges and the number of ranges each value
+        range was split into
+    :rtype: tuple
+    """
+    max_bytes = max_bytes or MAX_BODY_BYTES
+    max_ranges = max_ranges or MAX_REQUESTS
+    if len(data) <= max_ranges and encoded_size(data) <= max_bytes:
+        return [data], [1] * len(data)
+    split = [
+        _split_value_range(value_range, max_bytes - _ENVELOPE_BYTES)
+        for value_range in data
+    ]
+    pieces = [piece for ranges in split for piece in ranges]
+    batches = _pack(
+        [piece for piece, _ in pieces],
+        [size for _, size in pieces],
+        max_bytes,
+        max_ranges,
+    )
+    return batches, [len(ranges) for ranges in split]
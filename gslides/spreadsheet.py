@@ -3,13 +3,20 @@
 Spreadsheet class
 """
 
+import contextlib
 import logging
-import pprint
-from typing import Any, Dict, List, Tuple, Type, TypeVar, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple, Type, TypeVar, cast
 
 from . import creds
+from .aio import run_async, run_queued
+from .instrumentation import instrumented, log_request
 from .utils import json_dict_extract, json_val_extract
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .frame import Frame
+
 TSpreadsheet = TypeVar("TSpreadsheet", bound="Spreadsheet")
 
 logger = logging.getLogger(__name__)
@@ -41,6 +48,7 @@ class CreateSpreadsheet:
         }
         return json
 
+    @instrumented
     def execute(self, title: str, sheet_names: List[str]) -> Tuple[Any, ...]:
         """Executes the API call
 
@@ -55,7 +63,7 @@ class CreateSpreadsheet:
         service: Any = creds.sheet_service
         body = self.render_json(title, sheet_names)
         logger.info("Creating the spreadsheet")
-        logger.info(f"Request: {pprint.pformat(body)}")
+        log_request(logger, body)
         output = service.spreadsheets().create(body=body).execute()
         logger.info("Spreadsheet created successfully")
         sp_id = cast(str, json_val_extract(output, "spreadsheetId")[0])
@@ -66,6 +74,7 @@ class CreateSpreadsheet:
 class GetSpreadsheet:
     """An object to get a spreadsheet in Google sheets"""
 
+    @instrumented
     def execute(self, spreadsheet_id: str) -> Tuple[Any, ...]:
         """Executes the API call
 
@@ -100,6 +109,7 @@ class AddSheet:
             json["requests"].append({"addSheet": {"properties": {"title": sheet}}})
         return json
 
+    @instrumented
     def execute(self, spreadsheet_id: str, sheet_names: List[str]) -> Dict[str, int]:
         """Executes the API call
 
@@ -114,7 +124,7 @@ class AddSheet:
         service: Any = creds.sheet_service
         body = self.render_json(sheet_names)
         logger.info("Executing sheet creation")
-        logger.info(f"Request: {pprint.pformat(body)}")
+        log_request(logger, body)
         output = (
             service.spreadsheets()
             .batchUpdate(spreadsheetId=spreadsheet_id, body=body)
@@ -142,6 +152,7 @@ class RemoveSheet:
             json["requests"].append({"deleteSheet": {"sheetId": sheet_id}})
         return json
 
+    @instrumented
     def execute(self, spreadsheet_id: str, sheet_ids: List[int]) -> List[int]:
         """Executes the API call
 
@@ -156,7 +167,7 @@ class RemoveSheet:
         service: Any = creds.sheet_service
         body = self.render_json(sheet_ids)
         logger.info("Deleting sheet")
-        logger.info(f"Request: {pprint.pformat(body)}")
+        log_request(logger, body)
         (
             service.spreadsheets()
             .batchUpdate(spreadsheetId=spreadsheet_id, body=body)
@@ -228,6 +239,18 @@ class Spreadsheet:
         sht_ids = dict(zip(sheet_names, sht_ids))
         return cls(sp_id, title, sht_ids, initialized)
 
+    @classmethod
+    async def acreate(
+        cls: Type[TSpreadsheet], *args: Any, **kwargs: Any
+    ) -> TSpreadsheet:
+        """Awaitable version of :meth:`create`, accepting the same parameters.
+
+        :return: A Spreadsheet object
+        :rtype: :class:`gslides.Spreadsheet`
+
+        """
+        return await run_async(cls.create, *args, **kwargs)
+
     @classmethod
     def get(cls: Type[TSpreadsheet], spreadsheet_id: str) -> TSpreadsheet:
         """Gets an existing spreadsheet.
@@ -241,6 +264,16 @@ class Spreadsheet:
         title, sht_ids, initialized = GetSpreadsheet().execute(spreadsheet_id)
         return cls(spreadsheet_id, title, sht_ids, initialized)
 
+    @classmethod
+    async def aget(cls: Type[TSpreadsheet], *args: Any, **kwargs: Any) -> TSpreadsheet:
+        """Awaitable version of :meth:`get`, accepting the same parameters.
+
+        :return: A Spreadsheet object
+        :rtype: :class:`gslides.Spreadsheet`
+
+        """
+        return await run_async(cls.get, *args, **kwargs)
+
     def add_sheets(self, sheet_names: List[str]) -> None:
         """Adds sheets to a spreadsheet
 
@@ -267,6 +300,152 @@ class Spreadsheet:
         for nm in sheet_names:
             self.sht_nms.pop(nm)
 
+    def get_frames(self, specs: Sequence[Tuple[str, str, str]]) -> List["Frame"]:
+        """Gets several tables of data in the spreadsheet with a single call,
+        instead of one call per :meth:`Frame.get`.
+
+        :param specs: The sheet name, anchor cell (e.g. `A5`) and bottom right
+            cell (e.g. `B7`) of each table
+        :type specs: list
+        :raises RuntimeError: The response does not hold a value range per spec
+        :return: A list of :class:`gslides.Frame` objects, in the order of the
+            specs
+        :rtype: list
+
+        :example:
+
+        >>> sp.get_frames([("Sheet1", "A1", "C10"), ("Sheet2", "B2", "D20")])
+        """
+        from .frame import Frame, GetFrame, batch_get_sheet_data
+
+        frames = [
+            GetFrame(
+                self.spreadsheet_id,
+                self.sht_nms[sheet_name],
+                sheet_name,
+                anchor_cell,
+                bottom_right_cell,
+            )
+            for sheet_name, anchor_cell, bottom_right_cell in specs
+        ]
+        if not frames:
+            return []
+        outputs = batch_get_sheet_data(
+            self.spreadsheet_id, [frame.range for frame in frames]
+        )
+        return [
+            Frame(
+                frame.to_df(output),
+                frame.spreadsheet_id,
+                frame.sheet_id,
+                frame.sheet_name,
+                frame.start_column_index,
+                frame.start_row_index,
+                frame.end_column_index,
+                frame.end_row_index,
+                True,
+            )
+            for frame, output in zip(frames, outputs)
+        ]
+
+    async def aget_frames(self, *args: Any, **kwargs: Any) -> List["Frame"]:
+        """Awaitable version of :meth:`get_frames`, accepting the same
+        parameters.
+
+        :return: A list of :class:`gslides.Frame` objects
+        :rtype: list
+
+        """
+        return await run_async(self.get_frames, *args, **kwargs)
+
+    def write_frames(
+        self,
+        specs: Sequence[Tuple["pd.DataFrame", str, str]],
+        overwrite_data: bool = False,
+    ) -> List["Frame"]:
+        """Creates several tables of data across the sheets of the spreadsheet.
+        The ranges are checked for existing data with a single call and the data
+        is written with a single call, split only when it exceeds the size limits
+        of a call. Within a :class:`Session` the data is queued instead.
+
+        :param specs: The dataframe, sheet name and anchor cell (e.g. `A5`) of
+            each table
+        :type specs: list
+        :param overwrite_data: Whether to overwrite the existing data
+        :type overwrite_data: bool, optional
+        :raises RuntimeError: Create table will overwrite existing data
+        :return: A list of :class:`gslides.Frame` objects, in the order of the
+            specs
+        :rtype: list
+
+        :example:
+
+        >>> sp.write_frames([(revenue, "Sheet1", "A1"), (costs, "Sheet2", "B2")])
+        """
+        from .frame import CreateFrame, Frame, _hash_rows, has_sheet_data, render_range
+        from .session import Session, current_session
+
+        sheet_ids = [self.sht_nms[sheet_name] for _, sheet_name, _ in specs]
+        frames = [
+            CreateFrame(
+                df,
+                self.spreadsheet_id,
+                sheet_name,
+                overwrite_data=True,
+                anchor_cell=anchor_cell,
+            )
+            for df, sheet_name, anchor_cell in specs
+        ]
+        if not frames:
+            return []
+        if overwrite_data is False:
+            ranges = [
+                render_range(
+                    frame.sheet_name,
+                    frame.start_column_index,
+                    frame.start_row_index,
+                    frame.end_column_index,
+                    frame.end_row_index,
+                )
+                for frame in frames
+            ]
+            existing = has_sheet_data(self.spreadsheet_id, ranges)
+            for rng, existing_data in zip(ranges, existing):
+                if existing_data:
+                    raise RuntimeError(
+                        f"Create table will overwrite existing data in {rng}"
+                    )
+        session = contextlib.nullcontext() if current_session() else Session()
+        with session:
+            for frame in frames:
+                frame.execute()
+        outputs = []
+        for (df, _, _), sheet_id, frame in zip(specs, sheet_ids, frames):
+            output = Frame(
+                df,
+                self.spreadsheet_id,
+                sheet_id,
+                frame.sheet_name,
+                frame.start_column_index,
+                frame.start_row_index,
+                frame.end_column_index,
+                frame.end_row_index,
+                True,
+            )
+            output._hashes = _hash_rows(frame.df)
+            outputs.append(output)
+        return outputs
+
+    async def awrite_frames(self, *args: Any, **kwargs: Any) -> List["Frame"]:
+        """Awaitable version of :meth:`write_frames`, accepting the same
+        parameters.
+
+        :return: A list of :class:`gslides.Frame` objects
+        :rtype: list
+
+        """
+        return await run_queued(self.write_frames, *args, **kwargs)
+
     @property
     def get_method(self) -> str:
         """Returns the corresponding get initialization method.
@@ -3,20 +3,23 @@
 Creates the table in Google slides
 """
 import logging
-import pprint
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
 from . import creds, package_font
+from .aio import run_queued
 from .colors import translate_color
 from .frame import Frame
+from .instrumentation import instrumented, log_request
+from .session import current_session
+from .splitter import split_requests
 from .utils import (
     black_or_white,
-    clean_dtypes,
-    clean_nan,
+    clean_df,
     determine_col_proportion,
+    generate_object_id,
     hex_to_rgb,
 )
 
@@ -92,9 +95,7 @@ class Table:
         if isinstance(data, Frame):
             return data.df
         elif isinstance(data, pd.DataFrame):
-            df = clean_nan(data)
-            df = df.applymap(clean_dtypes)
-            return df
+            return clean_df(data)
         else:
             raise ValueError("Only pd.DataFrame or Frame accepted")
 
@@ -109,11 +110,16 @@ class Table:
         """
         return df.T.reset_index().T
 
-    def render_create_table_json(self, sl_id: str) -> Dict[str, Any]:
+    def render_create_table_json(
+        self, sl_id: str, tbl_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Renders the create table json
 
         :param sl_id: Slide id
         :type sl_id: str
+        :param tbl_id: Client assigned table id. If not passed the id is assigned
+            by the API
+        :type tbl_id: str, optional
         :return: json for the API call
         :rtype: dict
 
@@ -131,6 +137,8 @@ class Table:
                 },
             ]
         }
+        if tbl_id:
+            json["requests"][0]["createTable"]["objectId"] = tbl_id
         return json
 
     def _table_move_request(
@@ -165,8 +173,98 @@ class Table:
         )
         return requests
 
+    def _table_range(
+        self, row_index: int, column_index: int, row_span: int, column_span: int
+    ) -> Dict[str, Any]:
+        """Renders a rectangular range of cells in the table
+
+        :param row_index: The index of the first row of the range
+        :type row_index: int
+        :param column_index: The index of the first column of the range
+        :type column_index: int
+        :param row_span: The number of rows in the range
+        :type row_span: int
+        :param column_span: The number of columns in the range
+        :type column_span: int
+        :return: The table range
+        :rtype: dict
+        """
+        return {
+            "location": {"rowIndex": row_index, "columnIndex": column_index},
+            "rowSpan": row_span,
+            "columnSpan": column_span,
+        }
+
+    def _compile_table_styles(
+        self,
+        header: bool,
+        stub: bool,
+        header_font_color: Tuple[float, ...],
+        stub_font_color: Tuple[float, ...],
+    ) -> List[Tuple[Dict[str, Any], Tuple[float, ...], bool]]:
+        """Compiles the table into the rectangular ranges of cells that share the
+        same text style. The header row takes precedence over the stub column.
+
+        :param header: Whether to enable formatting on the header row
+        :type header: bool
+        :param stub: Whether to enable formatting on the stub (1st) column
+        :type stub: bool
+        :param header_font_color: A color to set the header font.
+        :type header_font_color: tuple
+        :param stub_font_color: A color to set the stub font.
+        :type stub_font_color: tuple
+        :return: List of the table range, font color and boldness of each style
+        :rtype: list
+        """
+        rows, columns = self.df.shape
+        body_row = 1 if header else 0
+        body_column = 1 if stub else 0
+        styles: List[Tuple[Dict[str, Any], Tuple[float, ...], bool]] = []
+        if header:
+            styles.append(
+                (self._table_range(0, 0, 1, columns), header_font_color, True)
+            )
+        if stub and rows > body_row:
+            styles.append(
+                (
+                    self._table_range(body_row, 0, rows - body_row, 1),
+                    stub_font_color,
+                    True,
+                )
+            )
+        if rows > body_row and columns > body_column:
+            styles.append(
+                (
+                    self._table_range(
+                        body_row, body_column, rows - body_row, columns - body_column
+                    ),
+                    (0, 0, 0),
+                    False,
+                )
+            )
+        return styles
+
+    def _table_cells(self, table_range: Dict[str, Any]) -> List[Tuple[int, int]]:
+        """Lists the cells in a table range that contain text. Empty cells are
+        excluded as text requests can not be applied to them.
+
+        :param table_range: The table range
+        :type table_range: dict
+        :return: List of the row and column index of each cell
+        :rtype: list
+        """
+        row_start = table_range["location"]["rowIndex"]
+        column_start = table_range["location"]["columnIndex"]
+        text = self.df.iloc[
+            row_start : row_start + table_range["rowSpan"],  # noqa
+            column_start : column_start + table_range["columnSpan"],  # noqa
+        ].astype(str)
+        cells = np.argwhere(text.values != "") + (row_start, column_start)
+        return [(int(row_cnt), int(col_cnt)) for row_cnt, col_cnt in cells]
+
     def _table_add_text_request(self, tbl_id: str) -> List[Any]:
-        """Renders the add text requests
+        """Renders the add text requests. The API only accepts a single cell
+        location per request so one request is rendered per non-empty cell.
 
         :param tbl_id: Table id
         :type tbl_id: str
@@ -174,10 +272,10 @@ class Table:
         :rtype: list
         """
         requests: List[Any] = []
-        for row_cnt, col in enumerate(
-            self.df.applymap(str).values.tolist()
-        ):  # fix_later
-            for col_cnt, val in enumerate(col):
+        for row_cnt, row in enumerate(self.df.astype(str).values.tolist()):
+            for col_cnt, val in enumerate(row):
+                if val == "":
+                    continue
                 requests.append(
                     {
                         "insertText": {
@@ -202,7 +300,9 @@ class Table:
         header_font_color: Tuple[float, ...],
         stub_font_color: Tuple[float, ...],
     ) -> List[Any]:
-        """Renders the style text requests
+        """Renders the style text requests. Styles are compiled once per range of
+        cells sharing the same style and then applied to each non-empty cell in the
+        range, as the API only accepts a single cell location per request.
 
         :param tbl_id: Table id
         :type tbl_id: str
@@ -220,17 +320,24 @@ class Table:
         :rtype: list
         """
         requests: List[Any] = []
-        for row_cnt, col in enumerate(self.df.values.tolist()):
-            for col_cnt, val in enumerate(col):
-                if header and row_cnt == 0:
-                    font_color = header_font_color
-                    bold = True
-                elif stub and col_cnt == 0:
-                    font_color = stub_font_color
-                    bold = True
-                else:
-                    font_color = (0, 0, 0)
-                    bold = False
+        for table_range, font_color, bold in self._compile_table_styles(
+            header, stub, header_font_color, stub_font_color
+        ):
+            style = {
+                "foregroundColor": {
+                    "opaqueColor": {
+                        "rgbColor": {
+                            "red": font_color[0],
+                            "green": font_color[1],
+                            "blue": font_color[2],
+                        }
+                    }
+                },
+                "bold": bold,
+                "fontFamily": package_font.font,
+                "fontSize": {"magnitude": font_size, "unit": "PT"},
+            }
+            for row_cnt, col_cnt in self._table_cells(table_range):
                 requests.append(
                     {
                         "updateTextStyle": {
@@ -239,20 +346,7 @@ class Table:
                                 "rowIndex": row_cnt,
                                 "columnIndex": col_cnt,
                             },
-                            "style": {
-                                "foregroundColor": {
-                                    "opaqueColor": {
-                                        "rgbColor": {
-                                            "red": font_color[0],
-                                            "green": font_color[1],
-                                            "blue": font_color[2],
-                                        }
-                                    }
-                                },
-                                "bold": bold,
-                                "fontFamily": package_font.font,
-                                "fontSize": {"magnitude": font_size, "unit": "PT"},
-                            },
+                            "style": style,
                             "textRange": {"type": "ALL"},
                             "fields": "foregroundColor,bold,fontFamily,fontSize",
                         }
@@ -288,11 +382,9 @@ class Table:
             {
                 "updateTableCellProperties": {
                     "objectId": tbl_id,
-                    "tableRange": {
-                        "location": {"rowIndex": 0, "columnIndex": 0},
-                        "rowSpan": self.df.shape[0],
-                        "columnSpan": self.df.shape[1],
-                    },
+                    "tableRange": self._table_range(
+                        0, 0, self.df.shape[0], self.df.shape[1]
+                    ),
                     "tableCellProperties": {"contentAlignment": "MIDDLE"},
                     "fields": "contentAlignment",
                 }
@@ -303,11 +395,7 @@ class Table:
                 {
                     "updateTableCellProperties": {
                         "objectId": tbl_id,
-                        "tableRange": {
-                            "location": {"rowIndex": 0, "columnIndex": 0},
-                            "rowSpan": self.df.shape[0],
-                            "columnSpan": 1,
-                        },
+                        "tableRange": self._table_range(0, 0, self.df.shape[0], 1),
                         "tableCellProperties": {
                             "tableCellBackgroundFill": {
                                 "solidFill": {
@@ -330,11 +418,7 @@ class Table:
                 {
                     "updateTableCellProperties": {
                         "objectId": tbl_id,
-                        "tableRange": {
-                            "location": {"rowIndex": 0, "columnIndex": 0},
-                            "rowSpan": 1,
-                            "columnSpan": self.df.shape[1],
-                        },
+                        "tableRange": self._table_range(0, 0, 1, self.df.shape[1]),
                         "tableCellProperties": {
                             "tableCellBackgroundFill": {
                                 "solidFill": {
@@ -355,7 +439,9 @@ class Table:
         return requests
 
     def _table_update_paragraph_style(self, tbl_id: str) -> List[Any]:
-        """Renders the update paragraph style requests
+        """Renders the update paragraph style requests. The API only accepts a
+        single cell location per request so one request is rendered per non-empty
+        cell.
 
         :param tbl_id: Table id
         :type tbl_id: str
@@ -363,22 +449,23 @@ class Table:
         :rtype: list
         """
         requests: List[Any] = []
-        for row_cnt, col in enumerate(self.df.values.tolist()):  # fix later
-            for col_cnt, val in enumerate(col):
-                requests.append(
-                    {
-                        "updateParagraphStyle": {
-                            "objectId": tbl_id,
-                            "cellLocation": {
-                                "rowIndex": row_cnt,
-                                "columnIndex": col_cnt,
-                            },
-                            "style": {"alignment": "CENTER"},
-                            "textRange": {"type": "ALL"},
-                            "fields": "alignment",
-                        }
+        style = {"alignment": "CENTER"}
+        table_range = self._table_range(0, 0, self.df.shape[0], self.df.shape[1])
+        for row_cnt, col_cnt in self._table_cells(table_range):
+            requests.append(
+                {
+                    "updateParagraphStyle": {
+                        "objectId": tbl_id,
+                        "cellLocation": {
+                            "rowIndex": row_cnt,
+                            "columnIndex": col_cnt,
+                        },
+                        "style": style,
+                        "textRange": {"type": "ALL"},
+                        "fields": "alignment",
                     }
-                )
+                }
+            )
         return requests
 
     def _table_update_row(self, tbl_id: str, row_height: float) -> List:
@@ -488,6 +575,7 @@ class Table:
         json["requests"].extend(self._table_update_column(tbl_id, col_widths))
         return json
 
+    @instrumented
     def create(
         self,
         presentation_id: str,
@@ -496,7 +584,8 @@ class Table:
         translate_x: float = 0,
         translate_y: float = 0,
     ) -> None:
-        """Creates the table in Google slides
+        """Creates the table in Google slides. Updates exceeding the size limits
+        of a call are split into several calls executed in order.
 
         :param presentation_id: The presentation_id of the presentation to create
             to create table in
@@ -510,10 +599,22 @@ class Table:
         :param translate_y: The number of EMU to translate the object by
         :type translate_y: float
         """
+        session = current_session()
+        if session:
+            tbl_id = generate_object_id("table")
+            requests = self.render_create_table_json(slide_id, tbl_id)["requests"]
+            requests.extend(
+                self.render_update_table_json(tbl_id, size, translate_x, translate_y)[
+                    "requests"
+                ]
+            )
+            session.queue_slide_update(presentation_id, requests)
+            logger.info("Queued table creation")
+            return
         service = creds.slide_service
         body = self.render_create_table_json(slide_id)
         logger.info("Executing table creation")
-        logger.info(f"Request: {pprint.pformat(body)}")
+        log_request(logger, body)
         output = (
             service.presentations()
             .batchUpdate(
@@ -529,14 +630,19 @@ class Table:
             translate_x,
             translate_y,
         )
-        logger.info("Executing table updates")
-        logger.info(f"Request: {pprint.pformat(body)}")
-        (
-            service.presentations()
-            .batchUpdate(
-                presentationId=presentation_id,
-                body=body,
+        for batch in split_requests(body["requests"]):
+            logger.info("Executing table updates")
+            log_request(logger, {"requests": batch})
+            (
+                service.presentations()
+                .batchUpdate(
+                    presentationId=presentation_id,
+                    body={"requests": batch},
+                )
+                .execute()
             )
-            .execute()
-        )
-        logger.info("Table updated successfully")
+            logger.info("Table updated successfully")
+
+    async def acreate(self, *args: Any, **kwargs: Any) -> None:
+        """Awaitable version of :meth:`create`, accepting the same parameters."""
+        return await run_queued(self.create, *args, **kwargs)
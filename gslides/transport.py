@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Records the API calls made by the package and replays them without a network
+"""
+
+import collections
+import contextlib
+import json
+import re
+import threading
+from typing import IO, Any, Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from . import creds
+from .scheduler import RETRYABLE_STATUSES
+
+_DOCUMENT_PATTERN = re.compile(r"/(?:spreadsheets|presentations)/([^/:?]+)")
+
+
+def _decode(content: Any) -> Any:
+    """Decodes a body or response content as json if possible
+
+    :param content: The body or content
+    :type content: str or bytes
+    :return: The decoded json, the text or None
+    :rtype: Any
+    """
+    if content is None:
+        return None
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    try:
+        return json.loads(content)
+    except ValueError:
+        return content
+
+
+def document_id(uri: str) -> Optional[str]:
+    """Returns the id of the spreadsheet or presentation of a call
+
+    :param uri: The uri of the call
+    :type uri: str
+    :return: The id of the document or None
+    :rtype: str, optional
+    """
+    match = _DOCUMENT_PATTERN.search(urlsplit(uri).path)
+    return match.group(1) if match else None
+
+
+class RecordingHttp:
+    """Wraps an http transport so that each request and response is written to
+    a :class:`Recorder`.
+
+    :param http: The http transport to wrap
+    :type http: :class:`google_auth_httplib2.AuthorizedHttp`
+    :param recorder: The recorder
+    :type recorder: :class:`Recorder`
+    """
+
+    def __init__(self, http: Any, recorder: "Recorder") -> None:
+        """Constructor method"""
+        self.http = http
+        self.recorder = recorder
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> Tuple[Any, bytes]:
+        """Makes an http request and records it
+
+        :param uri: The uri of the request
+        :type uri: str
+        :param method: The http method of the request
+        :type method: str, optional
+        :param body: The body of the request
+        :type body: str, optional
+        :param headers: The headers of the request
+        :type headers: dict, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        resp, content = self.http.request(
+            uri, method=method, body=body, headers=headers, **kwargs
+        )
+        self.recorder.write(
+            {
+                "method": method,
+                "uri": uri,
+                "document_id": document_id(uri),
+                "body": _decode(body),
+                "status": resp.status,
+                "response": _decode(content),
+            }
+        )
+        return resp, content
+
+    def __getattr__(self, name: str) -> Any:
+        """Passes any other attribute through to the wrapped transport"""
+        return getattr(self.http, name)
+
+
+class Recorder:
+    """Records the API calls made through the connections of the package to a
+    JSONL file, one line per call with the method, uri, document id, body,
+    status and response. Add it with :meth:`Creds.add_middleware` or use
+    :func:`record`.
+
+    :param path: The path of the JSONL file
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        """Constructor method"""
+        self.path = path
+        self.file: IO[str] = open(path, "w")
+        self.lock = threading.Lock()
+
+    def __call__(self, http: Any) -> RecordingHttp:
+        """Wraps an http transport
+
+        :param http: The http transport to wrap
+        :type http: :class:`google_auth_httplib2.AuthorizedHttp`
+        :return: The wrapped transport
+        :rtype: :class:`RecordingHttp`
+        """
+        return RecordingHttp(http, self)
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Writes a call to the file
+
+        :param entry: The call
+        :type entry: dict
+        """
+        line = json.dumps(entry)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+
+    def close(self) -> None:
+        """Closes the file"""
+        with self.lock:
+            self.file.close()
+
+
+class ReplayHttp:
+    """An http transport returning the responses of a :class:`Replayer`.
+
+    :param replayer: The replayer
+    :type replayer: :class:`Replayer`
+    """
+
+    def __init__(self, replayer: "Replayer") -> None:
+        """Constructor method"""
+        self.replayer = replayer
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> Tuple[Any, bytes]:
+        """Returns the recorded response of a request
+
+        :param uri: The uri of the request
+        :type uri: str
+        :param method: The http method of the request
+        :type method: str, optional
+        :param body: The body of the request
+        :type body: str, optional
+        :param headers: The headers of the request
+        :type headers: dict, optional
+        :return: The response and content
+        :rtype: tuple
+        """
+        return self.replayer.respond(uri, method)
+
+    def close(self) -> None:
+        """Closes the transport"""
+
+
+class Replayer:
+    """Replays the responses recorded by a :class:`Recorder` without a network.
+    Responses are matched on the method and path of a call and returned in the
+    order they were recorded, starting over once all responses of a path have
+    been returned. Responses with a retryable status are skipped. Set it with
+    :meth:`Creds.set_http_factory` or use :func:`replay`.
+
+    :param path: The path of the JSONL file
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        """Constructor method"""
+        self.path = path
+        self.responses: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self.calls: List[Tuple[str, str]] = []
+        self.lock = threading.Lock()
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["status"] in RETRYABLE_STATUSES:
+                    continue
+                key = (entry["method"], urlsplit(entry["uri"]).path)
+                self.responses.setdefault(key, collections.deque()).append(entry)
+
+    def __call__(self) -> ReplayHttp:
+        """Creates an http transport
+
+        :return: The transport
+        :rtype: :class:`ReplayHttp`
+        """
+        return ReplayHttp(self)
+
+    def respond(self, uri: str, method: str) -> Tuple[Any, bytes]:
+        """Returns the next recorded response of a call
+
+        :param uri: The uri of the call
+        :type uri: str
+        :param method: The http method of the call
+        :type method: str
+        :raises RuntimeError: No recorded response for the call
+        :return: The response and content
+        :rtype: tuple
+        """
+        import httplib2
+
+        key = (method, urlsplit(uri).path)
+        with self.lock:
+            self.calls.append(key)
+            entries = self.responses.get(key)
+            if not entries:
+                raise RuntimeError(f"No recorded response for {method} {key[1]}")
+            entry = entries.popleft()
+            entries.append(entry)
+        resp = httplib2.Response(
+            {"status": str(entry["status"]), "content-type": "application/json"}
+        )
+        response = entry["response"]
+        content = response if isinstance(response, str) else json.dumps(response)
+        return resp, content.encode("utf-8")
+
+
+@contextlib.contextmanager
+def record(path: str) -> Iterator[Recorder]:
+    """Records the API calls made within the context to a JSONL file
+
+    :param path: The path of the JSONL file
+    :type path: str
+    :return: The recorder
+    :rtype: :class:`Recorder`
+
+    :example:
+
+    >>> with record("calls.jsonl"):
+    ...     prs.add_slide([chart], layout=(1, 1))
+    """
+    recorder = Recorder(path)
+    creds.add_middleware(recorder)
+    try:
+        yield recorder
+    finally:
+        creds.remove_middleware(recorder)
+        recorder.close()
+
+
+@contextlib.contextmanager
+def replay(path: str, throttle: bool = False) -> Iterator[Replayer]:
+    """Replays the API calls recorded in a JSONL file within the context, without
+    credentials or a network.
+
+    :param path: The path of the JSONL file
+    :type path: str
+    :param throttle: Whether calls are still throttled by the scheduler
+    :type throttle: bool, optional
+    :return: The replayer
+    :rtype: :class:`Replayer`
+
+    :example:
+
+    >>> with replay("calls.jsonl"):
+    ...     prs.add_slide([chart], layout=(1, 1))
+    """
+    replayer = Replayer(path)
+    http_factory, scheduler = creds.http_factory, creds.scheduler
+    creds.set_http_factory(replayer)
+    if not throttle:
+        creds.set_scheduler(None)
+    try:
+        yield replayer
+    finally:
+        creds.set_http_factory(http_factory)
+        creds.set_scheduler(scheduler)
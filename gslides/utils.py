@@ -1,13 +1,14 @@
 # -*- coding: utf-8 -*-
 import datetime
 import re
+import uuid
 from decimal import Decimal
 from typing import Any, Dict, List, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
-from .config import CHART_PARAMS
+from . import config
 
 
 def json_val_extract(obj: Dict[str, Any], key: str) -> List[Any]:
@@ -188,6 +189,33 @@ def cell_to_num(x: str) -> Tuple[int, int]:
         raise ValueError("Invalid cell format")
 
 
+def generate_object_id(prefix: str) -> str:
+    """Generates a unique object id that can be assigned on the client side to
+    objects created through the Google slides API. Ids must be between 5 and 50
+    characters and only contain alphanumeric characters, underscores, hyphens
+    or colons.
+
+    :param prefix: Prefix to identify the type of object (e.g. `slide`)
+    :type prefix: str
+    :return: Unique object id
+    :rtype: str
+
+    """
+    return f"{prefix}_{uuid.uuid4().hex}"
+
+
+def generate_chart_id() -> int:
+    """Generates a chart id assigned on the client, so that a chart creation
+    which is retried after it was applied fails instead of adding a duplicate
+    chart.
+
+    :return: Random positive 32-bit chart id
+    :rtype: int
+
+    """
+    return uuid.uuid4().int % (2 ** 31 - 1) + 1
+
+
 def validate_hex_color_code(x: str) -> str:
     """Short summary.
 
@@ -297,6 +325,74 @@ def clean_dtypes(x: Any) -> Union[str, float, int, np.int64, np.float64, None]:
         )
 
 
+def clean_series(series: pd.Series, datetime_serial: bool = False) -> pd.Series:
+    """Cleans the datatypes of a column to either int, float, string or None. The
+    conversion is dispatched on the dtype of the column so that each column is
+    converted in a single operation. Object columns that do not only contain
+    strings fall back to :func:`clean_dtypes` for each observation.
+
+    :param series: Column to clean
+    :type series: :class:`pandas.Series`
+    :param datetime_serial: Whether to convert datetime columns to serial numbers
+        (days since 1899-12-30) rather than strings
+    :type datetime_serial: bool, optional
+    :return: Clean column with an object dtype
+    :rtype: :class:`pandas.Series`
+
+    """
+    mask = series.notna()
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if datetime_serial:
+            output = (series - pd.Timestamp("1899-12-30", tz=series.dt.tz)) / (
+                pd.Timedelta(days=1)
+            )
+        elif series.dt.tz is None and not (
+            series.dt.microsecond.any() or series.dt.nanosecond.any()
+        ):
+            output = pd.Series(
+                np.datetime_as_string(series.values, unit="s"), index=series.index
+            ).str.replace("T", " ", regex=False)
+        else:
+            output = series.map(str)
+    elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(
+        series
+    ):
+        output = series
+    elif pd.api.types.is_object_dtype(series) and pd.api.types.infer_dtype(
+        series, skipna=True
+    ) in ["string", "empty"]:
+        output = series
+    else:
+        output = series.map(clean_dtypes, na_action="ignore")
+    values = output.to_numpy(dtype=object)
+    values[~mask.to_numpy()] = None
+    return pd.Series(values, index=series.index, name=series.name, dtype=object)
+
+
+def clean_df(df: pd.DataFrame, datetime_serial: bool = False) -> pd.DataFrame:
+    """Cleans the datatypes of a dataframe to either int, float, string or None
+    column by column. See :func:`clean_series`.
+
+    :param df: :class:`pandas.DataFrame`
+    :type df: :class:`pandas.DataFrame`
+    :param datetime_serial: Whether to convert datetime columns to serial numbers
+        (days since 1899-12-30) rather than strings
+    :type datetime_serial: bool, optional
+    :return: :class:`pandas.DataFrame`
+    :rtype: :class:`pandas.DataFrame`
+
+    """
+    output = pd.DataFrame(
+        {
+            cnt: clean_series(df.iloc[:, cnt], datetime_serial)
+            for cnt in range(df.shape[1])
+        },
+        index=df.index,
+    )
+    output.columns = df.columns
+    return output
+
+
 def validate_params_list(params: dict) -> None:
     """Validates the parameters for the chart based on a list
 
@@ -305,7 +401,7 @@ def validate_params_list(params: dict) -> None:
     :raises ValueError:
 
     """
-    for key, val in CHART_PARAMS.items():
+    for key, val in config.CHART_PARAMS.items():
         if key in params.keys() and params[key]:
             if params[key] not in val["params"]:
                 raise ValueError(
@@ -45,7 +45,14 @@ with open("requirements.txt", "r") as f:
 
 EXTRAS_REQUIRE = {
     "docs": ["sphinx", "sphinx_rtd_theme", "furo"],
-    "test": ["coverage", "pytest", "pytest-cov", "pytest-pylint", "mypy"],
+    "test": [
+        "coverage",
+        "pytest",
+        "pytest-benchmark",
+        "pytest-cov",
+        "pytest-pylint",
+        "mypy",
+    ],
     "qa": [
         "pylint",
         "pre-commit",
@@ -57,6 +64,8 @@ EXTRAS_REQUIRE = {
     ],
 }
 
+EXTRAS_REQUIRE["aio"] = ["aiohttp"]
+
 EXTRAS_REQUIRE["dev"] = (
     EXTRAS_REQUIRE["test"] + EXTRAS_REQUIRE["docs"] + EXTRAS_REQUIRE["qa"]
 )
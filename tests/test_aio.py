@@ -0,0 +1,293 @@
+import asyncio
+import json
+import threading
+
+import httplib2
+import pandas as pd
+import pytest
+from googleapiclient.errors import HttpError
+
+import gslides.scheduler as scheduler
+from gslides import Presentation, Spreadsheet, aio, creds, instrumentation
+from gslides.chart import Chart, Series
+from gslides.emulator import EmulatorTransport, emulate
+from gslides.frame import Frame
+from gslides.session import Session, current_session
+
+
+def test_df():
+    data = [
+        ["Object", "Blue", "Red", "Grand Total"],
+        ["Ball", "6", "1", "7"],
+        ["Cube", "6", "4", "10"],
+        ["Stick", "7", "5", "12"],
+    ]
+    return pd.DataFrame(columns=data[0], data=data[1:])
+
+
+class MockService:
+    def __init__(self, calls):
+        self.calls = calls
+        self.method = None
+
+    def spreadsheets(self, **kwargs):
+        self.method = "spreadsheets"
+        return self
+
+    def values(self, **kwargs):
+        self.method = "values"
+        return self
+
+    def batchUpdate(self, **kwargs):
+        self.body = kwargs["body"]
+        return self
+
+    def execute(self, **kwargs):
+        self.calls.append((self.method, threading.get_ident()))
+        if self.method == "values":
+            return {"responses": []}
+        return {"replies": [{"addChart": {"chart": {"chartId": 1}}}]}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def mock_service(self):
+        return MockService(calls)
+
+    monkeypatch.setattr("gslides.config.Creds.sheet_service", property(mock_service))
+    return calls
+
+
+def test_run_async():
+    async def main():
+        return await aio.run_async(threading.get_ident)
+
+    assert asyncio.run(main()) != threading.get_ident()
+
+
+def test_run_async_context():
+    async def main():
+        with Session() as session:
+            return session, await aio.run_async(current_session)
+
+    session, active = asyncio.run(main())
+    assert active is session
+
+
+def test_acreate(calls):
+    async def main():
+        frames = await asyncio.gather(
+            *[
+                Frame.acreate(test_df(), "abc123", 1234, "first", overwrite_data=True)
+                for _ in range(3)
+            ]
+        )
+        chart = Chart(frames[0], "Object", [Series.column(["Blue"])])
+        await chart.acreate()
+        return frames, chart
+
+    frames, chart = asyncio.run(main())
+    assert all(isinstance(frame, Frame) for frame in frames)
+    assert chart.ch_id == 1
+    assert [method for method, _ in calls] == ["values"] * 3 + ["spreadsheets"]
+    assert threading.get_ident() not in {thread for _, thread in calls}
+
+
+def test_async_session(calls):
+    async def main():
+        async with Session():
+            await asyncio.gather(
+                *[
+                    Frame.acreate(
+                        test_df(), "abc123", 1234, "first", overwrite_data=True
+                    )
+                    for _ in range(3)
+                ]
+            )
+            assert calls == []
+        assert current_session() is None
+
+    asyncio.run(main())
+    assert [method for method, _ in calls] == ["values"]
+
+
+class TrackedTransport(EmulatorTransport):
+    def __init__(self, emulator):
+        super().__init__(emulator)
+        self.active = 0
+        self.most = 0
+
+    async def request(self, *args, **kwargs):
+        self.active += 1
+        self.most = max(self.most, self.active)
+        try:
+            return await super().request(*args, **kwargs)
+        finally:
+            self.active -= 1
+
+
+def test_transport():
+    events = []
+    instrumentation.add_callback(events.append)
+    try:
+        with emulate(throttle=False, latency=0.01) as emulator:
+            sp = Spreadsheet.create(title="data", sheet_names=["first"])
+            sheet_id = sp.sheet_names["first"]
+            prs = Presentation.create("deck")
+            transport = TrackedTransport(emulator)
+            aio.set_transport(transport)
+
+            async def main():
+                frame = await Frame.acreate(
+                    test_df(), sp.spreadsheet_id, sheet_id, "first", True
+                )
+                charts = [
+                    Chart(frame, "Object", [Series.column(["Blue"])]) for _ in range(8)
+                ]
+                outputs = await asyncio.gather(*[chart.acreate() for chart in charts])
+                await asyncio.gather(
+                    *[prs.aadd_slide([chart], layout=(1, 1)) for chart in charts]
+                )
+                return charts, outputs
+
+            calls = len(events)
+            charts, outputs = asyncio.run(main())
+        assert aio.get_transport() is None
+    finally:
+        instrumentation.remove_callback(events.append)
+    assert transport.most > 1
+    assert all(output["spreadsheetId"] == sp.spreadsheet_id for output in outputs)
+    sheet = emulator.spreadsheets[sp.spreadsheet_id]["sheets"][0]
+    assert len(sheet["charts"]) == 16
+    assert {chart.ch_id for chart in charts} <= {
+        chart["chartId"] for chart in sheet["charts"]
+    }
+    assert len(emulator.presentations[prs.presentation_id]["slides"]) == 8
+    assert {event.operation for event in events[calls:]} >= {
+        "Frame.create",
+        "Chart.create",
+        "Presentation.add_slide",
+    }
+
+
+def test_execute():
+    with emulate(throttle=False, transport=True) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        service = creds.sheet_service
+
+        async def main():
+            return await aio.execute(
+                service.spreadsheets().get(spreadsheetId=sp.spreadsheet_id)
+            )
+
+        output = asyncio.run(main())
+        with pytest.raises(HttpError) as error:
+            asyncio.run(aio.execute(service.spreadsheets().get(spreadsheetId="abc")))
+    assert output["spreadsheetId"] == sp.spreadsheet_id
+    assert error.value.resp.status == 404
+    assert emulator.stats()["requests"]["sheets.spreadsheets.get"] == 2
+
+
+def test_transport_retries(monkeypatch):
+    async def sleep(seconds):
+        pass
+
+    monkeypatch.setattr(scheduler.asyncio, "sleep", sleep)
+    events = []
+    instrumentation.add_callback(events.append)
+    try:
+        with emulate(transport=True) as emulator:
+            sp = Spreadsheet.create(title="data", sheet_names=["first"])
+            respond = emulator._respond
+            failures = []
+
+            def fail_once(uri, method, body):
+                if ":batchUpdate" in uri and not failures:
+                    failures.append(uri)
+                    return httplib2.Response({"status": "503"}), b"{}"
+                return respond(uri, method, body)
+
+            monkeypatch.setattr(emulator, "_respond", fail_once)
+            sheet_id = sp.sheet_names["first"]
+            asyncio.run(
+                Frame.acreate(test_df(), sp.spreadsheet_id, sheet_id, "first", True)
+            )
+    finally:
+        instrumentation.remove_callback(events.append)
+    assert failures
+    assert events[-1].retries == 1
+    assert events[-1].status == 200
+
+
+def test_transport_session():
+    with emulate(throttle=False, transport=True) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        sheet_id = sp.sheet_names["first"]
+
+        async def main():
+            async with Session():
+                await asyncio.gather(
+                    *[
+                        Frame.acreate(
+                            test_df(), sp.spreadsheet_id, sheet_id, "first", True
+                        )
+                        for _ in range(3)
+                    ]
+                )
+                assert "sheets.values.batchUpdate" not in emulator.stats()["requests"]
+
+        asyncio.run(main())
+    assert emulator.stats()["requests"]["sheets.values.batchUpdate"] == 1
+
+
+def test_aiohttp_transport():
+    pytest.importorskip("aiohttp")
+    from aiohttp import web
+
+    class Credentials:
+        valid = True
+
+        def apply(self, headers):
+            headers["authorization"] = "Bearer token"
+
+    async def handler(request):
+        return web.json_response(
+            {
+                "method": request.method,
+                "authorization": request.headers["authorization"],
+                "body": await request.text(),
+            }
+        )
+
+    async def main():
+        app = web.Application()
+        app.router.add_route("*", "/v4/spreadsheets", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        transport = aio.AiohttpTransport(limit=2)
+        try:
+            resp, content = await transport.request(
+                f"http://127.0.0.1:{port}/v4/spreadsheets", "POST", '{"a": 1}'
+            )
+        finally:
+            await transport.close()
+            await runner.cleanup()
+        return resp, content
+
+    shared = creds.shared
+    creds.shared = Credentials()
+    try:
+        resp, content = asyncio.run(main())
+    finally:
+        creds.shared = shared
+    assert resp.status == 200
+    assert json.loads(content) == {
+        "method": "POST",
+        "authorization": "Bearer token",
+        "body": '{"a": 1}',
+    }
@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from gslides import Chart, Frame, Presentation, Series, Session, Spreadsheet, Table
+from gslides.budget import BudgetExceededError, budget, count_calls
+from gslides.emulator import emulate
+
+
+@pytest.fixture
+def deck():
+    df = pd.DataFrame(
+        {
+            "date": ["2021-01-01", "2021-01-02", "2021-01-03"],
+            "a": [1.0, 2.5, 3.0],
+            "b": [4, 5, 6],
+        }
+    )
+    with emulate(throttle=False):
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        frame = Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", overwrite_data=True
+        )
+        prs = Presentation.create("deck")
+        yield prs, frame
+
+
+def charts(frame, n):
+    return [Chart(frame, "date", [Series.line(["a", "b"])]) for _ in range(n)]
+
+
+def test_count_calls(deck):
+    prs, frame = deck
+    with count_calls() as counter:
+        for _ in range(3):
+            prs.add_slide(charts(frame, 4), layout=(2, 2), single_request=True)
+    report = counter.report()
+    assert report["sheets"] == {"calls": 12, "requests": 12, "retries": 0}
+    assert report["slides"]["calls"] == 3
+    assert report["slides"]["requests"] > 3
+    assert counter.total("calls") == 15
+
+
+def test_chart_slide(deck):
+    prs, frame = deck
+    with budget(calls=8, sheets=4, slides=4):
+        prs.add_slide(charts(frame, 4), layout=(2, 2))
+    with budget(calls=5, sheets=4, slides=1):
+        prs.add_slide(charts(frame, 4), layout=(2, 2), single_request=True)
+    with budget(calls=2, sheets=1, slides=1):
+        with Session():
+            prs.add_slide(charts(frame, 4), layout=(2, 2))
+
+
+def test_table_slide(deck):
+    prs, frame = deck
+    df = pd.DataFrame({"a": range(10), "b": range(10)})
+    with budget(calls=2, sheets=1, slides=1):
+        prs.add_slide(
+            [*charts(frame, 1), Table(df)], layout=(1, 2), single_request=True
+        )
+
+
+def test_exceeded(deck):
+    prs, frame = deck
+    with pytest.raises(BudgetExceededError, match="4 slides calls exceeds"):
+        with budget(slides=3):
+            prs.add_slide(charts(frame, 1), layout=(1, 1))
+
+
+@pytest.mark.parametrize("single_request", [False, True])
+def test_large_table_slide(deck, single_request):
+    prs, frame = deck
+    df = pd.DataFrame({"a": range(200), "b": range(200), "c": range(200)})
+    with count_calls() as counter:
+        prs.add_slide(
+            [Table(df), *charts(frame, 1)],
+            layout=(1, 2),
+            single_request=single_request,
+        )
+    report = counter.report()["slides"]
+    batches = -(-report["requests"] // 500)
+    assert batches > 1
+    assert report["calls"] == (batches + 3 if not single_request else batches)
+    assert len(prs.ch_ids) == 1
@@ -0,0 +1,93 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+import gslides.config as config
+
+
+class TestCreds:
+    def setup(self):
+        self.creds = config.Creds()
+
+    def test_uninitialized(self):
+        with pytest.raises(RuntimeError):
+            self.creds.sheet_service
+        with pytest.raises(RuntimeError):
+            self.creds.slide_service
+
+    def test_lazy_build(self, monkeypatch):
+        built = []
+
+        def mock_build(self, service_name, version):
+            built.append(service_name)
+            return service_name
+
+        monkeypatch.setattr("gslides.config.Creds.build_service", mock_build)
+        self.creds.set_credentials(Credentials(token="token"))
+        assert built == []
+        assert self.creds.slide_service == "slides"
+        assert self.creds.slide_service == "slides"
+        assert built == ["slides"]
+        assert self.creds.sheet_service == "sheets"
+        assert built == ["slides", "sheets"]
+        self.creds.set_credentials(Credentials(token="token"))
+        assert self.creds.sheet_service == "sheets"
+        assert built == ["slides", "sheets", "sheets"]
+
+    def test_build_service(self):
+        self.creds.set_credentials(Credentials(token="token"))
+        assert hasattr(self.creds.sheet_service, "spreadsheets")
+        assert hasattr(self.creds.slide_service, "presentations")
+
+    def test_thread_services(self):
+        self.creds.set_credentials(Credentials(token="token"))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            services = list(executor.map(lambda _: self.creds.sheet_service, range(4)))
+        assert len({id(service._http) for service in services}) == len(
+            {id(service) for service in services}
+        )
+        assert self.creds.sheet_service is self.creds.sheet_service
+        assert self.creds.sheet_service not in services
+        assert all(
+            service._http.credentials is self.creds.shared_credentials
+            for service in services
+        )
+
+
+class MockCredentials:
+    def __init__(self):
+        self.valid = False
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.valid = True
+
+    def apply(self, headers):
+        headers["authorization"] = "Bearer token"
+
+
+def test_shared_credentials_refresh():
+    credentials = MockCredentials()
+    shared = config.SharedCredentials(credentials)
+    barrier = threading.Barrier(8)
+
+    def before_request(_):
+        headers = {}
+        barrier.wait()
+        shared.before_request(None, "GET", "url", headers)
+        return headers
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        headers = list(executor.map(before_request, range(8)))
+    assert credentials.refreshes == 1
+    assert all(header == {"authorization": "Bearer token"} for header in headers)
+    assert shared.valid
+
+
+def test_discovery_document():
+    doc = config.discovery_document("sheets", "v4")
+    assert doc["name"] == "sheets"
+    assert config.discovery_document("sheets", "v4") is doc
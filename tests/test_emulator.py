@@ -0,0 +1,190 @@
+import threading
+
+import httplib2
+import pandas as pd
+import pytest
+from googleapiclient.errors import HttpError
+
+import gslides.scheduler as scheduler
+from gslides import Chart, Frame, Presentation, Series, Spreadsheet, Table, creds
+from gslides.emulator import Emulator, emulate
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "date": ["2021-01-01", "2021-01-02", "2021-01-03"],
+            "value": [1.0, 2.5, 3.0],
+        }
+    )
+
+
+class TestEmulator:
+    def setup(self):
+        self.object = Emulator(seed=0)
+        self.http = self.object()
+
+    def call(self, uri, method="GET", body=None):
+        import json
+
+        resp, content = self.http.request(
+            uri, method=method, body=json.dumps(body) if body else None
+        )
+        return resp.status, json.loads(content)
+
+    def test_values(self):
+        status, doc = self.call(
+            "https://sheets.googleapis.com/v4/spreadsheets",
+            "POST",
+            {"sheets": [{"properties": {"title": "first"}}]},
+        )
+        assert status == 200
+        sp_id = doc["spreadsheetId"]
+        assert doc["sheets"][0]["properties"]["sheetId"] == 0
+        base = f"https://sheets.googleapis.com/v4/spreadsheets/{sp_id}"
+        body = {
+            "valueInputOption": "RAW",
+            "data": [{"range": "first!B2:C3", "values": [["a", 1.0], ["b", None]]}],
+        }
+        status, output = self.call(f"{base}/values:batchUpdate", "POST", body)
+        assert output["totalUpdatedCells"] == 4
+        _, output = self.call(f"{base}/values/first%21A1%3AC3")
+        assert output["values"] == [[], ["", "a", "1"], ["", "b"]]
+        _, output = self.call(
+            f"{base}/values/first?valueRenderOption=UNFORMATTED_VALUE"
+        )
+        assert output["values"][1] == ["", "a", 1.0]
+        _, output = self.call(f"{base}/values/first%21E1%3AF2")
+        assert "values" not in output
+        status, output = self.call(f"{base}/values/other%21A1%3AB2")
+        assert status == 400
+
+    def test_atomic(self):
+        _, doc = self.call("https://sheets.googleapis.com/v4/spreadsheets", "POST", {})
+        uri = f"https://sheets.googleapis.com/v4/spreadsheets/{doc['spreadsheetId']}"
+        body = {
+            "requests": [
+                {"addSheet": {"properties": {"title": "new"}}},
+                {"deleteSheet": {"sheetId": 123}},
+            ]
+        }
+        status, output = self.call(f"{uri}:batchUpdate", "POST", body)
+        assert status == 400
+        assert output["error"]["status"] == "INVALID_ARGUMENT"
+        _, doc = self.call(uri)
+        assert len(doc["sheets"]) == 1
+
+    def test_not_found(self):
+        status, _ = self.call("https://slides.googleapis.com/v1/presentations/abc")
+        assert status == 404
+        assert self.object.stats()["errors"] == {404: 1}
+
+    def test_injection(self):
+        self.object = Emulator(quotas={"slides": {"write": 1}}, seed=0)
+        self.http = self.object()
+        uri = "https://slides.googleapis.com/v1/presentations"
+        assert self.call(uri, "POST", {"title": "a"})[0] == 200
+        assert self.call(uri, "POST", {"title": "b"})[0] == 429
+        self.object = Emulator(error_rate=1, seed=0)
+        self.http = self.object()
+        assert self.call(uri, "POST", {"title": "a"})[0] == 503
+
+
+def test_deck(df):
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        frame = Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", overwrite_data=True
+        )
+        chart = Chart(frame, "date", [Series.line(["value"])], title="Values")
+        prs = Presentation.create("deck")
+        prs.add_slide([chart, Table(df)], layout=(1, 2), title="{{ name }} deck")
+        prs.template({"name": "Weekly"})
+        prs.update_charts()
+        output = Presentation.get(prs.presentation_id)
+        got = Frame.get(sp.spreadsheet_id, sp.sheet_names["first"], "first", "A1", "B4")
+    assert creds.http_factory is None
+    assert output.sl_ids == prs.sl_ids
+    assert list(output.chart_ids.values()) == ["Values"]
+    assert got.df["value"].tolist() == ["1", "2.5", "3"]
+    doc = emulator.presentations[prs.presentation_id]
+    title = doc["slides"][0]["pageElements"][0]["shape"]["text"]
+    assert title["textElements"][0]["textRun"]["content"] == "Weekly deck"
+    assert emulator.stats()["requests"]["slides.presentations.get"] == 1
+
+
+def test_concurrent(df):
+    with emulate(throttle=False, latency=0.01) as emulator:
+        prs = Presentation.create("deck")
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        frame = Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", overwrite_data=True
+        )
+
+        def add_slide():
+            chart = Chart(frame, "date", [Series.line(["value"])])
+            prs.add_slide([chart], layout=(1, 1))
+
+        threads = [threading.Thread(target=add_slide) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    doc = emulator.presentations[prs.presentation_id]
+    assert len(doc["slides"]) == 8
+    sheet = emulator.spreadsheets[sp.spreadsheet_id]["sheets"][0]
+    assert len(sheet["charts"]) == 8
+
+
+def test_retries(monkeypatch):
+    sleeps = []
+    with emulate(quotas={"slides": {"write": 1}}) as emulator:
+        bucket = emulator.buckets[("slides", "write")]
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            bucket.tokens = bucket.capacity
+
+        monkeypatch.setattr(scheduler.time, "sleep", sleep)
+        Presentation.create("deck")
+    assert emulator.stats()["errors"] == {429: 1}
+    assert sleeps == [60]
+    with emulate(error_rate=1, seed=0):
+        monkeypatch.setattr(creds.scheduler, "max_retries", 0)
+        with pytest.raises(HttpError):
+            Presentation.create("deck")
+
+
+def test_write_retries(monkeypatch, df):
+    monkeypatch.setattr(scheduler.time, "sleep", lambda seconds: None)
+    with emulate() as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        sheet_id = sp.sheet_names["first"]
+        frame = Frame.create(df, sp.spreadsheet_id, sheet_id, "first", True)
+        request = emulator.request
+        failures = []
+
+        def fail_once(uri, method, body, applied):
+            if ":batchUpdate" in uri and not failures:
+                failures.append(uri)
+                if applied:
+                    request(uri, method, body)
+                return httplib2.Response({"status": "503"}), b"{}"
+            return request(uri, method, body)
+
+        monkeypatch.setattr(
+            emulator, "request", lambda *args: fail_once(*args, applied=False)
+        )
+        chart = Chart(frame, "date", [Series.line(["value"])])
+        chart.create()
+        failures.clear()
+        monkeypatch.setattr(
+            emulator, "request", lambda *args: fail_once(*args, applied=True)
+        )
+        with pytest.raises(HttpError) as error:
+            Chart(frame, "date", [Series.line(["value"])]).create()
+        charts = emulator.spreadsheets[sp.spreadsheet_id]["sheets"][0]["charts"]
+    assert error.value.resp.status == 400
+    assert len(charts) == 2
+    assert charts[0]["chartId"] == chart.ch_id
@@ -1,7 +1,19 @@
 import pandas as pd
 import pytest
 
-from gslides.frame import CreateFrame, Frame, GetFrame, format_type, get_sheet_data
+from gslides import Chart, Series, Spreadsheet
+from gslides.emulator import emulate
+from gslides.frame import (
+    CreateFrame,
+    Frame,
+    GetFrame,
+    _probe_ranges,
+    batch_get_sheet_data,
+    format_type,
+    get_sheet_data,
+    has_sheet_data,
+)
+from gslides.session import Session
 
 
 def test_df():
@@ -30,6 +42,9 @@ class MockService:
     def values(self, **kwargs):
         return self
 
+    def batchGet(self, **kwargs):
+        return self
+
     def execute(self, **kwargs):
         return self
 
@@ -47,6 +62,22 @@ def test_get_sheet_data(monkeypatch):
     assert get_sheet_data("abc123", "first", 0, 0, 2, 0) == [["test"], ["0"], ["1"]]
 
 
+def test_batch_get_sheet_data(monkeypatch):
+    def mock_service(self):
+        return MockService()
+
+    monkeypatch.setattr("gslides.config.Creds.sheet_service", property(mock_service))
+
+    def mock_return(self):
+        return {"valueRanges": [{"values": [["test"], ["0"]]}, {}]}
+
+    monkeypatch.setattr(MockService, "execute", mock_return)
+    ranges = ["first!A1:A2", "first!B1:B2"]
+    assert batch_get_sheet_data("abc123", ranges) == [[["test"], ["0"]], [[]]]
+    with pytest.raises(RuntimeError, match="Expected 3 value ranges, received 2"):
+        batch_get_sheet_data("abc123", ranges + ["first!C1:C2"])
+
+
 @pytest.mark.parametrize(
     "input,expected",
     [
@@ -83,6 +114,22 @@ class TestGetFrame:
         monkeypatch.setattr("gslides.frame.get_sheet_data", mock_data_return)
         assert self.object.execute() == True
 
+    def test_execute_lazy(self, monkeypatch):
+        ranges = []
+
+        def mock_data_return(spreadsheet_id, sheet_name, *indexes):
+            ranges.append(indexes)
+            rows = indexes[3] - indexes[1] + 1
+            return [["test", "other"], ["0", "1"], ["1", "2"]][:rows]
+
+        monkeypatch.setattr("gslides.frame.get_sheet_data", mock_data_return)
+        assert self.object.execute(lazy=True) == True
+        assert ranges == [(1, 1, 2, 1)]
+        assert self.object.df.columns.tolist() == ["test", "other"]
+        assert self.object.df.empty
+        assert self.object.load().shape == (2, 2)
+        assert ranges[1] == (1, 1, 2, 4)
+
 
 class TestCreateFrame:
     def setup(self):
@@ -142,6 +189,66 @@ class TestCreateFrame:
         assert self.object.execute() == True
 
 
+class TestCreateFrameChunks:
+    def setup(self):
+        self.object = CreateFrame(
+            df=test_df(),
+            spreadsheet_id="abc123",
+            sheet_name="first",
+            overwrite_data=True,
+            chunk_rows=2,
+        )
+
+    @pytest.mark.xfail(reason=ValueError)
+    def test_validate_chunk_rows(self):
+        self.object._validate_chunk_rows(0)
+
+    def test_render_update_chunks(self):
+        chunks = list(self.object.render_update_chunks())
+        assert [(start, end) for start, end, _ in chunks] == [(1, 3), (4, 4)]
+        assert [data["range"] for data in chunks[0][2]["data"]] == [
+            "first!A1:E1",
+            "first!A2:E3",
+        ]
+        assert chunks[1][2]["data"][0] == {
+            "range": "first!A4:E4",
+            "values": [["Stick", "7", "5", "12"]],
+        }
+        assert self.object.end_row_index == 5
+
+    def test_render_update_chunks_iterable(self):
+        df = test_df()
+        frame = CreateFrame(
+            df=(df.iloc[i : i + 1] for i in range(df.shape[0])),
+            spreadsheet_id="abc123",
+            sheet_name="first",
+            anchor_cell="B2",
+        )
+        assert list(frame.df.columns) == list(df.columns)
+        chunks = list(frame.render_update_chunks())
+        assert len(chunks) == 3
+        assert chunks[2][2]["data"][0]["range"] == "first!B5:F5"
+        assert frame.end_row_index == 6
+
+    def test_execute_parallel(self, monkeypatch):
+        bodies = []
+
+        class ChunkMockService(MockService):
+            def batchUpdate(self, **kwargs):
+                bodies.append(kwargs["body"])
+                return self
+
+        def mock_service(self):
+            return ChunkMockService()
+
+        monkeypatch.setattr(
+            "gslides.config.Creds.sheet_service", property(mock_service)
+        )
+        self.object.workers = 2
+        assert self.object.execute() == True
+        assert len(bodies) == 2
+
+
 class TestFrame:
     def setup(self):
         self.object = Frame(
@@ -178,7 +285,7 @@ class TestFrame:
         )
 
     def test_get(self, monkeypatch):
-        def mock_return(self):
+        def mock_return(self, lazy=False):
             return True
 
         monkeypatch.setattr(GetFrame, "execute", mock_return)
@@ -206,10 +313,225 @@ class TestFrame:
     def test_render_format_frame(self):
         assert (
             self.object.render_format_frame({"Blue": "CURRENCY"})["requests"][0][
-                "updateCells"
-            ]["rows"][0]["values"][0]["userEnteredFormat"]["numberFormat"]["pattern"]
+                "repeatCell"
+            ]["cell"]["userEnteredFormat"]["numberFormat"]["pattern"]
             == "$0.00"
         )
 
+    def test_render_format_frame_ranges(self):
+        requests = self.object.render_format_frame(
+            {"Grand Total": "0.0", "Blue": "0.0", "Red": "0.0", "Object": "TEXT"}
+        )["requests"]
+        assert [
+            (
+                req["repeatCell"]["range"]["startColumnIndex"],
+                req["repeatCell"]["range"]["endColumnIndex"],
+            )
+            for req in requests
+        ] == [(0, 1), (1, 4)]
+        assert requests[1]["repeatCell"]["range"]["endRowIndex"] == 5
+
     def test_data(self):
         assert self.object.data == self.object
+
+
+def test_get_lazy():
+    df = pd.DataFrame({"date": ["2021-01-01", "2021-01-02"], "value": [1, 2]})
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        Frame.create(df, sp.spreadsheet_id, sp.sheet_names["first"], "first", True)
+        emulator.reset_stats()
+        frame = Frame.get(
+            sp.spreadsheet_id, sp.sheet_names["first"], "first", "A1", "B3", lazy=True
+        )
+        chart = Chart(frame, "date", [Series.line(["value"])])
+        output = chart.render_basic_chart_json((600, 371))
+        assert emulator.stats()["requests"] == {"sheets.values.get": 1}
+        assert frame.columns == ["date", "value"]
+        assert frame.df["value"].tolist() == ["1", "2"]
+        assert frame.df.shape == (2, 2)
+    assert emulator.stats()["requests"] == {"sheets.values.get": 2}
+    series = output["chart"]["spec"]["basicChart"]["series"]
+    assert series[0]["series"]["sourceRange"]["sources"][0]["startColumnIndex"] == 1
+
+
+def test_has_sheet_data():
+    df = pd.DataFrame({"date": ["2021-01-01", "2021-01-02"], "value": [1, 2]})
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        emulator.reset_stats()
+        assert has_sheet_data(sp.spreadsheet_id, ["first!A1:Z1000"]) == [False]
+        assert emulator.stats()["requests"]["sheets.values.batchGet"] == 4
+        frame = Frame.create(df, sp.spreadsheet_id, sp.sheet_names["first"], "first")
+        assert frame.df.equals(df)
+        assert has_sheet_data(
+            sp.spreadsheet_id, ["first!B3:B3", "first!C1:Z1000", "first!A4:B5"]
+        ) == [True, False, False]
+        with pytest.raises(RuntimeError):
+            Frame.create(df, sp.spreadsheet_id, sp.sheet_names["first"], "first")
+        Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", False, "D1"
+        )
+        assert emulator.stats()["requests"]["sheets.values.batchGet"] == 11
+        Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", True, "G150"
+        )
+        emulator.reset_stats()
+        assert has_sheet_data(sp.spreadsheet_id, ["first!G1:H100000"]) == [True]
+        assert emulator.stats()["requests"]["sheets.values.batchGet"] == 2
+
+
+@pytest.mark.parametrize(
+    "rng,blocks",
+    [
+        ("first!A1:B1", ["first!A1:B1"]),
+        ("first!C5:D104", ["first!C5:D104"]),
+        ("'a!b'!A1:B350", ["'a!b'!A1:B100", "'a!b'!A101:B300", "'a!b'!A301:B350"]),
+    ],
+)
+def test_probe_ranges(rng, blocks):
+    assert list(_probe_ranges(rng)) == blocks
+
+
+def test_probe_ranges_max(monkeypatch):
+    monkeypatch.setattr("gslides.frame.MAX_PROBE_ROWS", 250)
+    assert list(_probe_ranges("first!A1:A1000")) == [
+        "first!A1:A100",
+        "first!A101:A300",
+        "first!A301:A550",
+        "first!A551:A800",
+        "first!A801:A1000",
+    ]
+
+
+def test_update():
+    df = pd.DataFrame({"x": range(10), "y": [f"v{i}" for i in range(10)]})
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        frame = Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", True, "B2"
+        )
+        new_df = df.copy()
+        new_df.loc[[3, 4, 8], "y"] = ["a", "b", None]
+        emulator.reset_stats()
+        assert frame.update(new_df) == ["first!B6:C7", "first!B11:C11"]
+        assert emulator.stats()["requests"] == {"sheets.values.batchUpdate": 1}
+        assert frame.update(new_df) == []
+        assert emulator.stats()["requests"] == {"sheets.values.batchUpdate": 1}
+        assert frame.update(new_df.iloc[:7]) == ["first!B10:C12"]
+        assert frame.end_row_index == 10
+        output = Frame.get(sp.spreadsheet_id, 0, "first", "B2", "C12")
+        assert output.df["y"].tolist() == ["v0", "v1", "v2", "a", "b", "v5", "v6"]
+        assert frame.update(new_df.iloc[:2, :1]) == ["first!B2:C2", "first!B3:C9"]
+        output = Frame.get(sp.spreadsheet_id, 0, "first", "B2", "C12")
+        assert output.df.to_dict("list") == {"x": ["0", "1"]}
+
+
+def test_update_lazy():
+    df = pd.DataFrame({"x": [1, 2, 3], "y": ["a", "b", "c"]})
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        Frame.create(df, sp.spreadsheet_id, sp.sheet_names["first"], "first", True)
+        frame = Frame.get(sp.spreadsheet_id, 0, "first", "A1", "B4", lazy=True)
+        new_df = df.copy()
+        new_df.loc[1, "x"] = 5
+        emulator.reset_stats()
+        assert frame.update(new_df) == ["first!A3:B3"]
+        assert emulator.stats()["requests"] == {
+            "sheets.values.get": 1,
+            "sheets.values.batchUpdate": 1,
+        }
+
+
+def test_update_got_numbers():
+    df = pd.DataFrame(
+        {"x": [1.0, 2.5, 3.0], "y": [1000, None, 3], "z": ["a", "b", None]}
+    )
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["s"])
+        Frame.create(df, sp.spreadsheet_id, sp.sheet_names["s"], "s", True)
+        frame = Frame.get(sp.spreadsheet_id, sp.sheet_names["s"], "s", "A1", "C4")
+        emulator.reset_stats()
+        assert frame.update(df) == []
+        assert emulator.stats()["requests"] == {"sheets.values.get": 1}
+        new_df = df.copy()
+        new_df.loc[1, "x"] = 2.0
+        assert frame.update(new_df) == ["s!A3:C3"]
+
+
+def test_update_session():
+    df = pd.DataFrame({"x": [1, 2, 3], "y": ["a", "b", "c"]})
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        frame = Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", True
+        )
+        new_df = df.copy()
+        new_df.loc[1, "x"] = 5
+        with pytest.raises(Exception):
+            with Session():
+                assert frame.update(new_df) == ["first!A3:B3"]
+                assert frame.df is df
+                emulator.error_rate = 1.0
+        emulator.error_rate = 0.0
+        assert frame.df is df
+        assert frame.update(new_df) == ["first!A3:B3"]
+        with Session():
+            assert frame.update(df) == ["first!A3:B3"]
+            assert frame.df is new_df
+        assert frame.df is df
+
+
+def test_update_session_twice():
+    df = pd.DataFrame({"x": [1, 2, 3]})
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        frame = Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", True
+        )
+        first_df = pd.DataFrame({"x": [1, 20, 3]})
+        second_df = pd.DataFrame({"x": [1, 2, 30]})
+        emulator.reset_stats()
+        with Session():
+            assert frame.update(first_df) == ["first!A3:A3"]
+            assert frame.update(second_df) == ["first!A3:A4"]
+            assert frame.update(second_df) == []
+            assert frame.df is df
+        assert emulator.stats()["requests"] == {"sheets.values.batchUpdate": 1}
+        assert frame.df is second_df
+        output = Frame.get(sp.spreadsheet_id, 0, "first", "A1", "A4")
+        assert output.df["x"].tolist() == ["1", "2", "30"]
+        assert frame.update(second_df) == []
+
+
+def test_create_iterable_overwrite():
+    df = pd.DataFrame({"x": range(6), "y": [f"v{i}" for i in range(6)]})
+    chunks = [df.iloc[:2], df.iloc[2:4], df.iloc[4:]]
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        sheet_id = sp.sheet_names["first"]
+        Frame.create(df.iloc[:1], sp.spreadsheet_id, sheet_id, "first", True, "A20")
+        emulator.reset_stats()
+        frame = Frame.create(iter(chunks), sp.spreadsheet_id, sheet_id, "first")
+        assert emulator.stats()["requests"] == {
+            "sheets.values.batchGet": 3,
+            "sheets.values.batchUpdate": 3,
+        }
+        output = Frame.get(sp.spreadsheet_id, sheet_id, "first", "A1", "B7")
+        assert output.df["y"].tolist() == df["y"].tolist()
+        Frame.create(df.iloc[:1], sp.spreadsheet_id, sheet_id, "first", True, "C5")
+        emulator.reset_stats()
+        with pytest.raises(RuntimeError):
+            Frame.create(
+                iter(chunks), sp.spreadsheet_id, sheet_id, "first", False, "C1"
+            )
+        assert emulator.stats()["requests"] == {
+            "sheets.values.batchGet": 2,
+            "sheets.values.batchUpdate": 1,
+        }
+        frame = Frame.create(
+            iter(chunks), sp.spreadsheet_id, sheet_id, "first", False, "E1"
+        )
+        assert frame.end_row_index == 8
+        output = Frame.get(sp.spreadsheet_id, sheet_id, "first", "E1", "F7")
+        assert output.df["y"].tolist() == df["y"].tolist()
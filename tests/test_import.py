@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["pandas", "numpy", "yaml", "IPython", "googleapiclient", "requests"]
+
+
+def imported_modules(statement):
+    code = (
+        f"import sys, json\n{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    return json.loads(output.stdout)
+
+
+def test_import_package():
+    assert imported_modules("import gslides") == []
+
+
+def test_initialize_credentials():
+    statement = "import gslides\ngslides.initialize_credentials(None)"
+    assert imported_modules(statement) == []
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from gslides import Presentation",
+        "from gslides import Frame, Chart, Table",
+    ],
+)
+def test_import_classes(statement):
+    modules = imported_modules(statement)
+    assert "IPython" not in modules
+    assert "requests" not in modules
+    assert "yaml" not in modules
+
+
+def test_lazy_attributes():
+    import gslides
+    from gslides.chart import Chart
+
+    assert gslides.Chart is Chart
+    assert "line_style" in gslides.CHART_PARAMS
+    assert "Presentation" in dir(gslides)
+    with pytest.raises(AttributeError):
+        gslides.DoesNotExist
@@ -0,0 +1,131 @@
+import logging
+
+import pandas as pd
+import pytest
+
+import gslides.instrumentation as instrumentation
+import gslides.scheduler as scheduler
+from gslides import Chart, Frame, Presentation, Series, Spreadsheet
+from gslides.emulator import emulate
+from gslides.instrumentation import (
+    CallEvent,
+    add_callback,
+    current_operation,
+    instrumented,
+    log_request,
+    operation,
+    remove_callback,
+)
+
+
+@pytest.fixture
+def events():
+    events = []
+    add_callback(events.append)
+    yield events
+    remove_callback(events.append)
+
+
+class Example:
+    @instrumented
+    def outer(self):
+        return current_operation(), self.inner()
+
+    @instrumented
+    def inner(self):
+        return current_operation()
+
+
+def test_operation():
+    assert current_operation() is None
+    assert Example().outer() == ("Example.outer", "Example.inner")
+    with operation("custom"):
+        assert current_operation() == "custom"
+    assert current_operation() is None
+
+
+def test_log_request(caplog):
+    class Body:
+        def __repr__(self):
+            raise AssertionError("Body formatted")
+
+    with caplog.at_level(logging.INFO):
+        log_request(logging.getLogger("gslides"), Body())
+    with caplog.at_level(logging.DEBUG):
+        log_request(logging.getLogger("gslides"), {"requests": []})
+    assert caplog.messages == ["Request: {'requests': []}"]
+
+
+def test_events(events):
+    df = pd.DataFrame({"date": ["2021-01-01", "2021-01-02"], "value": [1, 2]})
+    with emulate(throttle=False):
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        frame = Frame.create(
+            df, sp.spreadsheet_id, sp.sheet_names["first"], "first", overwrite_data=True
+        )
+        chart = Chart(frame, "date", [Series.line(["value"])])
+        prs = Presentation.create("deck")
+        prs.add_slide([chart], layout=(1, 1))
+    assert all(isinstance(event, CallEvent) for event in events)
+    operations = [event.operation for event in events]
+    assert operations[:2] == ["CreateSpreadsheet.execute", "CreateFrame.execute"]
+    assert "Chart.create" in operations
+    assert "AddSlide._execute_create_slide" in operations
+    assert operations[-1] == "AddSlide._execute_populate_objects"
+    event = events[-1]
+    assert event.method == "POST"
+    assert event.document_id == prs.presentation_id
+    assert event.status == 200
+    assert event.requests == 1
+    assert event.request_bytes > 0
+    assert event.response_bytes > 0
+    assert event.latency >= 0
+    assert event.retries == 0
+
+
+def test_retries(events, monkeypatch):
+    monkeypatch.setattr(scheduler.time, "sleep", lambda seconds: None)
+    with emulate() as emulator:
+        prs = Presentation.create("deck")
+        del events[:]
+        emulator.error_rate = 1
+        emulator.random.random = iter([0, 1]).__next__
+        Presentation.get(prs.presentation_id)
+    assert [(event.method, event.retries) for event in events] == [("GET", 1)]
+    assert events[0].operation == "Presentation.get"
+
+
+def test_request_count(events):
+    df = pd.DataFrame({"date": ["2021-01-01", "2021-01-02"], "value": [1, 2]})
+    with emulate(throttle=False):
+        sp = Spreadsheet.create(title="data", sheet_names=["first"])
+        Frame.create(df, sp.spreadsheet_id, sp.sheet_names["first"], "first", True)
+        Frame.get(sp.spreadsheet_id, sp.sheet_names["first"], "first", "A1", "B3")
+    assert [(event.method, event.requests) for event in events] == [
+        ("POST", 1),
+        ("POST", 2),
+        ("GET", 0),
+    ]
+
+
+def test_request_count_stale_log(events):
+    with emulate(throttle=False):
+        log_request(logging.getLogger(__name__), {"requests": [{}, {}, {}]})
+        Presentation.create(name="test")
+    assert {event.requests for event in events} == {1}
+
+
+@pytest.mark.parametrize(
+    "body,count",
+    [
+        (None, 0),
+        ('{"requests": []}', 0),
+        ('{"requests": [{"a": [1, 2]}, {"b": {"c": "x,]}"}}]}', 2),
+        ('{"valueInputOption": "RAW", "data": [{"values": [["a", "b"]]}]}', 1),
+        ('{"title": "[1, 2]", "data": [{"v": "\\"],"}, {}, {}]}', 3),
+        ('{"properties": {"title": "x"}}', 1),
+        ("ranges=a&ranges=b", 1),
+    ],
+)
+def test_count_requests(body, count):
+    assert instrumentation._count_requests(body) == count
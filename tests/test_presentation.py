@@ -1,7 +1,13 @@
+import time
+
 import numpy as np
+import pandas as pd
 import pytest
 
+from gslides.chart import Chart, Series
+from gslides.frame import Frame
 from gslides.presentation import AddSlide, Layout, Presentation
+from gslides.table import Table
 
 
 class MockService:
@@ -206,6 +212,135 @@ class TestAddSlide:
         assert True
 
 
+def test_df():
+    data = [
+        ["Object", "Blue", "Red", "Grand Total"],
+        ["Ball", "6", "1", "7"],
+        ["Cube", "6", "4", "10"],
+        ["Stick", "7", "5", "12"],
+    ]
+    return pd.DataFrame(columns=data[0], data=data[1:])
+
+
+def test_chart():
+    frame = Frame(
+        df=test_df(),
+        spreadsheet_id="zyxw",
+        sheet_id=1234,
+        sheet_name="first",
+        start_column_index=1,
+        start_row_index=1,
+        end_column_index=5,
+        end_row_index=5,
+        initialized=True,
+    )
+    ch = Chart(frame, "Object", [Series.column()], title="pytest")
+    ch.ch_id = 1234
+    ch.executed = True
+    return ch
+
+
+class TestAddSlideSingleRequest:
+    def setup(self):
+        self.object = AddSlide(
+            presentation_id="abcd",
+            objects=[test_chart(), Table(data=test_df()), test_chart()],
+            layout=(1, 3),
+            single_request=True,
+        )
+        self.object._assign_object_ids()
+        self.object.sl_id = "slide_1111"
+        self.object.title_bx_id = "title_2222"
+        self.object.notes_bx_id = "notes_3333"
+
+    def test_render_json_populate_objects(self):
+        json, charts = self.object.render_json_populate_objects()
+        assert list(charts.keys())[0] == 0
+        assert (
+            json["requests"][0]["createSheetsChart"]["objectId"]
+            == self.object.obj_ids[0]
+        )
+        tbl_id = json["requests"][1]["createTable"]["objectId"]
+        assert tbl_id == self.object.obj_ids[1]
+        assert json["requests"][2]["updatePageElementTransform"]["objectId"] == tbl_id
+        assert "createSheetsChart" in json["requests"][list(charts.keys())[1]]
+
+    def test_render_json_single_request(self):
+        json, charts = self.object.render_json_single_request()
+        assert json["requests"][0]["createSlide"]["objectId"] == "slide_1111"
+        assert json["requests"][1]["createShape"]["objectId"] == "title_2222"
+        assert json["requests"][2]["createShape"]["objectId"] == "notes_3333"
+        assert len(charts) == 2
+        for index in charts.keys():
+            assert "createSheetsChart" in json["requests"][index]
+
+    def test_execute_populate_objects(self, monkeypatch):
+        calls = []
+
+        class PopulateMockService(MockService):
+            def batchUpdate(self, **kwargs):
+                calls.append(kwargs["body"])
+                return self
+
+            def execute(self, **kwargs):
+                replies = []
+                for cnt, req in enumerate(calls[-1]["requests"]):
+                    if "createSheetsChart" in req:
+                        replies.append({"createSheetsChart": {"objectId": cnt}})
+                    else:
+                        replies.append({})
+                return {"replies": replies}
+
+        def mock_service(self):
+            return PopulateMockService()
+
+        monkeypatch.setattr(
+            "gslides.config.Creds.slide_service", property(mock_service)
+        )
+        self.object.single_request = False
+        self.object.obj_ids = []
+        self.object._execute_populate_objects()
+        assert len(calls) == 1
+        chart_requests = [
+            req for req in calls[0]["requests"] if "createSheetsChart" in req
+        ]
+        assert len(chart_requests) == 2
+        assert list(self.object.ch_ids.keys()) == [
+            cnt
+            for cnt, req in enumerate(calls[0]["requests"])
+            if "createSheetsChart" in req
+        ]
+
+    def test_execute_single_request(self, monkeypatch):
+        calls = []
+
+        class SingleMockService(MockService):
+            def batchUpdate(self, **kwargs):
+                calls.append(kwargs["body"])
+                return self
+
+            def execute(self, **kwargs):
+                replies = []
+                for req in calls[-1]["requests"]:
+                    if "createSheetsChart" in req:
+                        replies.append({"createSheetsChart": req["createSheetsChart"]})
+                    else:
+                        replies.append({})
+                return {"replies": replies}
+
+        def mock_service(self):
+            return SingleMockService()
+
+        monkeypatch.setattr(
+            "gslides.config.Creds.slide_service", property(mock_service)
+        )
+        self.object.sheet_executed = True
+        self.object.execute_slide()
+        assert len(calls) == 1
+        assert self.object.sl_id.startswith("slide_")
+        assert list(self.object.ch_ids.values()) == ["pytest", "pytest"]
+
+
 class TestPresentation:
     def setup(self):
         self.object = Presentation(
@@ -263,6 +398,48 @@ class TestPresentation:
         self.object.add_slide(objects=[], layout=(1, 1))
         assert self.object.sl_ids[-1] == 4444
 
+    def test_add_slides(self, monkeypatch):
+        executed = []
+
+        def mock_execute_sheet(self):
+            time.sleep(0.01 * (3 - len(self.title)))
+            executed.append(("sheet", self.title))
+            self.sheet_executed = True
+
+        def mock_execute_slide(self):
+            executed.append(("slide", self.title))
+            self.sl_id = self.title
+            self.ch_ids = {f"chart_{self.title}": self.title}
+
+        monkeypatch.setattr(AddSlide, "execute_sheet", mock_execute_sheet)
+        monkeypatch.setattr(AddSlide, "execute_slide", mock_execute_slide)
+        slides = [
+            {"objects": [], "layout": (1, 1), "title": "a"},
+            {"objects": [], "layout": (1, 1), "title": "bb", "insertion_index": 0},
+            {"objects": [], "layout": (1, 1), "title": "ccc"},
+        ]
+        self.object.add_slides(slides, workers=3)
+        assert executed[0] == ("sheet", "ccc")
+        assert [title for stage, title in executed if stage == "slide"] == [
+            "a",
+            "bb",
+            "ccc",
+        ]
+        assert self.object.sl_ids == ["bb", 1111, 2222, 3333, "a", "ccc"]
+        assert list(self.object.ch_ids.values()) == ["Test Chart", "a", "bb", "ccc"]
+
+    def test_add_slides_sequential(self, monkeypatch):
+        def mock_return(self):
+            return (self.title, {})
+
+        monkeypatch.setattr(AddSlide, "execute", mock_return)
+        self.object.add_slides(
+            [{"objects": [], "layout": (1, 1), "title": str(i)} for i in range(3)]
+        )
+        assert self.object.sl_ids[-3:] == ["0", "1", "2"]
+        with pytest.raises(ValueError):
+            self.object.add_slides([], workers=0)
+
     def test_rm_slide(self, monkeypatch):
         def mock_service(self):
             return MockService()
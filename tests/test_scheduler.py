@@ -0,0 +1,231 @@
+import subprocess
+import sys
+
+import httplib2
+import pytest
+from google.oauth2.credentials import Credentials
+
+import gslides.config as config
+import gslides.scheduler as scheduler
+from gslides.scheduler import (
+    ScheduledHttp,
+    Scheduler,
+    SQLiteBucketFactory,
+    SQLiteTokenBucket,
+    TokenBucket,
+    replay_safe,
+)
+
+
+class MockHttp:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.uris = []
+        self.timeout = 30
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        self.uris.append((method, uri))
+        status = self.statuses.pop(0)
+        if isinstance(status, Exception):
+            raise status
+        headers = {"status": str(status)}
+        if status == 429:
+            headers["retry-after"] = "7"
+        return httplib2.Response(headers), b'{"spreadsheetId": "abc123"}'
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(scheduler.time, "sleep", sleeps.append)
+    return sleeps
+
+
+class TestTokenBucket:
+    def test_acquire(self):
+        bucket = TokenBucket(rate=100, capacity=2)
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        assert bucket.try_acquire() > 0
+        assert bucket.acquire() > 0
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+
+
+class TestSQLiteTokenBucket:
+    def test_shared_state(self, tmp_path):
+        path = str(tmp_path / "buckets.db")
+        first = SQLiteTokenBucket(path, "sheets.write.user", rate=0.01, capacity=3)
+        second = SQLiteTokenBucket(path, "sheets.write.user", rate=0.01, capacity=3)
+        other = SQLiteTokenBucket(path, "slides.write.user", rate=0.01, capacity=1)
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == 0
+        assert first.try_acquire() == 0
+        assert second.try_acquire() > 0
+        assert other.try_acquire() == 0
+
+    def test_processes(self, tmp_path):
+        path = str(tmp_path / "buckets.db")
+        code = (
+            "from gslides.scheduler import SQLiteTokenBucket\n"
+            f"bucket = SQLiteTokenBucket({path!r}, 'bucket', rate=0.01, capacity=4)\n"
+            "print(sum(bucket.try_acquire() == 0 for _ in range(3)))"
+        )
+        processes = [
+            subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE)
+            for _ in range(2)
+        ]
+        acquired = [int(process.communicate()[0]) for process in processes]
+        assert sum(acquired) == 4
+
+    def test_scheduler(self, tmp_path):
+        factory = SQLiteBucketFactory(str(tmp_path / "buckets.db"))
+        self.object = Scheduler(bucket_factory=factory)
+        bucket = self.object.buckets[("sheets", "read")][0]
+        assert isinstance(bucket, SQLiteTokenBucket)
+        assert bucket.name == "sheets.read.user"
+        self.object.throttle("sheets", "read")
+        assert self.object.stats()["requests"] == {"sheets.read": 1}
+
+
+class TestScheduler:
+    def setup(self):
+        self.object = Scheduler(backoff=0.5)
+
+    def test_buckets(self):
+        assert len(self.object.buckets[("sheets", "write")]) == 2
+        bucket = self.object.buckets[("slides", "write")][0]
+        assert bucket.capacity == 60
+        assert bucket.rate == 1
+
+    def test_classify(self):
+        assert self.object.classify(
+            "https://sheets.googleapis.com/v4/spreadsheets/abc", "GET"
+        ) == ("sheets", "read")
+        assert self.object.classify(
+            "https://slides.googleapis.com/v1/presentations/abc:batchUpdate", "POST"
+        ) == ("slides", "write")
+
+    def test_retry(self, sleeps):
+        http = MockHttp([503, 429, 200])
+        resp, _ = self.object.execute("sheets", "GET", lambda: http.request("sheets"))
+        assert resp.status == 200
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 0.5
+        assert sleeps[1] == 7
+        stats = self.object.stats()
+        assert stats["retries"] == 2
+        assert stats["requests"] == {"sheets.read": 3}
+
+    def test_retry_not_idempotent(self, sleeps):
+        http = MockHttp([429, 200, 503, ConnectionError()])
+        resp, _ = self.object.execute("sheets", "POST", lambda: http.request("sheets"))
+        assert resp.status == 200
+        resp, _ = self.object.execute("sheets", "POST", lambda: http.request("sheets"))
+        assert resp.status == 503
+        with pytest.raises(ConnectionError):
+            self.object.execute("sheets", "POST", lambda: http.request("sheets"))
+        assert sleeps == [7]
+        assert self.object.stats()["retries"] == 1
+
+    def test_retry_policy(self, sleeps):
+        self.object.retry_policy = lambda uri, method, body: body == "retry"
+        http = MockHttp([503, 200, 503])
+        call = lambda: http.request("sheets")  # noqa
+        resp, _ = self.object.execute("sheets", "POST", call, "retry")
+        assert resp.status == 200
+        resp, _ = self.object.execute("sheets", "POST", call, "other")
+        assert resp.status == 503
+        assert len(sleeps) == 1
+
+    def test_retry_exhausted(self, sleeps):
+        self.object.max_retries = 2
+        http = MockHttp([503, 503, 503])
+        resp, _ = self.object.execute("sheets", "GET", lambda: http.request("sheets"))
+        assert resp.status == 503
+        assert len(sleeps) == 2
+
+    def test_connection_error(self, sleeps):
+        self.object.max_retries = 1
+        http = MockHttp([ConnectionError(), ConnectionError()])
+        with pytest.raises(ConnectionError):
+            self.object.execute("sheets", "GET", lambda: http.request("sheets"))
+        assert len(sleeps) == 1
+
+    def test_backoff_time(self):
+        assert self.object.backoff_time(0, "3") == 3
+        assert 0 <= self.object.backoff_time(10) <= self.object.max_backoff
+
+    def test_throttle(self, sleeps):
+        quotas = {"sheets": {"read": {"user": 1}}}
+        self.object = Scheduler(quotas=quotas)
+        self.object.buckets[("sheets", "read")][0].rate = 1000
+        self.object.throttle("sheets", "read")
+        self.object.throttle("sheets", "read")
+        assert len(sleeps) >= 1
+        assert self.object.stats()["throttled_seconds"] > 0
+
+
+def test_scheduled_service(sleeps):
+    creds = config.Creds()
+    creds.set_credentials(Credentials(token="token"))
+    assert creds.scheduler is None
+    assert not isinstance(creds.sheet_service._http.http, ScheduledHttp)
+    creds.set_scheduler(Scheduler())
+    service = creds.sheet_service
+    scheduled = service._http.http
+    assert isinstance(scheduled, ScheduledHttp)
+    http = MockHttp([503, 200])
+    scheduled.http = http
+    output = service.spreadsheets().get(spreadsheetId="abc123").execute()
+    assert output == {"spreadsheetId": "abc123"}
+    assert len(http.uris) == 2
+    assert scheduled.retries == 1
+    assert service._http.timeout == 30
+    creds.set_scheduler(None)
+    assert not isinstance(creds.sheet_service._http.http, ScheduledHttp)
+
+
+SHEETS = "https://sheets.googleapis.com/v4/spreadsheets/abc123"
+SLIDES = "https://slides.googleapis.com/v1/presentations/abc123"
+
+
+@pytest.mark.parametrize(
+    "uri,method,body,expected",
+    [
+        (f"{SHEETS}/values/A1:B2", "GET", None, True),
+        (f"{SHEETS}/values:batchUpdate?alt=json", "POST", "{}", True),
+        ("https://sheets.googleapis.com/v4/spreadsheets", "POST", "{}", False),
+        (f"{SHEETS}:batchUpdate", "POST", '{"requests": [{"repeatCell": {}}]}', True),
+        (
+            f"{SHEETS}:batchUpdate",
+            "POST",
+            '{"requests": [{"addChart": {"chart": {"spec": {}}}}]}',
+            False,
+        ),
+        (
+            f"{SHEETS}:batchUpdate",
+            "POST",
+            '{"requests": [{"addChart": {"chart": {"chartId": 12}}}]}',
+            True,
+        ),
+        (
+            f"{SLIDES}:batchUpdate",
+            "POST",
+            '{"requests": [{"createSlide": {"objectId": "s"}}, {"insertText": {}}]}',
+            True,
+        ),
+        (f"{SLIDES}:batchUpdate", "POST", '{"requests": [{"insertText": {}}]}', False),
+        (
+            f"{SLIDES}:batchUpdate",
+            "POST",
+            '{"requests": [{"deleteObject": {}}, {"createSlide": {}}]}',
+            True,
+        ),
+        (f"{SLIDES}:batchUpdate", "POST", "not json", False),
+    ],
+)
+def test_replay_safe(uri, method, body, expected):
+    assert replay_safe(uri, method, body) is expected
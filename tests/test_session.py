@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from gslides.chart import Chart, Series
+from gslides.frame import Frame
+from gslides.presentation import Presentation
+from gslides.session import Session, current_session
+from gslides.table import Table
+
+
+def test_df():
+    data = [
+        ["Object", "Blue", "Red", "Grand Total"],
+        ["Ball", "6", "1", "7"],
+        ["Cube", "6", "4", "10"],
+        ["Stick", "7", "5", "12"],
+    ]
+    return pd.DataFrame(columns=data[0], data=data[1:])
+
+
+class MockService:
+    def __init__(self, calls):
+        self.calls = calls
+        self.method = None
+        self.body = None
+
+    def spreadsheets(self, **kwargs):
+        self.method = "spreadsheets"
+        return self
+
+    def presentations(self, **kwargs):
+        self.method = "presentations"
+        return self
+
+    def values(self, **kwargs):
+        self.method = "values"
+        return self
+
+    def batchUpdate(self, **kwargs):
+        self.body = kwargs["body"]
+        return self
+
+    def execute(self, **kwargs):
+        self.calls.append((self.method, self.body))
+        if self.method == "values":
+            return {"responses": [{} for _ in self.body["data"]]}
+        replies = []
+        for cnt, req in enumerate(self.body["requests"]):
+            if "addChart" in req:
+                replies.append({"addChart": {"chart": {"chartId": cnt}}})
+            else:
+                replies.append({})
+        return {"replies": replies}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def mock_service(self):
+        return MockService(calls)
+
+    monkeypatch.setattr("gslides.config.Creds.sheet_service", property(mock_service))
+    monkeypatch.setattr("gslides.config.Creds.slide_service", property(mock_service))
+    return calls
+
+
+def test_current_session():
+    assert current_session() is None
+    with Session() as session:
+        assert current_session() is session
+    assert current_session() is None
+
+
+def test_current_session_thread():
+    with Session():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(current_session).result() is None
+
+
+def test_session_coalesces(calls):
+    prs = Presentation(
+        name="test", pr_id="abcd", sl_ids=[], ch_ids={}, initialized=True
+    )
+    with Session():
+        frames = [
+            Frame.create(
+                test_df(),
+                "abc123",
+                1234,
+                "first",
+                overwrite_data=True,
+                anchor_cell=cell,
+            )
+            for cell in ["A1", "G1"]
+        ]
+        charts = [
+            Chart(
+                frame, "Object", [Series.column()], title="pytest", y_axis_format="0.0"
+            )
+            for frame in frames
+        ]
+        prs.add_slide(charts + [Table(test_df())], layout=(1, 3))
+        prs.template({"old": "new"})
+        assert calls == []
+        assert charts[0].executed is False
+    assert [method for method, body in calls] == [
+        "values",
+        "spreadsheets",
+        "presentations",
+    ]
+    assert len(calls[0][1]["data"]) == 4
+    assert [chart.ch_id for chart in charts] == [1, 3]
+    assert len(prs.sl_ids) == 1
+    assert len(prs.ch_ids) == 2
+    chart_requests = [
+        req for req in calls[2][1]["requests"] if "createSheetsChart" in req
+    ]
+    assert [req["createSheetsChart"]["chartId"] for req in chart_requests] == [1, 3]
+    assert "replaceAllText" in calls[2][1]["requests"][-1]
+
+
+def test_session_discards_on_exception(calls):
+    with pytest.raises(ValueError):
+        with Session():
+            Frame.create(test_df(), "abc123", 1234, "first", overwrite_data=True)
+            raise ValueError
+    assert calls == []
@@ -0,0 +1,103 @@
+import pytest
+
+from gslides.session import Session
+from gslides.splitter import encoded_size, split_requests, split_values
+
+
+def test_split_requests():
+    requests = [{"createTable": {"objectId": "table"}}] + [
+        {"updateTextStyle": {"objectId": "table", "text": "x" * 100}} for _ in range(10)
+    ]
+    assert split_requests(requests) == [requests]
+    batches = split_requests(requests, max_requests=4)
+    assert [len(batch) for batch in batches] == [4, 4, 3]
+    assert [request for batch in batches for request in batch] == requests
+    batches = split_requests(requests, max_bytes=600)
+    assert all(encoded_size({"requests": batch}) <= 600 for batch in batches)
+    assert batches[0][0] == requests[0]
+    assert [request for batch in batches for request in batch] == requests
+
+
+def test_split_requests_oversized():
+    requests = [{"insertText": {"text": "x" * 1000}}, {"deleteText": {}}]
+    assert split_requests(requests, max_bytes=500) == [[requests[0]], [requests[1]]]
+
+
+def test_split_values():
+    data = [
+        {"range": "first!A1:C1", "values": [["a", "b", "c"]]},
+        {"range": "first!A2:C101", "values": [[i, i, i] for i in range(100)]},
+    ]
+    assert split_values(data) == ([data], [1, 1])
+    batches, counts = split_values(data, max_bytes=800)
+    assert counts[0] == 1
+    assert counts[1] > 1
+    assert all(encoded_size({"data": batch}) <= 800 for batch in batches)
+    ranges = [value_range for batch in batches for value_range in batch]
+    assert ranges[0] == data[0]
+    assert ranges[1]["range"].startswith("first!A2:C")
+    assert ranges[-1]["range"].endswith(":C101")
+    assert [row for r in ranges[1:] for row in r["values"]] == data[1]["values"]
+    for previous, current in zip(ranges[1:], ranges[2:]):
+        end_row = int(previous["range"].split(":C")[1])
+        assert (
+            current["range"]
+            == f"first!A{end_row + 1}:C{current['range'].split(':C')[1]}"
+        )
+
+
+class MockService:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def spreadsheets(self, **kwargs):
+        return self
+
+    def values(self, **kwargs):
+        return self
+
+    def batchUpdate(self, **kwargs):
+        self.body = kwargs["body"]
+        return self
+
+    def execute(self, **kwargs):
+        self.calls.append(self.body)
+        if "data" in self.body:
+            return {
+                "responses": [{"updatedRange": r["range"]} for r in self.body["data"]]
+            }
+        return {"replies": [{} for _ in self.body["requests"]]}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def mock_service(self):
+        return MockService(calls)
+
+    monkeypatch.setattr("gslides.config.Creds.sheet_service", property(mock_service))
+    monkeypatch.setattr("gslides.splitter.MAX_BODY_BYTES", 800)
+    return calls
+
+
+def test_session_split(calls):
+    responses = []
+    session = Session()
+    session.queue_values_update(
+        "abc123", [{"range": "first!A1:C1", "values": [["a", "b", "c"]]}]
+    )
+    session.queue_values_update(
+        "abc123",
+        [{"range": "first!A2:C101", "values": [[i, i, i] for i in range(100)]}],
+        responses.extend,
+    )
+    session.queue_sheet_update(
+        "abc123", [{"repeatCell": {"text": "x" * 100}} for _ in range(10)]
+    )
+    session.flush()
+    value_calls = [call for call in calls if "data" in call]
+    assert len(value_calls) > 1
+    assert len(calls) - len(value_calls) > 1
+    assert responses[0]["updatedRange"].startswith("first!A2")
+    assert responses[-1]["updatedRange"].endswith(":C101")
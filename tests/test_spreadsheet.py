@@ -1,5 +1,9 @@
+import pandas as pd
 import pytest
 
+from gslides import frame
+from gslides.emulator import emulate
+from gslides.frame import Frame
 from gslides.spreadsheet import (
     AddSheet,
     CreateSpreadsheet,
@@ -157,8 +161,75 @@ class TestSpreadsheet:
         self.object.rm_sheets(["first"])
         assert self.object.sht_nms == {}
 
+    def test_get_frames(self, monkeypatch):
+        calls = []
+
+        def mock_return(spreadsheet_id, ranges):
+            calls.append(ranges)
+            return [[["a", "b"], ["1", ""]], [["c"]]]
+
+        monkeypatch.setattr(frame, "batch_get_sheet_data", mock_return)
+        frames = self.object.get_frames([("first", "a1", "B2"), ("first", "C5", "C9")])
+        assert calls == [["first!A1:B2", "first!C5:C9"]]
+        assert frames[0].df.to_dict("list") == {"a": ["1"], "b": [None]}
+        assert frames[0].end_row_index == 2
+        assert frames[1].columns == ["c"]
+        assert frames[1].df.empty
+        assert all(f.initialized for f in frames)
+        assert self.object.get_frames([]) == []
+
     def test_sheet_names(self):
         assert self.object.sheet_names == {"first": 1234}
 
     def test_spreadsheet_id(self):
         assert self.object.spreadsheet_id == "abc123"
+
+
+def test_get_frames_emulated():
+    df = pd.DataFrame({"x": [1, 2, 3], "y": ["a", "b", "c"]})
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first", "second"])
+        for name in ["first", "second"]:
+            Frame.create(df, sp.spreadsheet_id, sp.sheet_names[name], name, True)
+        emulator.reset_stats()
+        specs = [("first", "A1", "B4"), ("second", "A1", "A3")] * 100
+        frames = sp.get_frames(specs)
+    assert emulator.stats()["requests"] == {"sheets.values.batchGet": 1}
+    assert len(frames) == 200
+    assert frames[0].df.to_dict("list") == {"x": ["1", "2", "3"], "y": ["a", "b", "c"]}
+    assert frames[1].df.to_dict("list") == {"x": ["1", "2"]}
+    assert frames[1].sheet_id == sp.sheet_names["second"]
+
+
+def test_write_frames_emulated():
+    df = pd.DataFrame({"x": [1, 2, 3], "y": ["a", "b", "c"]})
+    with emulate(throttle=False) as emulator:
+        sp = Spreadsheet.create(title="data", sheet_names=["first", "second"])
+        emulator.reset_stats()
+        specs = [(df, ["first", "second"][i % 2], f"A{i * 5 + 1}") for i in range(40)]
+        frames = sp.write_frames(specs)
+        assert emulator.stats()["requests"] == {
+            "sheets.values.batchGet": 1,
+            "sheets.values.batchUpdate": 1,
+        }
+        assert [f.sheet_id for f in frames[:2]] == [
+            sp.sheet_names["first"],
+            sp.sheet_names["second"],
+        ]
+        assert frames[1].start_row_index == 6
+        output = sp.get_frames([("second", "A6", "B9")])
+        assert output[0].df.to_dict("list") == {
+            "x": ["1", "2", "3"],
+            "y": ["a", "b", "c"],
+        }
+        with pytest.raises(RuntimeError, match="first!A1:"):
+            sp.write_frames([(df, "first", "A1")])
+        emulator.reset_stats()
+        sp.write_frames([(df, "first", "A1")], overwrite_data=True)
+        assert emulator.stats()["requests"] == {"sheets.values.batchUpdate": 1}
+        assert sp.write_frames([]) == []
+        new_df = df.copy()
+        new_df.loc[2, "y"] = "d"
+        emulator.reset_stats()
+        assert frames[0].update(new_df) == ["first!A4:B4"]
+        assert emulator.stats()["requests"] == {"sheets.values.batchUpdate": 1}
@@ -86,6 +86,57 @@ class TestTable:
             == 1111
         )
 
+    def test_compile_table_styles(self):
+        styles = self.object._compile_table_styles(True, True, (1, 1, 1), (0, 0, 1))
+        assert [table_range for table_range, _, _ in styles] == [
+            {
+                "location": {"rowIndex": 0, "columnIndex": 0},
+                "rowSpan": 1,
+                "columnSpan": 4,
+            },
+            {
+                "location": {"rowIndex": 1, "columnIndex": 0},
+                "rowSpan": 3,
+                "columnSpan": 1,
+            },
+            {
+                "location": {"rowIndex": 1, "columnIndex": 1},
+                "rowSpan": 3,
+                "columnSpan": 3,
+            },
+        ]
+        assert [bold for _, _, bold in styles] == [True, True, False]
+
+    def test_table_style_text_request_cells(self):
+        requests = self.object._table_style_text_request(
+            1111, True, True, 12, (1, 1, 1), (0, 0, 1)
+        )
+        cells = set(
+            (
+                req["updateTextStyle"]["cellLocation"]["rowIndex"],
+                req["updateTextStyle"]["cellLocation"]["columnIndex"],
+            )
+            for req in requests
+        )
+        assert len(requests) == len(cells) == 16
+        header_cell = [
+            req["updateTextStyle"]
+            for req in requests
+            if req["updateTextStyle"]["cellLocation"]
+            == {"rowIndex": 0, "columnIndex": 0}
+        ][0]
+        assert (
+            header_cell["style"]["foregroundColor"]["opaqueColor"]["rgbColor"]["red"]
+            == 1
+        )
+
+    def test_table_text_requests_skip_empty_cells(self):
+        df = test_df()
+        df.iloc[0, 1] = ""
+        table = Table(data=df)
+        assert len(table._table_add_text_request(1111)) == 15
+        assert len(table._table_update_paragraph_style(1111)) == 15
+
     def test_table_update_cell(self):
         assert (
             self.object._table_update_cell(1111, True, False, (0, 0, 0), (0, 0, 0),)[0][
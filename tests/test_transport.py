@@ -0,0 +1,97 @@
+import json
+
+import httplib2
+import pytest
+from google.oauth2.credentials import Credentials
+
+import gslides.config as config
+from gslides.transport import Recorder, Replayer, document_id, record, replay
+
+
+class MockHttp:
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        self.calls += 1
+        content = {"spreadsheetId": "abc123", "call": self.calls}
+        return httplib2.Response({"status": "200"}), json.dumps(content).encode()
+
+
+@pytest.fixture
+def creds(monkeypatch):
+    creds = config.Creds()
+    monkeypatch.setattr("gslides.transport.creds", creds)
+    return creds
+
+
+def test_document_id():
+    assert (
+        document_id("https://sheets.googleapis.com/v4/spreadsheets/abc?alt=json")
+        == "abc"
+    )
+    assert (
+        document_id("https://slides.googleapis.com/v1/presentations/xyz:batchUpdate")
+        == "xyz"
+    )
+    assert document_id("https://sheets.googleapis.com/v4/other") is None
+
+
+def test_record_replay(creds, tmp_path):
+    path = str(tmp_path / "calls.jsonl")
+    http = MockHttp()
+    creds.set_credentials(Credentials(token="token"))
+    creds.set_http_factory(lambda: http)
+    with record(path) as recorder:
+        service = creds.sheet_service
+        service.spreadsheets().get(spreadsheetId="abc123").execute()
+        service.spreadsheets().batchUpdate(
+            spreadsheetId="abc123", body={"requests": [{"addSheet": {}}]}
+        ).execute()
+    assert isinstance(recorder, Recorder)
+    assert creds.middlewares == []
+    with open(path) as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry["method"] for entry in entries] == ["GET", "POST"]
+    assert entries[0]["document_id"] == "abc123"
+    assert entries[1]["body"] == {"requests": [{"addSheet": {}}]}
+    assert entries[1]["response"] == {"spreadsheetId": "abc123", "call": 2}
+
+    creds.set_credentials(None)
+    creds.set_http_factory(None)
+    scheduler = creds.scheduler
+    with replay(path) as replayer:
+        assert creds.scheduler is None
+        service = creds.sheet_service
+        output = (
+            service.spreadsheets()
+            .batchUpdate(spreadsheetId="abc123", body={"requests": []})
+            .execute()
+        )
+        assert output == {"spreadsheetId": "abc123", "call": 2}
+        output = service.spreadsheets().get(spreadsheetId="abc123").execute()
+        assert output == {"spreadsheetId": "abc123", "call": 1}
+    assert http.calls == 2
+    assert len(replayer.calls) == 2
+    assert creds.scheduler is scheduler
+    assert creds.http_factory is None
+
+
+def test_replay_order(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    uri = "https://sheets.googleapis.com/v4/spreadsheets/abc123"
+    lines = [
+        {"method": "GET", "uri": uri, "status": 200, "response": {"call": 1}},
+        {"method": "GET", "uri": uri, "status": 429, "response": {}},
+        {"method": "GET", "uri": uri + "?alt=json", "status": 200, "response": {}},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines))
+    replayer = Replayer(str(path))
+    http = replayer()
+    assert json.loads(http.request(uri)[1]) == {"call": 1}
+    resp, content = http.request(uri + "?fields=x")
+    assert resp.status == 200
+    assert json.loads(content) == {}
+    assert json.loads(http.request(uri)[1]) == {"call": 1}
+    with pytest.raises(RuntimeError):
+        http.request(uri, method="POST")
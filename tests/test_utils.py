@@ -240,6 +240,51 @@ def test_clean_dtypes(input, expected):
     assert utils.clean_dtypes(input) == expected
 
 
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        (pd.Series([1, 2]), [1, 2]),
+        (pd.Series([0.5, np.nan]), [0.5, None]),
+        (pd.Series(["a", None]), ["a", None]),
+        (pd.Series(pd.array([1, None], dtype="Int64")), [1, None]),
+        (
+            pd.Series([pd.Timestamp("2020-01-01"), pd.NaT]),
+            ["2020-01-01 00:00:00", None],
+        ),
+        (
+            pd.Series([Decimal("0.1"), pd.Timestamp("2020-01-01").date()]),
+            [0.1, "2020-01-01"],
+        ),
+    ],
+)
+def test_clean_series(input, expected):
+    assert utils.clean_series(input).tolist() == expected
+
+
+def test_clean_series_datetime_serial():
+    series = pd.Series([pd.Timestamp("1900-01-01 12:00:00")])
+    assert utils.clean_series(series, datetime_serial=True).tolist() == [2.5]
+
+
+@pytest.mark.xfail(reason=TypeError)
+def test_clean_series_invalid():
+    utils.clean_series(pd.Series([True, False]))
+
+
+def test_clean_df():
+    df = pd.DataFrame(
+        {
+            "a": [1, 2],
+            "b": [np.nan, 0.5],
+            "c": ["x", None],
+            "d": [pd.Timestamp("2020-01-01"), pd.Timestamp("2020-01-02")],
+        }
+    )
+    expected = utils.clean_nan(df.applymap(utils.clean_dtypes))
+    assert utils.clean_df(df).values.tolist() == expected.values.tolist()
+    assert list(utils.clean_df(df).columns) == ["a", "b", "c", "d"]
+
+
 @pytest.mark.xfail(reason=ValueError)
 def test_validate_params_list():
     utils.validate_params_list({"legend_position": "outside"})